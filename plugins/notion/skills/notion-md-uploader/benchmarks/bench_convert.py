@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Markdown to Notion block conversion.
+
+Converts the bench_parser corpus once through the two-stage path
+(MarkdownParser.parse, then NotionBlockConverter.convert_blocks) and once
+through the fused NotionEmitter, checks that both produce byte-identical
+JSON, and reports the best time of each.
+
+Usage:
+    python bench_convert.py [--sizes 1 10] [--repeat 3]
+
+Examples:
+    python bench_convert.py
+    python bench_convert.py --sizes 50 --repeat 1
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from bench_parser import generate_corpus
+from markdown_parser import MarkdownParser
+from notion_converter import NotionBlockConverter
+from notion_emitter import NotionEmitter
+
+
+def two_stage(text: str) -> list[dict]:
+    """Parse to MarkdownBlocks, then convert them."""
+    return NotionBlockConverter().convert_blocks(MarkdownParser().parse(text))
+
+
+def fused(text: str) -> list[dict]:
+    """Emit Notion blocks in a single pass."""
+    return NotionEmitter().emit(text)
+
+
+def bench(convert, text: str, repeat: int) -> float:
+    """Return the best wall time of converting text `repeat` times."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        convert(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark two-stage vs fused conversion")
+    parser.add_argument(
+        "--sizes",
+        type=float,
+        nargs="+",
+        default=[1, 10],
+        help="Corpus sizes in MB (default: 1 10)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per size and path; the best time is reported (default: 3)",
+    )
+    args = parser.parse_args()
+
+    for size_mb in args.sizes:
+        text = generate_corpus(int(size_mb * 1024 * 1024))
+        if json.dumps(two_stage(text)) != json.dumps(fused(text)):
+            sys.exit(f"{size_mb} MB: fused output differs from the two-stage path")
+
+        mb = len(text.encode("utf-8")) / (1024 * 1024)
+        staged = bench(two_stage, text, args.repeat)
+        single = bench(fused, text, args.repeat)
+        print(
+            f"{mb:6.2f} MB  two-stage {staged * 1000:9.1f} ms  "
+            f"fused {single * 1000:9.1f} ms  ({staged / single:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
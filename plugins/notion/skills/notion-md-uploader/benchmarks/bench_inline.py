@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for MarkdownParser inline tokenization.
+
+Builds single paragraphs of a target size sprinkled with thousands of
+'*' and '_' markers (mostly unbalanced, as in generated changelogs with
+identifiers like snake_case and glob patterns) and times tokenization.
+
+Usage:
+    python bench_inline.py [--size-kb 10 100 1000] [--repeat 3]
+
+Examples:
+    python bench_inline.py
+    python bench_inline.py --size-kb 500
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from markdown_parser import MarkdownParser
+
+
+WORDS = [
+    "update", "snake_case_name", "*.py", "fix", "**/tests", "v1.2", "parser",
+    "_private", "glob*", "`code`", "see", "[link](https://example.com)",
+    "__init__", "the", "~~old~~", "a*b", "x_y", "**bold**", "*em*",
+    "**kwargs", "~/.config", "[WIP]", "2*3", "arr[i", "`",
+]
+
+
+def generate_paragraph(target_bytes: int, seed: int = 0) -> str:
+    """Generate one paragraph of roughly target_bytes with many markers.
+
+    Args:
+        target_bytes: Approximate paragraph size
+        seed: Random seed for reproducible output
+
+    Returns:
+        Paragraph text without newlines
+    """
+    rng = random.Random(seed)
+    words = []
+    size = 0
+    while size < target_bytes:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Stress-test inline tokenization")
+    parser.add_argument(
+        "--size-kb",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="Paragraph sizes in KB (default: 10 100 1000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per size; the best time is reported (default: 3)",
+    )
+    args = parser.parse_args()
+
+    md_parser = MarkdownParser()
+    for size_kb in args.size_kb:
+        text = generate_paragraph(size_kb * 1024)
+        markers = text.count("*") + text.count("_")
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            segments = md_parser._parse_inline(text)
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"{size_kb:5d} KB  {markers:6d} markers  {len(segments):6d} segments  "
+            f"{best * 1000:9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
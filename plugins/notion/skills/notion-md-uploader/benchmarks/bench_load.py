@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Load test for the uploader against a local Notion API stand-in.
+
+Generates a batch of Markdown documents (the bench_parser corpus, with
+the charts it references written as small PNG files), starts a
+MockNotionServer with the given latency and rate limiting, and uploads
+the batch through MarkdownToNotionUploader.upload_many. Reports documents
+and requests per second, response statuses, retries and per-endpoint
+latency percentiles, so changes to batching, pacing or concurrency can be
+measured without touching the real API.
+
+Usage:
+    python bench_load.py [--docs 50] [--size-kb 20] [--latency 0.05] [--rate-limit 0]
+
+Examples:
+    python bench_load.py
+    python bench_load.py --docs 200 --latency 0 --client-rps 0
+    python bench_load.py --latency 0.15 --jitter 0.1 --rate-limit 3 --client-rps 3
+    python bench_load.py --throttle-rate 0.05
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from bench_parser import generate_corpus
+from client_metrics import MetricsRecorder
+from mock_notion_server import MockNotionServer
+from notion_client import NotionClient, NotionConfig
+from upload_md import MarkdownToNotionUploader
+
+PARENT_PAGE_ID = "0123456789abcdef0123456789abcdef"
+
+# Smallest valid PNG header; the stand-in never decodes images
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def write_documents(directory: Path, count: int, size_bytes: int) -> list[Path]:
+    """Write count generated documents plus the chart images they reference."""
+    figures = directory / "figures"
+    figures.mkdir()
+    for n in range(1, 100):
+        (figures / f"chart_{n}.png").write_bytes(PNG_HEADER + n.to_bytes(2, "big"))
+
+    paths = []
+    for i in range(count):
+        path = directory / f"doc_{i:04d}.md"
+        path.write_text(generate_corpus(size_bytes, seed=i), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Load test the uploader against a local Notion API stand-in")
+    parser.add_argument("--docs", type=int, default=50, help="Documents to upload (default: 50)")
+    parser.add_argument(
+        "--size-kb",
+        type=float,
+        default=20,
+        help="Approximate size of each document in KB (default: 20)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Conversion worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--image-workers",
+        type=int,
+        default=3,
+        help="Concurrent image uploads per document (default: 3)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Seconds the server adds to every response (default: 0.05)",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="Up to this many extra seconds per response (default: 0)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Server-side requests/second before answering 429 (default: unlimited)",
+    )
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests the server answers 429 at random (default: 0)",
+    )
+    parser.add_argument(
+        "--client-rps",
+        type=float,
+        default=0.0,
+        help="Client-side requests/second limit; 0 disables it (default: 0)",
+    )
+    args = parser.parse_args()
+
+    server = MockNotionServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        throttle_rate=args.throttle_rate,
+        record=False,
+        seed=0,
+    )
+    client = NotionClient(
+        NotionConfig(api_key="bench", base_url=server.base_url, requests_per_second=args.client_rps)
+    )
+    recorder = MetricsRecorder(client)
+    uploader = MarkdownToNotionUploader(notion_client=client, image_workers=args.image_workers)
+
+    with tempfile.TemporaryDirectory() as tmp, server:
+        md_files = write_documents(Path(tmp), args.docs, int(args.size_kb * 1024))
+        print(
+            f"Uploading {args.docs} documents of ~{args.size_kb:g} KB "
+            f"(latency {args.latency * 1000:g} ms, jitter {args.jitter * 1000:g} ms, "
+            f"server limit {args.rate_limit or 'none'} req/s, client limit {args.client_rps or 'none'} req/s)"
+        )
+        start = time.perf_counter()
+        results = list(uploader.upload_many(md_files, PARENT_PAGE_ID, workers=args.workers))
+        elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r.error]
+    uploaded = len(results) - len(failed)
+    counters = client.metrics.snapshot()
+    print(f"  {uploaded} uploaded, {len(failed)} failed in {elapsed:.2f}s")
+    print(f"  {uploaded / elapsed:8.2f} docs/s")
+    print(f"  {server.request_count / elapsed:8.1f} requests/s ({server.request_count} requests)")
+    print(f"  statuses: {', '.join(f'{s}: {n}' for s, n in sorted(server.statuses.items()))}")
+    print(
+        f"  {counters['retries']} retries, {counters['rate_limited']} rate limited, "
+        f"{counters['backoff_seconds']:.2f}s backoff, {counters['throttled_seconds']:.2f}s throttled"
+    )
+    for endpoint in recorder.snapshot()["endpoints"]:
+        latency = endpoint["latency_seconds"]
+        print(
+            f"  {endpoint['method']:6} {endpoint['endpoint']:28} {latency['count']:6} requests  "
+            f"p50 <= {latency['p50']}s  p99 <= {latency['p99']}s"
+        )
+    for result in failed[:5]:
+        print(f"  {result.md_file}: {result.error}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the parsed block representation.
+
+Parses a large generated corpus, then rebuilds the same block tree with
+the current slotted InlineStyle/MarkdownBlock classes and with the
+previous plain-dataclass layout, measuring retained allocations of each
+with tracemalloc. Text strings are shared between both copies, so the
+numbers isolate per-object overhead.
+
+Usage:
+    python bench_memory.py [--size-mb 10]
+
+Examples:
+    python bench_memory.py
+    python bench_memory.py --size-mb 50
+"""
+
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_parser import generate_corpus
+from markdown_parser import BlockType, InlineStyle, MarkdownBlock, MarkdownParser
+
+
+@dataclass
+class LegacyInlineStyle:
+    """InlineStyle layout before slots and the flags bitmask."""
+
+    text: str
+    bold: bool = False
+    italic: bool = False
+    strikethrough: bool = False
+    code: bool = False
+    link: str | None = None
+
+
+@dataclass
+class LegacyMarkdownBlock:
+    """MarkdownBlock layout before slots and shared empty containers."""
+
+    block_type: BlockType
+    content: list[LegacyInlineStyle] | str = ""
+    children: list["LegacyMarkdownBlock"] = field(default_factory=list)
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+def rebuild_current(blocks: list[MarkdownBlock]) -> list[MarkdownBlock]:
+    """Copy blocks using the current classes."""
+    return [
+        MarkdownBlock(
+            block_type=block.block_type,
+            content=block.content if isinstance(block.content, str) else [
+                InlineStyle(s.text, link=s.link, flags=s.flags) for s in block.content
+            ],
+            metadata=dict(block.metadata) if block.metadata else block.metadata,
+            start_line=block.start_line,
+            end_line=block.end_line,
+        )
+        for block in blocks
+    ]
+
+
+def rebuild_legacy(blocks: list[MarkdownBlock]) -> list[LegacyMarkdownBlock]:
+    """Copy blocks using the legacy dataclass layout."""
+    return [
+        LegacyMarkdownBlock(
+            block_type=block.block_type,
+            content=block.content if isinstance(block.content, str) else [
+                LegacyInlineStyle(
+                    text=s.text,
+                    bold=s.bold,
+                    italic=s.italic,
+                    strikethrough=s.strikethrough,
+                    code=s.code,
+                    link=s.link,
+                )
+                for s in block.content
+            ],
+            # The previous layout kept the line span in metadata
+            metadata={**block.metadata, "start_line": block.start_line, "end_line": block.end_line},
+        )
+        for block in blocks
+    ]
+
+
+def measure(build: Any, blocks: list[MarkdownBlock]) -> int:
+    """Return bytes still allocated after build(blocks)."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build(blocks)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Measure block representation memory")
+    parser.add_argument(
+        "--size-mb",
+        type=float,
+        default=10,
+        help="Corpus size in MB (default: 10)",
+    )
+    args = parser.parse_args()
+
+    text = generate_corpus(int(args.size_mb * 1024 * 1024))
+    blocks = MarkdownParser().parse(text)
+    runs = sum(len(b.content) for b in blocks if not isinstance(b.content, str))
+    print(f"Corpus: {len(text) / (1024 * 1024):.1f} MB, {len(blocks)} blocks, {runs} inline runs")
+
+    legacy = measure(rebuild_legacy, blocks)
+    current = measure(rebuild_current, blocks)
+    print(f"  legacy dataclasses: {legacy / (1024 * 1024):8.2f} MB")
+    print(f"  slotted classes:    {current / (1024 * 1024):8.2f} MB")
+    print(f"  saved:              {(1 - current / legacy) * 100:7.1f} %")
+
+
+if __name__ == "__main__":
+    main()
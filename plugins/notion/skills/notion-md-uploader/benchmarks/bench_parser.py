@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Benchmark for MarkdownParser.parse.
+
+Generates synthetic Markdown corpora of a target size, a mixed report
+(headings, prose, lists, tables, code, quotes, callouts, images) and
+prose wrapped over many short lines, and times MarkdownParser.parse against LegacyMarkdownParser, the block loop
+it replaced: an if-chain of up to ten regexes per line, with paragraphs
+re-running seven of them on every continuation line. Both share the
+current inline tokenizer, and the two outputs are checked to be the
+same blocks before timing. With --lexing-only, inline parsing is
+skipped in both, so the ratio isolates block lexing.
+
+Usage:
+    python bench_parser.py [--sizes 1 10] [--corpus mixed prose] [--repeat 3]
+
+Examples:
+    python bench_parser.py
+    python bench_parser.py --sizes 1 --corpus prose --repeat 5
+    python bench_parser.py --lexing-only
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from markdown_parser import BlockType, MarkdownBlock, MarkdownParser
+
+
+SECTION_TEMPLATE = """## Section {n}: Results for run {n}
+
+This paragraph summarizes run {n} with **bold metrics**, *italic notes*,
+`inline_code()` and a [reference link](https://example.com/runs/{n}).
+The second line continues the same paragraph without a blank line.
+Generated reports tend to wrap long prose across many short lines, so
+this paragraph keeps going for a while to exercise continuation lines
+the way a real analysis write-up would, including numbers like {n}.5%
+and trailing notes that never start a new block on their own.
+
+- Accuracy improved by {n} points
+- Latency stayed within budget
+  - Nested detail for item {n}
+- [ ] Follow-up task {n}
+- [x] Completed check {n}
+
+1. First numbered step
+2. Second numbered step
+
+| Metric | Run {n} | Baseline |
+|--------|---------|----------|
+| mAP    | 0.{n}   | 0.50     |
+| FPS    | {n}     | 30       |
+
+```python
+def run_{n}():
+    return {n}
+```
+
+> Quoted observation for run {n}
+> spanning two lines.
+
+> [!NOTE]
+> Callout body for run {n}.
+
+![Chart {n}](figures/chart_{n}.png)
+
+---
+
+"""
+
+
+def generate_corpus(target_bytes: int, seed: int = 0) -> str:
+    """Generate a Markdown document of roughly target_bytes.
+
+    Args:
+        target_bytes: Approximate size of the generated document
+        seed: Random seed for reproducible output
+
+    Returns:
+        Markdown text
+    """
+    rng = random.Random(seed)
+    parts = ["# Generated Report\n\n"]
+    size = len(parts[0])
+    n = 0
+    while size < target_bytes:
+        section = SECTION_TEMPLATE.format(n=rng.randint(1, 99))
+        parts.append(section)
+        size += len(section)
+        n += 1
+    return "".join(parts)
+
+
+class LegacyMarkdownParser:
+    """MarkdownParser.parse before the single-pass line lexer.
+
+    Tries the block patterns one after another on every line, and checks
+    each paragraph continuation line against seven of them again. List
+    items are not nested and blocks carry no source span; both came
+    later. Inline text goes through the current tokenizer.
+    """
+
+    HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$")
+    CODE_BLOCK_START = re.compile(r"^```(\w*)$")
+    CODE_BLOCK_END = re.compile(r"^```$")
+    BULLETED_LIST_PATTERN = re.compile(r"^(\s*)[-*+]\s+(.+)$")
+    NUMBERED_LIST_PATTERN = re.compile(r"^(\s*)\d+\.\s+(.+)$")
+    QUOTE_PATTERN = re.compile(r"^>\s*(.*)$")
+    DIVIDER_PATTERN = re.compile(r"^-{3,}$|^\*{3,}$|^_{3,}$")
+    IMAGE_PATTERN = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+    TODO_PATTERN = re.compile(r"^(\s*)[-*]\s+\[([ xX])\]\s+(.+)$")
+    CALLOUT_PATTERN = re.compile(r"^>\s*\[!(NOTE|WARNING|TIP|IMPORTANT|CAUTION)\]\s*$", re.IGNORECASE)
+    TABLE_ROW_PATTERN = re.compile(r"^\|(.+)\|$")
+    TABLE_SEPARATOR_PATTERN = re.compile(r"^\|[\s\-:|]+\|$")
+
+    CALLOUT_ICONS = {
+        "note": "info",
+        "warning": "warning",
+        "tip": "lightbulb",
+        "important": "star",
+        "caution": "warning",
+    }
+
+    def __init__(self):
+        self._parse_inline = MarkdownParser()._parse_inline
+
+    def parse(self, markdown_text: str) -> list[MarkdownBlock]:
+        """Parse Markdown text into a flat list of blocks."""
+        lines = markdown_text.split("\n")
+        blocks: list[MarkdownBlock] = []
+        i = 0
+
+        while i < len(lines):
+            line = lines[i]
+
+            if not line.strip():
+                i += 1
+                continue
+
+            code_match = self.CODE_BLOCK_START.match(line)
+            if code_match:
+                block, i = self._parse_code_block(lines, i)
+                blocks.append(block)
+                continue
+
+            if self.DIVIDER_PATTERN.match(line.strip()):
+                blocks.append(MarkdownBlock(block_type=BlockType.DIVIDER))
+                i += 1
+                continue
+
+            heading_match = self.HEADING_PATTERN.match(line)
+            if heading_match:
+                level = len(heading_match.group(1))
+                block_type = {
+                    1: BlockType.HEADING1,
+                    2: BlockType.HEADING2,
+                    3: BlockType.HEADING3,
+                }.get(level, BlockType.HEADING3)
+                blocks.append(MarkdownBlock(block_type=block_type, content=self._parse_inline(heading_match.group(2))))
+                i += 1
+                continue
+
+            callout_match = self.CALLOUT_PATTERN.match(line)
+            if callout_match:
+                block, i = self._parse_callout(lines, i, callout_match.group(1))
+                blocks.append(block)
+                continue
+
+            if self.QUOTE_PATTERN.match(line):
+                block, i = self._parse_quote(lines, i)
+                blocks.append(block)
+                continue
+
+            todo_match = self.TODO_PATTERN.match(line)
+            if todo_match:
+                blocks.append(MarkdownBlock(
+                    block_type=BlockType.TODO,
+                    content=self._parse_inline(todo_match.group(3)),
+                    metadata={"checked": todo_match.group(2).lower() == "x"},
+                ))
+                i += 1
+                continue
+
+            if self.BULLETED_LIST_PATTERN.match(line):
+                items, i = self._parse_list(lines, i, is_numbered=False)
+                blocks.extend(items)
+                continue
+
+            if self.NUMBERED_LIST_PATTERN.match(line):
+                items, i = self._parse_list(lines, i, is_numbered=True)
+                blocks.extend(items)
+                continue
+
+            if self.TABLE_ROW_PATTERN.match(line) and i + 1 < len(lines):
+                if self.TABLE_SEPARATOR_PATTERN.match(lines[i + 1]):
+                    block, i = self._parse_table(lines, i)
+                    blocks.append(block)
+                    continue
+
+            if line.strip().startswith("!["):
+                image_match = self.IMAGE_PATTERN.search(line)
+                if image_match:
+                    blocks.append(MarkdownBlock(
+                        block_type=BlockType.IMAGE,
+                        content=image_match.group(1),
+                        metadata={"url": image_match.group(2)},
+                    ))
+                    i += 1
+                    continue
+
+            block, i = self._parse_paragraph(lines, i)
+            blocks.append(block)
+
+        return blocks
+
+    def _parse_code_block(self, lines: list[str], start: int) -> tuple[MarkdownBlock, int]:
+        match = self.CODE_BLOCK_START.match(lines[start])
+        language = match.group(1) if match else ""
+        code_lines = []
+        i = start + 1
+        while i < len(lines):
+            if self.CODE_BLOCK_END.match(lines[i]):
+                i += 1
+                break
+            code_lines.append(lines[i])
+            i += 1
+        block = MarkdownBlock(
+            block_type=BlockType.CODE_BLOCK,
+            content="\n".join(code_lines),
+            metadata={"language": language or "plain text"},
+        )
+        return block, i
+
+    def _quoted_lines(self, lines: list[str], i: int) -> tuple[list[str], int]:
+        quoted = []
+        while i < len(lines):
+            match = self.QUOTE_PATTERN.match(lines[i])
+            if not match:
+                break
+            quoted.append(match.group(1))
+            i += 1
+        return quoted, i
+
+    def _parse_quote(self, lines: list[str], start: int) -> tuple[MarkdownBlock, int]:
+        quoted, i = self._quoted_lines(lines, start)
+        return MarkdownBlock(block_type=BlockType.QUOTE, content=self._parse_inline(" ".join(quoted))), i
+
+    def _parse_callout(self, lines: list[str], start: int, callout_type: str) -> tuple[MarkdownBlock, int]:
+        quoted, i = self._quoted_lines(lines, start + 1)
+        kind = callout_type.lower()
+        block = MarkdownBlock(
+            block_type=BlockType.CALLOUT,
+            content=self._parse_inline(" ".join(quoted)),
+            metadata={"type": kind, "icon": self.CALLOUT_ICONS.get(kind, "info")},
+        )
+        return block, i
+
+    def _parse_list(self, lines: list[str], start: int, is_numbered: bool) -> tuple[list[MarkdownBlock], int]:
+        pattern = self.NUMBERED_LIST_PATTERN if is_numbered else self.BULLETED_LIST_PATTERN
+        block_type = BlockType.NUMBERED_LIST if is_numbered else BlockType.BULLETED_LIST
+        items: list[MarkdownBlock] = []
+        i = start
+        while i < len(lines):
+            line = lines[i]
+            if not line.strip():
+                i += 1
+                break
+            match = pattern.match(line)
+            if not match:
+                break
+            items.append(MarkdownBlock(block_type=block_type, content=self._parse_inline(match.group(2))))
+            i += 1
+        return items, i
+
+    def _parse_table(self, lines: list[str], start: int) -> tuple[MarkdownBlock, int]:
+        rows: list[list[str]] = []
+        i = start
+        header_match = self.TABLE_ROW_PATTERN.match(lines[i])
+        if header_match:
+            rows.append([c.strip() for c in header_match.group(1).split("|")])
+            i += 1
+        if i < len(lines) and self.TABLE_SEPARATOR_PATTERN.match(lines[i]):
+            i += 1
+        while i < len(lines):
+            row_match = self.TABLE_ROW_PATTERN.match(lines[i])
+            if not row_match:
+                break
+            rows.append([c.strip() for c in row_match.group(1).split("|")])
+            i += 1
+        block = MarkdownBlock(
+            block_type=BlockType.TABLE,
+            metadata={"rows": rows, "has_header": True, "column_count": len(rows[0]) if rows else 0},
+        )
+        return block, i
+
+    def _parse_paragraph(self, lines: list[str], start: int) -> tuple[MarkdownBlock, int]:
+        para_lines = []
+        i = start
+        while i < len(lines):
+            line = lines[i]
+            if (
+                not line.strip()
+                or self.HEADING_PATTERN.match(line)
+                or self.CODE_BLOCK_START.match(line)
+                or self.BULLETED_LIST_PATTERN.match(line)
+                or self.NUMBERED_LIST_PATTERN.match(line)
+                or self.QUOTE_PATTERN.match(line)
+                or self.DIVIDER_PATTERN.match(line.strip())
+                or self.TODO_PATTERN.match(line)
+                or (line.strip().startswith("![") and self.IMAGE_PATTERN.search(line))
+            ):
+                break
+            para_lines.append(line)
+            i += 1
+
+        # Trailing double spaces are line breaks
+        content = "".join(
+            line.rstrip() + "\n" if line.endswith("  ") else line + " " for line in para_lines
+        ).strip()
+        return MarkdownBlock(block_type=BlockType.PARAGRAPH, content=self._parse_inline(content)), i
+
+
+def flatten(blocks: list[MarkdownBlock]) -> Iterator[tuple]:
+    """Yield blocks in document order as comparable tuples.
+
+    Nested list items are yielded after their parent and source spans are
+    left out, matching what LegacyMarkdownParser produces.
+    """
+    for block in blocks:
+        content = block.content if isinstance(block.content, str) else [
+            (run.text, run.link, run.flags) for run in block.content
+        ]
+        yield block.block_type, content, dict(block.metadata)
+        yield from flatten(list(block.children))
+
+
+PROSE_LINES = [
+    "Generated reports tend to wrap long prose across many short lines,",
+    "so a single paragraph of analysis can run for dozens of lines with",
+    "**bold metrics**, *italic notes*, `inline_code()` and numbers like {n}.5%",
+    "before a blank line finally closes it and the next one begins.",
+]
+
+
+def generate_prose(target_bytes: int, seed: int = 0) -> str:
+    """Generate a document of long wrapped paragraphs of roughly target_bytes.
+
+    Args:
+        target_bytes: Approximate size of the generated document
+        seed: Random seed for reproducible output
+
+    Returns:
+        Markdown text
+    """
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < target_bytes:
+        lines = [rng.choice(PROSE_LINES).format(n=rng.randint(1, 99)) for _ in range(rng.randint(5, 20))]
+        paragraph = "\n".join(lines) + "\n\n"
+        parts.append(paragraph)
+        size += len(paragraph)
+    return "".join(parts)
+
+
+CORPORA = {"mixed": generate_corpus, "prose": generate_prose}
+
+
+def bench_parse(parser: MarkdownParser | LegacyMarkdownParser, text: str, repeat: int) -> float:
+    """Return the best wall time of parsing text `repeat` times."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser.parse(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark MarkdownParser.parse")
+    parser.add_argument(
+        "--sizes",
+        type=float,
+        nargs="+",
+        default=[1, 10],
+        help="Corpus sizes in MB (default: 1 10)",
+    )
+    parser.add_argument(
+        "--corpus",
+        choices=sorted(CORPORA),
+        nargs="+",
+        default=["mixed", "prose"],
+        help="Corpora to generate (default: mixed prose)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per size; the best time is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--lexing-only",
+        action="store_true",
+        help="Skip inline parsing in both parsers while timing",
+    )
+    args = parser.parse_args()
+
+    parser, legacy = MarkdownParser(), LegacyMarkdownParser()
+    if args.lexing_only:
+        timed_parser, timed_legacy = MarkdownParser(), LegacyMarkdownParser()
+        timed_parser._parse_inline = timed_legacy._parse_inline = lambda text: []
+    else:
+        timed_parser, timed_legacy = parser, legacy
+    print(f"{'corpus':6}  {'size':>9}  {'legacy':>10}  {'current':>10}  {'MB/s':>6}  speedup")
+    for name in args.corpus:
+        for size_mb in args.sizes:
+            text = CORPORA[name](int(size_mb * 1024 * 1024))
+            if list(flatten(parser.parse(text))) != list(flatten(legacy.parse(text))):
+                sys.exit(f"{name} {size_mb:g} MB: current and legacy parsers produce different blocks")
+            old = bench_parse(timed_legacy, text, args.repeat)
+            new = bench_parse(timed_parser, text, args.repeat)
+            mb = len(text.encode("utf-8")) / (1024 * 1024)
+            print(
+                f"{name:6}  {mb:6.2f} MB  {old * 1000:7.1f} ms  {new * 1000:7.1f} ms  "
+                f"{mb / new:6.2f}  {old / new:6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
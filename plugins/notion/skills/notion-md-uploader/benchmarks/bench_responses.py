@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Peak memory benchmark for lean append responses.
+
+Appends a large generated document through NotionClient.append_blocks_chunked
+against a local server that echoes blocks back the way Notion does (IDs,
+timestamps, users, parent and fully expanded rich text), once keeping the
+full responses and once in lean mode. Each mode runs in a fresh process and
+reports its peak resident set size, so the numbers are directly comparable.
+
+Usage:
+    python bench_responses.py [--blocks 10000] [--text-length 200]
+
+Examples:
+    python bench_responses.py
+    python bench_responses.py --blocks 50000
+"""
+
+import argparse
+import json
+import re
+import resource
+import subprocess
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from notion_client import NotionClient, NotionConfig
+
+USER = {"object": "user", "id": "00000000-0000-0000-0000-000000000000"}
+
+
+def echo_block(block: dict, parent_id: str) -> dict:
+    """Return block as Notion echoes it after creation."""
+    body = dict(block[block["type"]])
+    body["rich_text"] = [
+        {
+            **item,
+            "annotations": {
+                "bold": False, "italic": False, "strikethrough": False,
+                "underline": False, "code": False, "color": "default",
+            },
+            "plain_text": item["text"]["content"],
+            "href": None,
+        }
+        for item in body.get("rich_text", [])
+    ]
+    return {
+        "object": "block",
+        "id": str(uuid.uuid4()),
+        "parent": {"type": "page_id", "page_id": parent_id},
+        "created_time": "2024-01-01T00:00:00.000Z",
+        "last_edited_time": "2024-01-01T00:00:00.000Z",
+        "created_by": USER,
+        "last_edited_by": USER,
+        "has_children": False,
+        "archived": False,
+        "in_trash": False,
+        "type": block["type"],
+        block["type"]: body,
+    }
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Answers block appends with Notion-shaped echoes of the blocks."""
+
+    def do_PATCH(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        parent_id = re.fullmatch(r"/v1/blocks/([^/]+)/children", self.path).group(1)
+        payload = json.dumps({
+            "object": "list",
+            "results": [echo_block(b, parent_id) for b in body["children"]],
+            "next_cursor": None,
+            "has_more": False,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def generate_blocks(count: int, text_length: int) -> list[dict]:
+    """Generate count paragraph blocks of text_length characters each."""
+    text = ("lorem ipsum dolor sit amet " * (text_length // 27 + 1))[:text_length]
+    return [
+        {
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {"rich_text": [{"type": "text", "text": {"content": f"{i} {text}"}}]},
+        }
+        for i in range(count)
+    ]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_client(base_url: str, blocks: int, text_length: int, lean: bool) -> None:
+    """Append the document once and print peak RSS as JSON."""
+    client = NotionClient(NotionConfig(api_key="bench", base_url=base_url, requests_per_second=0))
+    children = generate_blocks(blocks, text_length)
+    baseline = peak_rss_mb()
+    responses = client.append_blocks_chunked("page", children, lean=lean)
+    print(json.dumps({
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+        "requests": len(responses),
+    }))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Measure peak memory of append responses")
+    parser.add_argument(
+        "--blocks",
+        type=int,
+        default=10_000,
+        help="Blocks to append (default: 10000)",
+    )
+    parser.add_argument(
+        "--text-length",
+        type=int,
+        default=200,
+        help="Characters of text per block (default: 200)",
+    )
+    parser.add_argument("--client", choices=["full", "lean"], help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.client:
+        run_client(args.base_url, args.blocks, args.text_length, args.client == "lean")
+        return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+
+    print(f"Appending {args.blocks} blocks of {args.text_length} characters")
+    results = {}
+    try:
+        for mode in ("full", "lean"):
+            output = subprocess.run(
+                [
+                    sys.executable, __file__,
+                    "--client", mode,
+                    "--base-url", base_url,
+                    "--blocks", str(args.blocks),
+                    "--text-length", str(args.text_length),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[mode] = json.loads(output)
+            r = results[mode]
+            print(
+                f"  {mode:5} responses: peak RSS {r['peak_mb']:8.1f} MB "
+                f"(+{r['peak_mb'] - r['baseline_mb']:.1f} MB over {r['requests']} requests)"
+            )
+    finally:
+        server.shutdown()
+
+    full = results["full"]["peak_mb"] - results["full"]["baseline_mb"]
+    lean = results["lean"]["peak_mb"] - results["lean"]["baseline_mb"]
+    print(f"  saved: {full - lean:.1f} MB of peak growth ({(1 - lean / full) * 100:.0f} %)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Request packer for Notion block trees.
+
+Groups converted blocks into as few append/create requests as Notion's
+limits allow, sending nested children inline wherever possible:
+
+- at most 100 blocks in any one children array
+- at most two levels of nesting below the blocks in a request
+- at most 1000 blocks in total per request
+- at most 500KB of JSON per request
+- at most 2000 characters per rich text item, 100 items per rich text array
+
+Long text is split across several rich text items, and blocks whose text
+still exceeds the array limit are split into consecutive blocks of the
+same type. Children that cannot travel inline (too deep, or past a count
+or size limit) are deferred: they are appended to their parent once the
+parent exists and its ID is known from the response.
+"""
+
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+MAX_ARRAY_BLOCKS = 100
+MAX_NESTING_LEVELS = 2
+MAX_REQUEST_BLOCKS = 1000
+MAX_PAYLOAD_BYTES = 500_000
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+
+# Room kept in each request for the JSON around the blocks (parent, title, after)
+PAYLOAD_HEADROOM = 10_000
+MAX_BLOCKS_BYTES = MAX_PAYLOAD_BYTES - PAYLOAD_HEADROOM
+
+# Bytes added per child by the enclosing array and its "children" key
+_CHILD_SEPARATOR_BYTES = 2
+_CHILDREN_KEY_BYTES = len(', "children": []')
+
+
+@dataclass
+class PackedRequest:
+    """One request's worth of blocks.
+
+    children holds the top-level blocks to send, with inline descendants.
+    deferred pairs an index into children with the remaining child blocks
+    to append to that block after it has been created.
+    """
+
+    children: list[dict[str, Any]] = field(default_factory=list)
+    deferred: list[tuple[int, list[dict[str, Any]]]] = field(default_factory=list)
+    block_count: int = 0
+    payload_bytes: int = 0
+
+
+def json_size(value: Any) -> int:
+    """Bytes value takes in a request body (requests sends ASCII-escaped JSON)."""
+    return len(json.dumps(value))
+
+
+def _utf16_length(text: str) -> int:
+    # Notion counts text length in UTF-16 code units
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _split_text(content: str) -> list[str]:
+    """Cut content into pieces of at most MAX_TEXT_LENGTH UTF-16 units."""
+    pieces = []
+    while _utf16_length(content) > MAX_TEXT_LENGTH:
+        cut = MAX_TEXT_LENGTH
+        while (excess := _utf16_length(content[:cut]) - MAX_TEXT_LENGTH) > 0:
+            cut -= (excess + 1) // 2
+        pieces.append(content[:cut])
+        content = content[cut:]
+    pieces.append(content)
+    return pieces
+
+
+def _oversized(rich_text: list[dict[str, Any]]) -> bool:
+    return len(rich_text) > MAX_RICH_TEXT_ITEMS or any(
+        len(item.get("text", {}).get("content", "")) > MAX_TEXT_LENGTH // 2
+        and _utf16_length(item["text"]["content"]) > MAX_TEXT_LENGTH
+        for item in rich_text
+    )
+
+
+def split_rich_text(rich_text: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Split text items longer than Notion's per-item limit into several runs.
+
+    Each piece keeps the item's annotations and link, so the text renders
+    the same. The result may still hold more than MAX_RICH_TEXT_ITEMS items.
+
+    Args:
+        rich_text: Notion rich_text array
+
+    Returns:
+        rich_text itself if no item is too long, else a new array
+    """
+    if not _oversized(rich_text):
+        return rich_text
+
+    runs = []
+    for item in rich_text:
+        text = item.get("text")
+        if item.get("type") != "text" or len(text["content"]) <= MAX_TEXT_LENGTH // 2:
+            runs.append(item)
+            continue
+        for piece in _split_text(text["content"]):
+            runs.append({**item, "text": {**text, "content": piece}})
+    return runs
+
+
+def _rich_text_groups(rich_text: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Group runs so each group fits in one block's rich_text."""
+    groups: list[list[dict[str, Any]]] = [[]]
+    group_bytes = 0
+    for item in rich_text:
+        size = json_size(item) + _CHILD_SEPARATOR_BYTES
+        if groups[-1] and (
+            len(groups[-1]) == MAX_RICH_TEXT_ITEMS or group_bytes + size > MAX_BLOCKS_BYTES // 2
+        ):
+            groups.append([])
+            group_bytes = 0
+        groups[-1].append(item)
+        group_bytes += size
+    return groups
+
+
+def split_block(block: dict[str, Any]) -> list[dict[str, Any]]:
+    """Bring a block (and its children) within Notion's text limits.
+
+    Long text items are split into several runs. If a block's text then
+    needs more than MAX_RICH_TEXT_ITEMS runs, it becomes several blocks of
+    the same type, with any children attached to the last one.
+
+    Args:
+        block: Notion block, possibly with nested children
+
+    Returns:
+        [block] unchanged when already within limits, else the split blocks
+    """
+    block_type = block["type"]
+    body = block.get(block_type)
+    if not isinstance(body, dict):
+        return [block]
+
+    changes: dict[str, Any] = {}
+    for key in ("rich_text", "caption"):
+        if key in body and _oversized(body[key]):
+            changes[key] = split_rich_text(body[key])
+    if "cells" in body and any(_oversized(cell) for cell in body["cells"]):
+        changes["cells"] = [split_rich_text(cell) for cell in body["cells"]]
+    if children := body.get("children"):
+        parts = [part for child in children for part in split_block(child)]
+        if len(parts) != len(children) or any(p is not c for p, c in zip(parts, children)):
+            changes["children"] = parts
+    if not changes:
+        return [block]
+
+    body = {**body, **changes}
+    rich_text = body.get("rich_text")
+    if rich_text is None or len(_rich_text_groups(rich_text)) == 1:
+        return [{**block, block_type: body}]
+
+    groups = _rich_text_groups(rich_text)
+    tail = {key: body[key] for key in ("children", "caption") if key in body}
+    head = {key: value for key, value in body.items() if key not in tail}
+    blocks = [{**block, block_type: {**head, "rich_text": group}} for group in groups]
+    blocks[-1][block_type].update(tail)
+    return blocks
+
+
+def block_children(block: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return a block's nested children (empty if it has none)."""
+    return block.get(block["type"], {}).get("children") or []
+
+
+def _with_children(block: dict[str, Any], children: list[dict[str, Any]]) -> dict[str, Any]:
+    """Shallow copy of block carrying only the given children."""
+    body = dict(block[block["type"]])
+    if children:
+        body["children"] = children
+    else:
+        body.pop("children", None)
+    return {**block, block["type"]: body}
+
+
+def _inline_count(block: dict[str, Any], levels: int) -> int | None:
+    """Blocks in block's subtree if all of it fits within levels of nesting, else None."""
+    children = block_children(block)
+    if not children:
+        return 1
+    if levels == 0 or len(children) > MAX_ARRAY_BLOCKS:
+        return None
+    total = 1
+    for child in children:
+        count = _inline_count(child, levels - 1)
+        if count is None:
+            return None
+        total += count
+    return total
+
+
+def _split_top_level(
+    block: dict[str, Any],
+) -> tuple[dict[str, Any], list[dict[str, Any]], int, int]:
+    """Keep the longest prefix of block's children that can be sent inline.
+
+    Returns:
+        (block with inline children, deferred children, blocks used, bytes used)
+    """
+    children = block_children(block)
+    if not children:
+        return block, [], 1, json_size(block) + _CHILD_SEPARATOR_BYTES
+
+    used = 1
+    used_bytes = json_size(_with_children(block, [])) + _CHILDREN_KEY_BYTES
+    inline = 0
+    for child in children[:MAX_ARRAY_BLOCKS]:
+        count = _inline_count(child, MAX_NESTING_LEVELS - 1)
+        if count is None or used + count > MAX_REQUEST_BLOCKS:
+            break
+        size = json_size(child) + _CHILD_SEPARATOR_BYTES
+        if used_bytes + size > MAX_BLOCKS_BYTES:
+            break
+        used += count
+        used_bytes += size
+        inline += 1
+
+    if inline == len(children):
+        return block, [], used, used_bytes
+    return _with_children(block, children[:inline]), children[inline:], used, used_bytes
+
+
+def pack_blocks(
+    blocks: Iterable[dict[str, Any]],
+    max_blocks: int = MAX_ARRAY_BLOCKS,
+) -> Iterator[PackedRequest]:
+    """Group blocks into the fewest requests that respect Notion's limits.
+
+    Blocks are first brought within the text limits with split_block.
+    Consumes blocks lazily, so it can sit directly on a conversion stream.
+
+    Args:
+        blocks: Top-level Notion blocks, possibly with nested children
+        max_blocks: Maximum top-level blocks per request (at most 100)
+
+    Yields:
+        PackedRequest objects in document order
+    """
+    max_blocks = min(max_blocks, MAX_ARRAY_BLOCKS)
+    request = PackedRequest()
+    for block in blocks:
+        for part in split_block(block):
+            packed, deferred, used, used_bytes = _split_top_level(part)
+            if request.children and (
+                len(request.children) == max_blocks
+                or request.block_count + used > MAX_REQUEST_BLOCKS
+                or request.payload_bytes + used_bytes > MAX_BLOCKS_BYTES
+            ):
+                yield request
+                request = PackedRequest()
+
+            if deferred:
+                request.deferred.append((len(request.children), deferred))
+            request.children.append(packed)
+            request.block_count += used
+            request.payload_bytes += used_bytes
+
+    if request.children:
+        yield request
+
+
+def send_deferred(
+    client: Any,
+    created: list[dict[str, Any]],
+    request: PackedRequest,
+) -> int:
+    """Append a request's deferred children to the blocks it created.
+
+    Args:
+        client: NotionClient
+        created: Created top-level blocks, in request order (with "id")
+        request: The request that created them
+
+    Returns:
+        Number of requests sent
+    """
+    sent = 0
+    for index, children in request.deferred:
+        sent += append_packed(client, created[index]["id"], children)
+    return sent
+
+
+def append_packed(
+    client: Any,
+    parent_id: str,
+    blocks: Iterable[dict[str, Any]],
+    after: str | None = None,
+) -> int:
+    """Append blocks under a page or block using as few requests as possible.
+
+    Args:
+        client: NotionClient
+        parent_id: ID of the page or block to append to
+        blocks: Blocks to append, possibly with nested children
+        after: Insert after this existing child instead of at the end
+
+    Returns:
+        Number of requests sent
+    """
+    sent = 0
+    for request in pack_blocks(blocks):
+        response = client.append_blocks(parent_id, request.children, after=after, lean=True)
+        created = response["results"]
+        sent += 1 + send_deferred(client, created, request)
+        if after:
+            # Keep later requests in order behind what was just inserted
+            after = created[-1]["id"]
+    return sent
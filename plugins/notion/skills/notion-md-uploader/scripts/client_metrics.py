@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Request metrics for NotionClient.
+
+MetricsRecorder is a NotionClient response hook. Per method and endpoint
+it keeps a latency histogram, request and response size histograms, and
+counts of status codes and of new versus reused connections. It exports
+everything, together with the client's RequestMetrics counters, as a JSON
+snapshot or in the Prometheus text exposition format. Batch runners can
+write the latter where a node_exporter textfile collector picks it up.
+"""
+
+import bisect
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from notion_client import NotionClient, RequestEvent
+
+# Upper bounds of histogram buckets (an implicit +Inf bucket follows)
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 524288, 1048576)
+
+PROMETHEUS_PREFIX = "notion"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as Prometheus defines one."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one value (callers hold the recorder's lock)."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return (upper bound label, observations at or below it) pairs."""
+        pairs = []
+        running = 0
+        for bound, count in zip([*map(_format_number, self.buckets), "+Inf"], self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Returns:
+            The bound, or None if empty or it falls in the +Inf bucket
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= rank:
+                return bound
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return counts, sum, cumulative buckets and p50/p99 estimates."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": dict(self.cumulative()),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class EndpointStats:
+    """Everything recorded for one method and endpoint."""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(SIZE_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.statuses: dict[int, int] = {}
+
+
+class MetricsRecorder:
+    """Response hook aggregating per-endpoint request metrics.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, client: NotionClient | None = None):
+        """Initialize the recorder.
+
+        Args:
+            client: Client to attach() to (optional)
+        """
+        self.client: NotionClient | None = None
+        self._lock = threading.Lock()
+        self.endpoints: dict[tuple[str, str], EndpointStats] = {}
+        self.new_connections = 0
+        self.reused_connections = 0
+        if client is not None:
+            self.attach(client)
+
+    def attach(self, client: NotionClient) -> None:
+        """Record a client's requests, and export its RequestMetrics counters too."""
+        client.response_hooks.append(self)
+        self.client = client
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Record one HTTP attempt."""
+        with self._lock:
+            stats = self.endpoints.get((event.method, event.endpoint))
+            if stats is None:
+                stats = self.endpoints[(event.method, event.endpoint)] = EndpointStats()
+            stats.latency.observe(event.seconds)
+            stats.request_bytes.observe(event.bytes_sent)
+            stats.response_bytes.observe(event.bytes_received)
+            stats.statuses[event.status] = stats.statuses.get(event.status, 0) + 1
+            if event.new_connection:
+                self.new_connections += 1
+            else:
+                self.reused_connections += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return all metrics as a JSON-serialisable dict."""
+        with self._lock:
+            endpoints = [
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+                    "latency_seconds": stats.latency.to_dict(),
+                    "request_bytes": stats.request_bytes.to_dict(),
+                    "response_bytes": stats.response_bytes.to_dict(),
+                }
+                for (method, endpoint), stats in sorted(self.endpoints.items())
+            ]
+            connections = {"new": self.new_connections, "reused": self.reused_connections}
+        snapshot = {"endpoints": endpoints, "connections": connections}
+        if self.client is not None:
+            snapshot["client"] = self.client.metrics.snapshot()
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        p = PROMETHEUS_PREFIX
+        lines: list[str] = []
+        with self._lock:
+            histograms = [
+                (f"{p}_request_duration_seconds", "Time from sending a request to reading its response", "latency"),
+                (f"{p}_request_size_bytes", "Request body size", "request_bytes"),
+                (f"{p}_response_size_bytes", "Response body size", "response_bytes"),
+            ]
+            for name, help_text, attribute in histograms:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, endpoint), stats in sorted(self.endpoints.items()):
+                    histogram: Histogram = getattr(stats, attribute)
+                    labels = f'method="{method}",endpoint="{endpoint}"'
+                    for bound, running in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {running}')
+                    lines.append(f"{name}_sum{{{labels}}} {_format_number(histogram.sum)}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            name = f"{p}_responses_total"
+            lines += [f"# HELP {name} HTTP responses by status code", f"# TYPE {name} counter"]
+            for (method, endpoint), stats in sorted(self.endpoints.items()):
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'{name}{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}')
+
+            name = f"{p}_connections_total"
+            lines += [f"# HELP {name} Requests by whether they opened a new connection", f"# TYPE {name} counter"]
+            lines.append(f'{name}{{reused="false"}} {self.new_connections}')
+            lines.append(f'{name}{{reused="true"}} {self.reused_connections}')
+
+        if self.client is not None:
+            for counter, value in self.client.metrics.snapshot().items():
+                name = f"{p}_client_{counter}_total"
+                lines += [f"# TYPE {name} counter", f"{name} {_format_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> None:
+        """Write metrics to a file: Prometheus text for *.prom, else JSON.
+
+        The file is replaced atomically, so a scraper never reads half of it.
+        """
+        path = Path(path)
+        if path.suffix == ".prom":
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.snapshot(), indent=2) + "\n"
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(text, encoding="utf-8")
+        temp.replace(path)
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
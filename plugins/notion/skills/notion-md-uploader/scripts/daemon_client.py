@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Thin client for the upload daemon.
+
+Sends jobs to a running upload_daemon.py over its Unix socket and prints
+the outcome. Only the standard library is imported, so a call costs the
+interpreter's startup plus one round trip, and the document's time is
+spent on the Notion API inside the warm daemon.
+
+Protocol: one JSON object per line in each direction. A request names an
+"op" ("upload", "update", "sync", "metrics", "ping" or "shutdown") and its
+arguments; the reply is {"ok": true, "result": ...} or
+{"ok": false, "error": "..."}.
+
+Usage:
+    python daemon_client.py <md_file|directory|glob> --parent-page-id <page_id> [options]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from image_cache import default_cache_path
+
+# How long --start waits for a freshly spawned daemon to listen
+START_TIMEOUT_SECONDS = 15.0
+
+
+class DaemonError(Exception):
+    """Raised when the daemon can't be reached or rejects a job."""
+
+
+def default_socket_path() -> Path:
+    """Return the default daemon socket location, next to the caches."""
+    return default_cache_path().with_name("upload_daemon.sock")
+
+
+def send_request(
+    request: dict[str, Any],
+    socket_path: str | Path | None = None,
+    timeout: float | None = None,
+) -> Any:
+    """Send one job to the daemon and wait for its result.
+
+    Args:
+        request: Job with an "op" key and its arguments
+        socket_path: Daemon socket. If None, uses default_socket_path().
+        timeout: Seconds to wait for the reply; None waits until the job ends
+
+    Returns:
+        The job's result
+
+    Raises:
+        DaemonError: If the daemon isn't running or the job failed
+    """
+    path = str(socket_path or default_socket_path())
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonError(f"Upload daemon is not running at {path}: {e.strerror}") from None
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as replies:
+            line = replies.readline()
+    if not line:
+        raise DaemonError("Upload daemon closed the connection without replying")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise DaemonError(reply.get("error", "unknown error"))
+    return reply.get("result")
+
+
+def start_daemon(socket_path: str | Path | None = None, args: list[str] = ()) -> None:
+    """Start the daemon in the background unless one already answers.
+
+    Args:
+        socket_path: Daemon socket. If None, uses default_socket_path().
+        args: Extra upload_daemon.py arguments
+
+    Raises:
+        DaemonError: If the daemon doesn't come up within START_TIMEOUT_SECONDS
+    """
+    path = Path(socket_path or default_socket_path())
+    try:
+        send_request({"op": "ping"}, path, timeout=5)
+        return
+    except DaemonError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    log_path = path.with_suffix(".log")
+    with open(log_path, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).with_name("upload_daemon.py")), "--socket", str(path), *args],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,  # outlive this process and its terminal
+        )
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            send_request({"op": "ping"}, path, timeout=5)
+            return
+        except DaemonError:
+            time.sleep(0.1)
+    raise DaemonError(f"Upload daemon did not start; see {log_path}")
+
+
+def _print_result(op: str, result: dict[str, Any]) -> None:
+    if op == "upload":
+        print(f"Page ID: {result['page_id']}")
+        print(f"URL: {result['url']}")
+    elif op == "update":
+        print(
+            f"Blocks: {result['unchanged']} unchanged, {result['updated']} updated, "
+            f"{result['inserted']} inserted, {result['deleted']} deleted "
+            f"({result['requests']} write requests)"
+        )
+    elif op == "sync":
+        for item in result["files"]:
+            if item["action"] != "UNCHANGED":
+                detail = item["error"] or item["page_id"]
+                print(f"{item['action'].capitalize()} {item['md_file']}: {detail}")
+        counts = result["counts"]
+        print(", ".join(f"{count} {action.lower()}" for action, count in counts.items()))
+    elif "text" in result:
+        sys.stdout.write(result["text"])
+    else:
+        print(json.dumps(result, indent=2))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Send Markdown uploads to a running upload daemon",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python daemon_client.py README.md --parent-page-id abc123 --start
+    python daemon_client.py report.md --parent-page-id abc123 --title "My Report"
+    python daemon_client.py report.md --update "https://notion.so/My-Report-abc123"
+    python daemon_client.py docs/ --parent-page-id abc123 --sync
+    python daemon_client.py --ping
+    python daemon_client.py --metrics prometheus > /var/lib/node_exporter/notion.prom
+    python daemon_client.py --stop
+
+The daemon reads NOTION_API_KEY from its own environment (or .env) when it
+starts; see upload_daemon.py.
+        """,
+    )
+    parser.add_argument(
+        "md_file",
+        nargs="?",
+        help="Markdown file (or, with --sync, directory or glob pattern)",
+    )
+    parser.add_argument("--parent-page-id", "-p", type=str, default=None, help="Notion parent page ID or URL")
+    parser.add_argument("--title", "-t", type=str, default=None, help="Custom page title")
+    parser.add_argument(
+        "--update",
+        "-u",
+        type=str,
+        default=None,
+        metavar="PAGE_ID",
+        help="Update this existing page in place, sending only changed blocks",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Create, update or skip each file according to the daemon's manifest",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help=f"Daemon socket (default: {default_socket_path()})",
+    )
+    parser.add_argument("--start", action="store_true", help="Start the daemon first if it isn't running")
+    parser.add_argument("--ping", action="store_true", help="Show the daemon's status")
+    parser.add_argument(
+        "--metrics",
+        choices=("json", "prometheus"),
+        default=None,
+        help="Print the daemon's request metrics in this format",
+    )
+    parser.add_argument("--stop", action="store_true", help="Stop the daemon")
+    args = parser.parse_args()
+
+    if args.ping or args.stop:
+        request = {"op": "ping" if args.ping else "shutdown"}
+    elif args.metrics:
+        request = {"op": "metrics", "format": args.metrics}
+    elif not args.md_file:
+        parser.error("md_file is required unless --ping, --metrics or --stop is given")
+    elif args.update:
+        request = {"op": "update", "md_file": os.path.abspath(args.md_file), "page_id": args.update}
+    elif not args.parent_page_id:
+        parser.error("--parent-page-id is required unless --update is given")
+    elif args.sync:
+        request = {"op": "sync", "source": os.path.abspath(args.md_file), "parent_page_id": args.parent_page_id}
+    else:
+        request = {
+            "op": "upload",
+            "md_file": os.path.abspath(args.md_file),
+            "parent_page_id": args.parent_page_id,
+            "title": args.title,
+        }
+
+    try:
+        if args.start and not args.stop:
+            start_daemon(args.socket)
+        result = send_request(request, args.socket)
+    except DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    _print_result(request["op"], result)
+    if request["op"] == "sync" and result["counts"].get("FAILED"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
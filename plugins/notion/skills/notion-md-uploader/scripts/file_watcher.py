@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Directory watching for Markdown files.
+
+InotifyWatcher uses Linux inotify (through ctypes, so no extra dependency)
+on every directory of the tree. PollingWatcher compares file modification
+times and sizes, and is used wherever inotify is unavailable.
+debounced_changes() turns either one into batches of changed files,
+waiting until edits have been quiet for a moment so an editor's burst of
+writes (temp file, rename, touch) becomes one sync.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+MARKDOWN_SUFFIX = ".md"
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _is_markdown(path: Path) -> bool:
+    return path.suffix == MARKDOWN_SUFFIX
+
+
+def _markdown_files(root: Path) -> Iterator[Path]:
+    return (p for p in root.rglob("*" + MARKDOWN_SUFFIX) if p.is_file())
+
+
+class PollingWatcher:
+    """Detects changed Markdown files by rescanning the tree."""
+
+    def __init__(self, root: str | Path, interval: float = 1.0):
+        """Take the initial snapshot of the tree.
+
+        Args:
+            root: Directory to watch, recursively
+            interval: Seconds between scans
+        """
+        self.root = Path(root)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in _markdown_files(self.root):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # removed since the listing
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until files change, or the timeout passes.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+
+        Returns:
+            Markdown files created or modified since the last call (empty
+            on timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            snapshot = self._scan()
+            changed = {
+                path for path, signature in snapshot.items()
+                if self._snapshot.get(path) != signature
+            }
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        """Nothing to release; present for symmetry with InotifyWatcher."""
+
+
+class InotifyWatcher:
+    """Detects changed Markdown files with Linux inotify."""
+
+    def __init__(self, root: str | Path):
+        """Watch every directory under root.
+
+        Args:
+            root: Directory to watch, recursively
+
+        Raises:
+            OSError: If inotify is unavailable (not Linux, or the watch
+                limit is exhausted)
+        """
+        self.root = Path(root)
+        libc_name = ctypes.util.find_library("c")
+        try:
+            self._libc = ctypes.CDLL(libc_name, use_errno=True)
+            self._libc.inotify_init1  # noqa: B018 - probe for the symbol
+        except (OSError, AttributeError) as e:
+            raise OSError(f"inotify is not available: {e}") from None
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}  # watch descriptor -> directory
+        try:
+            self._watch_tree(self.root)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _watch_tree(self, directory: Path) -> None:
+        for path in [directory, *(p for p in directory.rglob("*") if p.is_dir())]:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+            self._dirs[wd] = path
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Block until files change, or the timeout passes.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+
+        Returns:
+            Markdown files written, moved in or created since the last
+            call (empty on timeout)
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        changed: set[Path] = set()
+        while readable:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            changed |= self._parse_events(data)
+        return changed
+
+    def _parse_events(self, data: bytes) -> set[Path]:
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost; report everything and let hashes sort it out
+                changed.update(_markdown_files(self.root))
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)  # directory was removed
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                # A new directory may already hold files by the time it is watched
+                try:
+                    self._watch_tree(path)
+                except OSError:
+                    continue  # gone again
+                changed.update(_markdown_files(path))
+            elif _is_markdown(path):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify descriptor."""
+        os.close(self._fd)
+
+
+def open_watcher(
+    root: str | Path, poll_interval: float = 1.0, polling: bool = False
+) -> InotifyWatcher | PollingWatcher:
+    """Watch root with inotify, falling back to polling where unavailable.
+
+    Args:
+        root: Directory to watch, recursively
+        poll_interval: Seconds between scans when polling
+        polling: Always poll (e.g. for network file systems, where inotify
+            misses changes made on other machines)
+
+    Returns:
+        The watcher
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, poll_interval)
+
+
+def debounced_changes(
+    watcher: InotifyWatcher | PollingWatcher, debounce: float = 1.0
+) -> Iterator[set[Path]]:
+    """Yield batches of changed files, each once edits have gone quiet.
+
+    Args:
+        watcher: Watcher from open_watcher()
+        debounce: Seconds without further changes that end a batch
+
+    Yields:
+        Sets of changed Markdown files that still exist
+    """
+    while True:
+        changed = watcher.wait()
+        while more := watcher.wait(debounce):
+            changed |= more
+        existing = {path for path in changed if path.is_file()}
+        if existing:
+            yield existing
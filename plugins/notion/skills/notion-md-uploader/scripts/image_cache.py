@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Persistent image upload cache.
+
+Maps the SHA-256 of an image's bytes to the Notion file_upload ID it was
+uploaded as, so re-running an upload of unchanged documents reuses earlier
+uploads instead of sending the same bytes again. Identical images at
+different paths share one entry.
+
+Entries expire after a TTL that defaults to Notion's file upload validity
+window; an expired ID is treated as a miss and the image is uploaded again.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+# Notion file uploads expire one hour after creation
+DEFAULT_TTL_SECONDS = 60 * 60
+
+
+def file_digest(path: str | Path) -> str:
+    """Return the hex SHA-256 of a file's contents.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        64-character hex digest
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def default_cache_path() -> Path:
+    """Return the default cache file location under the user cache directory."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "notion-md-uploader" / "image_uploads.sqlite3"
+
+
+class ImageUploadCache:
+    """SQLite-backed cache of file_upload IDs keyed by content hash.
+
+    Safe to share between threads. Use as a context manager, or call
+    close() when done.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open (creating if needed) the cache database.
+
+        Args:
+            path: Database file. If None, uses default_cache_path().
+            ttl_seconds: How long an uploaded ID stays reusable
+            clock: Wall-clock time source
+        """
+        self.path = Path(path) if path else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS image_uploads (
+                digest TEXT PRIMARY KEY,
+                file_upload_id TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def __enter__(self) -> "ImageUploadCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, digest: str) -> str | None:
+        """Return the unexpired file_upload ID for a content digest.
+
+        Args:
+            digest: Content hash from file_digest
+
+        Returns:
+            File upload ID, or None if absent or expired
+        """
+        entry = self.get_entry(digest)
+        return entry[0] if entry else None
+
+    def get_entry(self, digest: str) -> tuple[str, float] | None:
+        """Return the unexpired file_upload ID for a digest and when it expires.
+
+        Args:
+            digest: Content hash from file_digest
+
+        Returns:
+            (file upload ID, expiry time on the cache's clock), or None if
+            absent or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_upload_id, expires_at FROM image_uploads WHERE digest = ? AND expires_at > ?",
+                (digest, self._clock()),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, digest: str, file_upload_id: str) -> None:
+        """Record a fresh upload, replacing any previous entry.
+
+        Args:
+            digest: Content hash from file_digest
+            file_upload_id: ID returned by NotionClient.upload_file
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO image_uploads VALUES (?, ?, ?)",
+                (digest, file_upload_id, self._clock() + self.ttl_seconds),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM image_uploads WHERE expires_at <= ?", (self._clock(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
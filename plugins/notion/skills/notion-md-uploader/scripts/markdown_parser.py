@@ -8,9 +8,13 @@ external dependencies.
 """
 
 import re
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Any
+from itertools import islice
+from typing import Any, Generic, TypeVar
 
 
 class BlockType(Enum):
@@ -31,30 +35,178 @@ class BlockType(Enum):
     CALLOUT = auto()
 
 
-@dataclass
-class InlineStyle:
-    """Represents inline text styling."""
+class LineKind(Enum):
+    """Lexer classification of a single source line."""
 
-    text: str
-    bold: bool = False
-    italic: bool = False
-    strikethrough: bool = False
-    code: bool = False
-    link: str | None = None
+    BLANK = auto()
+    TEXT = auto()
+    CODE_FENCE = auto()
+    DIVIDER = auto()
+    HEADING = auto()
+    CALLOUT = auto()
+    QUOTE = auto()
+    TODO = auto()
+    BULLET = auto()
+    NUMBER = auto()
+    TABLE_ROW = auto()
+    IMAGE = auto()
+
+
+class _State(Enum):
+    """Open block tracked by the parser state machine."""
+
+    NONE = auto()
+    PARAGRAPH = auto()
+    CODE = auto()
+    QUOTE = auto()
+    CALLOUT = auto()
+    LIST = auto()
+    TABLE_HEADER = auto()
+    TABLE = auto()
+
+
+# Heading level -> block type (levels 4-6 collapse to HEADING3)
+HEADING_TYPES = {
+    1: BlockType.HEADING1,
+    2: BlockType.HEADING2,
+    3: BlockType.HEADING3,
+}
+
+# LINE_PATTERN group name -> block type for nested list items
+LIST_ITEM_TYPES = {
+    "bullet": BlockType.BULLETED_LIST,
+    "number": BlockType.NUMBERED_LIST,
+}
+
+
+def _indent_width(line: str) -> int:
+    """Return the leading whitespace width of line, counting tabs as 4 columns."""
+    stripped = len(line) - len(line.lstrip(" \t"))
+    if "\t" in line[:stripped]:
+        return len(line[:stripped].expandtabs(4))
+    return stripped
+
+
+# InlineStyle.flags bits
+STYLE_BOLD = 1
+STYLE_ITALIC = 2
+STYLE_STRIKETHROUGH = 4
+STYLE_CODE = 8
+
+
+class _EmptyMetadata(Mapping[str, Any]):
+    """Read-only empty mapping that, unlike MappingProxyType({}), pickles.
+
+    Unpickles as the shared EMPTY_METADATA instance, so blocks sent to a
+    process pool keep sharing it.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+    def __repr__(self) -> str:
+        return "{}"
+
+    def __reduce__(self) -> str:
+        return "EMPTY_METADATA"
+
+
+# Shared defaults for the (usually empty) MarkdownBlock containers.
+# Both are immutable, so sharing one instance across blocks is safe.
+EMPTY_CHILDREN: tuple["MarkdownBlock", ...] = ()
+EMPTY_METADATA: Mapping[str, Any] = _EmptyMetadata()
+
+
+@dataclass(slots=True, init=False)
+class InlineStyle:
+    """Represents inline text styling.
 
+    Boolean styles are packed into the ``flags`` bitmask (STYLE_* bits)
+    and exposed as read-only properties, so a run is three slots and no
+    per-instance dict.
+    """
 
-@dataclass
+    text: str
+    flags: int
+    link: str | None
+
+    def __init__(
+        self,
+        text: str,
+        bold: bool = False,
+        italic: bool = False,
+        strikethrough: bool = False,
+        code: bool = False,
+        link: str | None = None,
+        flags: int = 0,
+    ):
+        if bold:
+            flags |= STYLE_BOLD
+        if italic:
+            flags |= STYLE_ITALIC
+        if strikethrough:
+            flags |= STYLE_STRIKETHROUGH
+        if code:
+            flags |= STYLE_CODE
+        self.text = text
+        self.flags = flags
+        self.link = link
+
+    @property
+    def bold(self) -> bool:
+        return bool(self.flags & STYLE_BOLD)
+
+    @property
+    def italic(self) -> bool:
+        return bool(self.flags & STYLE_ITALIC)
+
+    @property
+    def strikethrough(self) -> bool:
+        return bool(self.flags & STYLE_STRIKETHROUGH)
+
+    @property
+    def code(self) -> bool:
+        return bool(self.flags & STYLE_CODE)
+
+
+@dataclass(slots=True)
 class MarkdownBlock:
-    """Represents a parsed Markdown block."""
+    """Represents a parsed Markdown block.
+
+    ``children`` and ``metadata`` default to shared immutable empties;
+    assign a new list/dict instead of mutating the defaults.
+    ``start_line``/``end_line`` give the 1-based inclusive source span
+    (0 when the block was not produced by MarkdownParser).
+    """
 
     block_type: BlockType
     content: list[InlineStyle] | str = ""
-    children: list["MarkdownBlock"] = field(default_factory=list)
-    metadata: dict[str, Any] = field(default_factory=dict)
+    children: Sequence["MarkdownBlock"] = EMPTY_CHILDREN
+    metadata: Mapping[str, Any] = field(default_factory=lambda: EMPTY_METADATA)
+    start_line: int = 0
+    end_line: int = 0
 
 
-class MarkdownParser:
-    """Parser for Markdown text."""
+# What a MarkdownStateMachine subclass builds (MarkdownBlock, Notion block dict)
+Block = TypeVar("Block")
+
+
+class MarkdownStateMachine(ABC, Generic[Block]):
+    """Markdown line state machine shared by MarkdownParser and NotionEmitter.
+
+    Classifies each line once and groups lines into blocks. The blocks and
+    inline runs themselves are built by factory hooks that subclasses
+    supply (_make_block, _make_run, _add_child), so the same pass can
+    produce MarkdownBlocks or go straight to another representation.
+    """
 
     # Regex patterns for block-level elements
     HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+)$")
@@ -76,6 +228,29 @@ class MarkdownParser:
     STRIKETHROUGH_PATTERN = re.compile(r"~~(.+?)~~")
     INLINE_CODE_PATTERN = re.compile(r"`([^`]+)`")
     LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+    INLINE_SPECIAL_PATTERN = re.compile(r"[*_`\[~]")
+    SINGLE_STAR_PATTERN = re.compile(r"(?<!\*)\*(?!\*)")
+    SINGLE_UNDERSCORE_PATTERN = re.compile(r"(?<!_)_(?!_)")
+
+    # Single-pass line lexer: one alternative per block-level pattern above,
+    # tried in the same priority order the parser has always used. The
+    # name of the outermost matching group is the line's LineKind. The
+    # leading lookahead rejects plain prose lines in a single step.
+    LINE_PATTERN = re.compile(
+        r"(?=[\s`*+\-_#>|!\d]|\Z)"
+        r"(?:(?P<blank>\s*\Z)"
+        r"|(?P<code_fence>```(?P<language>\w*)\Z)"
+        r"|(?P<divider>\s*(?:-{3,}|\*{3,}|_{3,})\s*\Z)"
+        r"|(?P<heading>(?P<hashes>#{1,6})\s+(?P<heading_text>.+)\Z)"
+        r"|(?P<callout>>\s*\[!(?P<callout_type>(?i:NOTE|WARNING|TIP|IMPORTANT|CAUTION))\]\s*\Z)"
+        r"|(?P<quote>>\s*(?P<quote_text>.*)\Z)"
+        r"|(?P<todo>\s*[-*]\s+\[(?P<checked>[ xX])\]\s+(?P<todo_text>.+)\Z)"
+        r"|(?P<bullet>\s*[-*+]\s+(?P<bullet_text>.+)\Z)"
+        r"|(?P<number>\s*\d+\.\s+(?P<number_text>.+)\Z)"
+        r"|(?P<table_row>\|(?P<cells>.+)\|\Z)"
+        r"|(?P<image>\s*(?=!\[).*?!\[(?P<alt>[^\]]*)\]\((?P<url>[^)]+)\)))"
+    )
+    LINE_KINDS = {kind.name.lower(): kind for kind in LineKind}
 
     def __init__(self, base_path: str = ""):
         """Initialize the parser.
@@ -85,133 +260,242 @@ class MarkdownParser:
         """
         self.base_path = base_path
 
-    def parse(self, markdown_text: str) -> list[MarkdownBlock]:
-        """Parse Markdown text into a list of blocks.
+    @staticmethod
+    def _strip_newlines(lines: Iterable[str]) -> Iterator[str]:
+        """Yield lines without trailing newlines, matching str.split("\n").
 
         Args:
-            markdown_text: The Markdown text to parse
+            lines: Iterable of lines, each optionally ending in "\n"
 
-        Returns:
-            List of MarkdownBlock objects
+        Yields:
+            Lines without their trailing newline
         """
-        lines = markdown_text.split("\n")
-        blocks: list[MarkdownBlock] = []
-        i = 0
-
-        while i < len(lines):
-            line = lines[i]
+        ends_with_newline = True  # an empty input still splits into [""]
+        for line in lines:
+            ends_with_newline = line.endswith("\n")
+            yield line[:-1] if ends_with_newline else line
+        if ends_with_newline:
+            yield ""
 
-            # Skip empty lines
-            if not line.strip():
-                i += 1
-                continue
+    def classify_line(self, line: str) -> tuple[LineKind, re.Match[str] | None]:
+        """Classify a single line with one match of LINE_PATTERN.
 
-            # Check for code block
-            code_match = self.CODE_BLOCK_START.match(line)
-            if code_match:
-                block, i = self._parse_code_block(lines, i)
-                blocks.append(block)
-                continue
+        Args:
+            line: Source line without its trailing newline
 
-            # Check for divider
-            if self.DIVIDER_PATTERN.match(line.strip()):
-                blocks.append(MarkdownBlock(block_type=BlockType.DIVIDER))
-                i += 1
-                continue
+        Returns:
+            Tuple of (LineKind, match object or None for plain text)
+        """
+        match = self.LINE_PATTERN.match(line)
+        if match is None:
+            return LineKind.TEXT, None
+        return self.LINE_KINDS[match.lastgroup], match
+
+    def _iter_blocks(
+        self, lines: Iterable[str], first_line: int = 0
+    ) -> Iterator[Block]:
+        """Run the block state machine over classified lines.
+
+        Each line is classified once. Open blocks (paragraphs, quotes,
+        lists, tables, code) accumulate lines until a line of another kind
+        closes them; that line is then handled as the start of a new block.
+        Each finished block goes through _set_span with its 0-based line
+        range.
 
-            # Check for heading
-            heading_match = self.HEADING_PATTERN.match(line)
-            if heading_match:
-                level = len(heading_match.group(1))
-                text = heading_match.group(2)
-                block_type = {
-                    1: BlockType.HEADING1,
-                    2: BlockType.HEADING2,
-                    3: BlockType.HEADING3,
-                }.get(level, BlockType.HEADING3)
-                blocks.append(MarkdownBlock(
-                    block_type=block_type,
-                    content=self._parse_inline(text),
-                ))
-                i += 1
-                continue
+        Args:
+            lines: Source lines without trailing newlines
+            first_line: 0-based index of the first line in the document
 
-            # Check for callout (GitHub-style)
-            callout_match = self.CALLOUT_PATTERN.match(line)
-            if callout_match:
-                block, i = self._parse_callout(lines, i, callout_match.group(1))
-                blocks.append(block)
+        Yields:
+            Blocks built by _make_block, in document order
+        """
+        # Enum attribute lookups dominate this loop, so bind them locally
+        BLANK, TEXT, CODE_FENCE, DIVIDER, HEADING, CALLOUT, QUOTE = (
+            LineKind.BLANK, LineKind.TEXT, LineKind.CODE_FENCE, LineKind.DIVIDER,
+            LineKind.HEADING, LineKind.CALLOUT, LineKind.QUOTE,
+        )
+        TODO, BULLET, NUMBER, TABLE_ROW, IMAGE = (
+            LineKind.TODO, LineKind.BULLET, LineKind.NUMBER,
+            LineKind.TABLE_ROW, LineKind.IMAGE,
+        )
+        S_NONE, S_PARAGRAPH, S_CODE, S_QUOTE, S_CALLOUT = (
+            _State.NONE, _State.PARAGRAPH, _State.CODE, _State.QUOTE, _State.CALLOUT,
+        )
+        S_LIST, S_TABLE_HEADER, S_TABLE = _State.LIST, _State.TABLE_HEADER, _State.TABLE
+        line_match = self.LINE_PATTERN.match
+        kinds = self.LINE_KINDS
+        code_end = self.CODE_BLOCK_END.match
+        table_separator = self.TABLE_SEPARATOR_PATTERN.match
+        span = self._set_span
+
+        state = S_NONE
+        buf: list[Any] = []
+        extra: Any = None  # code language, callout type, list kind or table header
+        start = lineno = first_line - 1  # open block's first line, current line
+
+        for lineno, line in enumerate(lines, first_line):
+            if state is S_CODE:
+                if code_end(line):
+                    yield span(self._parse_code_block(extra, buf), start, lineno)
+                    state = S_NONE
+                else:
+                    buf.append(line)
                 continue
 
-            # Check for quote
-            quote_match = self.QUOTE_PATTERN.match(line)
-            if quote_match:
-                block, i = self._parse_quote(lines, i)
-                blocks.append(block)
+            match = line_match(line)
+            kind = kinds[match.lastgroup] if match is not None else TEXT
+
+            if state is not S_NONE:
+                if state is S_TABLE_HEADER:
+                    if kind is TABLE_ROW and table_separator(line):
+                        state = S_TABLE
+                        continue
+                    # Header without separator row is ordinary paragraph text
+                    state = S_PARAGRAPH
+                    buf = [extra]
+
+                if state is S_PARAGRAPH:
+                    if kind is TEXT or kind is TABLE_ROW:
+                        buf.append(line)
+                        continue
+                    yield span(self._parse_paragraph(buf), start, lineno - 1)
+                elif state is S_QUOTE or state is S_CALLOUT:
+                    if kind is QUOTE:
+                        buf.append(match.group("quote_text"))
+                        continue
+                    if kind is CALLOUT:
+                        buf.append(self.QUOTE_PATTERN.match(line).group(1))
+                        continue
+                    if state is S_QUOTE:
+                        yield span(self._parse_quote(buf), start, lineno - 1)
+                    else:
+                        yield span(self._parse_callout(extra, buf), start, lineno - 1)
+                elif state is S_LIST:
+                    if kind is BULLET or kind is NUMBER or kind is TODO:
+                        indent = _indent_width(line)
+                        # Deeper items of any list kind nest; at the top level
+                        # only the list's own kind (or a checkbox in a bullet
+                        # list, which stays a bullet) continues it
+                        if indent > buf[0][0] or kind is extra or (
+                            extra is BULLET and kind is TODO
+                        ):
+                            buf.append((indent, match))
+                            continue
+                    yield from self._parse_list_items(buf, extra is NUMBER, start)
+                elif state is S_TABLE:
+                    if kind is TABLE_ROW:
+                        buf.append(match.group("cells"))
+                        continue
+                    yield span(self._parse_table(buf), start, lineno - 1)
+
+                state = S_NONE
+
+            if kind is TEXT:
+                state = S_PARAGRAPH
+                start = lineno
+                buf = [line]
+            elif kind is BLANK:
                 continue
-
-            # Check for TODO item
-            todo_match = self.TODO_PATTERN.match(line)
-            if todo_match:
-                checked = todo_match.group(2).lower() == "x"
-                text = todo_match.group(3)
-                blocks.append(MarkdownBlock(
+            elif kind is BULLET or kind is NUMBER:
+                state = S_LIST
+                start = lineno
+                extra = kind
+                buf = [(_indent_width(line), match)]
+            elif kind is HEADING:
+                level = len(match.group("hashes"))
+                yield span(self._make_block(
+                    block_type=HEADING_TYPES.get(level, BlockType.HEADING3),
+                    content=self._parse_inline(match.group("heading_text")),
+                ), lineno, lineno)
+            elif kind is CODE_FENCE:
+                state = S_CODE
+                start = lineno
+                extra = match.group("language")
+                buf = []
+            elif kind is TABLE_ROW:
+                state = S_TABLE_HEADER
+                start = lineno
+                extra = line
+                buf = [match.group("cells")]
+            elif kind is QUOTE:
+                state = S_QUOTE
+                start = lineno
+                buf = [match.group("quote_text")]
+            elif kind is CALLOUT:
+                state = S_CALLOUT
+                start = lineno
+                extra = match.group("callout_type")
+                buf = []
+            elif kind is TODO:
+                yield span(self._make_block(
                     block_type=BlockType.TODO,
-                    content=self._parse_inline(text),
-                    metadata={"checked": checked},
-                ))
-                i += 1
-                continue
-
-            # Check for bulleted list
-            bullet_match = self.BULLETED_LIST_PATTERN.match(line)
-            if bullet_match:
-                block, i = self._parse_list(lines, i, is_numbered=False)
-                blocks.extend(block)
-                continue
-
-            # Check for numbered list
-            number_match = self.NUMBERED_LIST_PATTERN.match(line)
-            if number_match:
-                block, i = self._parse_list(lines, i, is_numbered=True)
-                blocks.extend(block)
-                continue
-
-            # Check for table
-            table_match = self.TABLE_ROW_PATTERN.match(line)
-            if table_match and i + 1 < len(lines):
-                next_line = lines[i + 1]
-                if self.TABLE_SEPARATOR_PATTERN.match(next_line):
-                    block, i = self._parse_table(lines, i)
-                    blocks.append(block)
-                    continue
-
-            # Check for standalone image
-            if line.strip().startswith("!["):
-                image_match = self.IMAGE_PATTERN.search(line)
-                if image_match:
-                    blocks.append(MarkdownBlock(
-                        block_type=BlockType.IMAGE,
-                        content=image_match.group(1),  # alt text
-                        metadata={"url": image_match.group(2)},
-                    ))
-                    i += 1
-                    continue
-
-            # Default: paragraph
-            block, i = self._parse_paragraph(lines, i)
-            blocks.append(block)
-
-        return blocks
-
-    def _parse_inline(self, text: str) -> list[InlineStyle]:
+                    content=self._parse_inline(match.group("todo_text")),
+                    metadata={"checked": match.group("checked").lower() == "x"},
+                ), lineno, lineno)
+            elif kind is DIVIDER:
+                yield span(self._make_block(block_type=BlockType.DIVIDER), lineno, lineno)
+            elif kind is IMAGE:
+                yield span(self._make_block(
+                    block_type=BlockType.IMAGE,
+                    content=match.group("alt"),
+                    metadata={"url": match.group("url")},
+                ), lineno, lineno)
+
+        # Flush the block still open at end of input
+        if state is S_CODE:
+            yield span(self._parse_code_block(extra, buf), start, lineno)
+        elif state is S_PARAGRAPH:
+            yield span(self._parse_paragraph(buf), start, lineno)
+        elif state is S_TABLE_HEADER:
+            yield span(self._parse_paragraph([extra]), start, lineno)
+        elif state is S_QUOTE:
+            yield span(self._parse_quote(buf), start, lineno)
+        elif state is S_CALLOUT:
+            yield span(self._parse_callout(extra, buf), start, lineno)
+        elif state is S_LIST:
+            yield from self._parse_list_items(buf, extra is NUMBER, start)
+        elif state is S_TABLE:
+            yield span(self._parse_table(buf), start, lineno)
+
+    # Factory hooks
+
+    @abstractmethod
+    def _make_block(
+        self,
+        block_type: BlockType,
+        content: Any = "",
+        metadata: Mapping[str, Any] = EMPTY_METADATA,
+    ) -> Block:
+        """Build one block from its type, inline runs (or text) and metadata."""
+
+    @abstractmethod
+    def _make_run(self, text: str, flags: int = 0, link: str | None = None) -> Any:
+        """Build one inline run; same signature as InlineStyle."""
+
+    @abstractmethod
+    def _add_child(self, parent: Block, child: Block) -> None:
+        """Append a nested list item to its parent item."""
+
+    @staticmethod
+    def _set_span(block: Block, first: int, last: int) -> Block:
+        """Record a block's 0-based line range; by default spans are not kept."""
+        return block
+
+    def _parse_list_items(
+        self, items: list[tuple[int, re.Match[str]]], is_numbered: bool, first: int
+    ) -> list[Block]:
+        """Build list item trees for lines starting at `first`."""
+        return self._parse_list(items, is_numbered)
+
+    def _parse_inline(self, text: str) -> list[Any]:
         """Parse inline formatting in text.
 
         Args:
             text: Text to parse
 
         Returns:
-            List of InlineStyle objects
+            List of runs built by _make_run (InlineStyle objects for
+            MarkdownParser)
         """
         if not text:
             return []
@@ -226,176 +510,164 @@ class MarkdownParser:
         segments = self._tokenize_inline(text)
         return segments
 
-    def _tokenize_inline(self, text: str) -> list[InlineStyle]:
+    def _tokenize_inline(self, text: str) -> list[Any]:
         """Tokenize inline text into styled segments.
 
+        Single forward scan equivalent to trying INLINE_CODE_PATTERN,
+        LINK_PATTERN, BOLD_PATTERN, STRIKETHROUGH_PATTERN and ITALIC_PATTERN
+        at each position. Closing delimiters are located through lookups
+        that only ever move forward, so the cost stays linear even for
+        long paragraphs full of unmatched markers.
+
         Args:
             text: Text to tokenize
 
         Returns:
-            List of InlineStyle objects
+            List of runs built by _make_run (InlineStyle objects by default)
         """
         if not text:
             return []
 
-        result: list[InlineStyle] = []
+        make_run = self._make_run
+        n = len(text)
+        find = text.find
+        next_special = self.INLINE_SPECIAL_PATTERN.search
+
+        # Scan positions only increase, so each cached lookup stays valid
+        # until the scan moves past it (-1 means "no further occurrence").
+        found: dict[str, int] = {}
+        singles: dict[str, tuple[Iterator[re.Match[str]], int]] = {}
+
+        def find_from(needle: str, start: int) -> int:
+            idx = found.get(needle, -2)
+            if idx == -1 or idx >= start:
+                return idx
+            idx = find(needle, start)
+            found[needle] = idx
+            return idx
+
+        def single_from(marker: str, start: int) -> int:
+            # Next delimiter run of exactly one '*' or '_' at or after start
+            if marker not in singles:
+                pattern = self.SINGLE_STAR_PATTERN if marker == "*" else self.SINGLE_UNDERSCORE_PATTERN
+                singles[marker] = (pattern.finditer(text), -2)
+            runs, idx = singles[marker]
+            while idx != -1 and idx < start:
+                run = next(runs, None)
+                idx = run.start() if run else -1
+            singles[marker] = (runs, idx)
+            return idx
+
+        def closes_on_line(open_end: int, close: int) -> bool:
+            # '.' in the inline patterns never crosses a newline
+            if close == -1:
+                return False
+            newline = find_from("\n", open_end)
+            return newline == -1 or newline >= close
+
+        result: list[Any] = []
+        plain: list[str] = []  # adjacent plain segments, merged on flush
         pos = 0
 
-        while pos < len(text):
-            # Check for inline code (highest priority, doesn't nest)
-            code_match = self.INLINE_CODE_PATTERN.match(text, pos)
-            if code_match:
-                result.append(InlineStyle(text=code_match.group(1), code=True))
-                pos = code_match.end()
-                continue
-
-            # Check for link
-            link_match = self.LINK_PATTERN.match(text, pos)
-            if link_match:
-                link_text = link_match.group(1)
-                link_url = link_match.group(2)
-                result.append(InlineStyle(text=link_text, link=link_url))
-                pos = link_match.end()
-                continue
-
-            # Check for bold
-            bold_match = self.BOLD_PATTERN.match(text, pos)
-            if bold_match:
-                content = bold_match.group(1) or bold_match.group(2)
-                result.append(InlineStyle(text=content, bold=True))
-                pos = bold_match.end()
-                continue
-
-            # Check for strikethrough
-            strike_match = self.STRIKETHROUGH_PATTERN.match(text, pos)
-            if strike_match:
-                result.append(InlineStyle(text=strike_match.group(1), strikethrough=True))
-                pos = strike_match.end()
-                continue
-
-            # Check for italic (must be after bold check)
-            italic_match = self.ITALIC_PATTERN.match(text, pos)
-            if italic_match:
-                content = italic_match.group(1) or italic_match.group(2)
-                result.append(InlineStyle(text=content, italic=True))
-                pos = italic_match.end()
-                continue
-
-            # Regular text - find next special character
-            next_special = len(text)
-            for pattern in [r"\*", r"_", r"`", r"\[", r"~"]:
-                match = re.search(pattern, text[pos + 1:])
-                if match:
-                    next_special = min(next_special, pos + 1 + match.start())
-
-            plain_text = text[pos:next_special]
-            if plain_text:
-                result.append(InlineStyle(text=plain_text))
-            pos = next_special
-
-        # Merge adjacent plain text segments
-        merged: list[InlineStyle] = []
-        for segment in result:
-            if (merged and
-                not segment.bold and not segment.italic and
-                not segment.strikethrough and not segment.code and
-                not segment.link and
-                not merged[-1].bold and not merged[-1].italic and
-                not merged[-1].strikethrough and not merged[-1].code and
-                not merged[-1].link):
-                merged[-1] = InlineStyle(text=merged[-1].text + segment.text)
+        while pos < n:
+            char = text[pos]
+            segment = None
+
+            if char == "`":
+                close = find_from("`", pos + 1)
+                if close > pos + 1:
+                    segment = make_run(text[pos + 1:close], flags=STYLE_CODE)
+                    end = close + 1
+            elif char == "[":
+                close = find_from("]", pos + 1)
+                if close > pos + 1 and text.startswith("(", close + 1):
+                    url_end = find_from(")", close + 2)
+                    if url_end > close + 2:
+                        segment = make_run(
+                            text=text[pos + 1:close],
+                            link=text[close + 2:url_end],
+                        )
+                        end = url_end + 1
+            elif char == "*" or char == "_" or char == "~":
+                double = char * 2
+                if text.startswith(double, pos):
+                    close = find_from(double, pos + 3)
+                    if closes_on_line(pos + 2, close):
+                        content = text[pos + 2:close]
+                        if char == "~":
+                            segment = make_run(content, flags=STYLE_STRIKETHROUGH)
+                        else:
+                            segment = make_run(content, flags=STYLE_BOLD)
+                        end = close + 2
+                if segment is None and char != "~" and (pos == 0 or text[pos - 1] != char):
+                    if pos + 1 < n and text[pos + 1] != char:
+                        close = single_from(char, pos + 2)
+                        if closes_on_line(pos + 1, close):
+                            segment = make_run(text[pos + 1:close], flags=STYLE_ITALIC)
+                            end = close + 1
+
+            if segment is None:
+                # Regular text up to the next special character
+                match = next_special(text, pos + 1)
+                end = match.start() if match else n
+                plain.append(text[pos:end])
             else:
-                merged.append(segment)
+                if plain:
+                    result.append(make_run(text="".join(plain)))
+                    plain = []
+                result.append(segment)
+            pos = end
 
-        return merged if merged else [InlineStyle(text=text)]
+        if plain:
+            result.append(make_run(text="".join(plain)))
+
+        return result if result else [make_run(text=text)]
 
     def _parse_code_block(
-        self, lines: list[str], start: int
-    ) -> tuple[MarkdownBlock, int]:
-        """Parse a fenced code block.
+        self, language: str, code_lines: list[str]
+    ) -> Block:
+        """Build a fenced code block.
 
         Args:
-            lines: All lines
-            start: Starting line index
+            language: Language tag from the opening fence
+            code_lines: Lines between the fences
 
         Returns:
-            Tuple of (MarkdownBlock, next line index)
+            Block for the code block
         """
-        match = self.CODE_BLOCK_START.match(lines[start])
-        language = match.group(1) if match else ""
-
-        code_lines = []
-        i = start + 1
-        while i < len(lines):
-            if self.CODE_BLOCK_END.match(lines[i]):
-                i += 1
-                break
-            code_lines.append(lines[i])
-            i += 1
-
-        return (
-            MarkdownBlock(
-                block_type=BlockType.CODE_BLOCK,
-                content="\n".join(code_lines),
-                metadata={"language": language or "plain text"},
-            ),
-            i,
+        return self._make_block(
+            block_type=BlockType.CODE_BLOCK,
+            content="\n".join(code_lines),
+            metadata={"language": language or "plain text"},
         )
 
-    def _parse_quote(
-        self, lines: list[str], start: int
-    ) -> tuple[MarkdownBlock, int]:
-        """Parse a blockquote.
+    def _parse_quote(self, quote_lines: list[str]) -> Block:
+        """Build a blockquote.
 
         Args:
-            lines: All lines
-            start: Starting line index
+            quote_lines: Quote text with the '>' markers stripped
 
         Returns:
-            Tuple of (MarkdownBlock, next line index)
+            Block for the quote
         """
-        quote_lines = []
-        i = start
-        while i < len(lines):
-            match = self.QUOTE_PATTERN.match(lines[i])
-            if match:
-                quote_lines.append(match.group(1))
-                i += 1
-            else:
-                break
-
         content = " ".join(quote_lines)
-        return (
-            MarkdownBlock(
-                block_type=BlockType.QUOTE,
-                content=self._parse_inline(content),
-            ),
-            i,
+        return self._make_block(
+            block_type=BlockType.QUOTE,
+            content=self._parse_inline(content),
         )
 
     def _parse_callout(
-        self, lines: list[str], start: int, callout_type: str
-    ) -> tuple[MarkdownBlock, int]:
-        """Parse a GitHub-style callout.
+        self, callout_type: str, callout_lines: list[str]
+    ) -> Block:
+        """Build a GitHub-style callout.
 
         Args:
-            lines: All lines
-            start: Starting line index
             callout_type: Type of callout (NOTE, WARNING, etc.)
+            callout_lines: Body lines following the marker, '>' stripped
 
         Returns:
-            Tuple of (MarkdownBlock, next line index)
+            Block for the callout
         """
-        callout_lines = []
-        i = start + 1
-        while i < len(lines):
-            match = self.QUOTE_PATTERN.match(lines[i])
-            if match:
-                callout_lines.append(match.group(1))
-                i += 1
-            else:
-                break
-
         content = " ".join(callout_lines)
         icon_map = {
             "note": "info",
@@ -405,144 +677,101 @@ class MarkdownParser:
             "caution": "warning",
         }
 
-        return (
-            MarkdownBlock(
-                block_type=BlockType.CALLOUT,
-                content=self._parse_inline(content),
-                metadata={
-                    "type": callout_type.lower(),
-                    "icon": icon_map.get(callout_type.lower(), "info"),
-                },
-            ),
-            i,
+        return self._make_block(
+            block_type=BlockType.CALLOUT,
+            content=self._parse_inline(content),
+            metadata={
+                "type": callout_type.lower(),
+                "icon": icon_map.get(callout_type.lower(), "info"),
+            },
         )
 
     def _parse_list(
-        self, lines: list[str], start: int, is_numbered: bool
-    ) -> tuple[list[MarkdownBlock], int]:
-        """Parse a list (bulleted or numbered).
+        self, items: list[tuple[int, re.Match[str]]], is_numbered: bool
+    ) -> list[Block]:
+        """Build list item blocks (bulleted or numbered), nesting by indentation.
+
+        An item indented deeper than the item before it becomes that item's
+        child; dedenting returns to the nearest ancestor at or below the
+        new indentation. Nested items keep their own kind, so a numbered
+        list or checkboxes can sit under a bullet.
 
         Args:
-            lines: All lines
-            start: Starting line index
-            is_numbered: True for numbered lists
+            items: (indent width, LINE_PATTERN match) per item line, in order
+            is_numbered: True if the top-level items form a numbered list
 
         Returns:
-            Tuple of (list of MarkdownBlocks, next line index)
+            Top-level blocks, with nested items added by _add_child
         """
-        blocks: list[MarkdownBlock] = []
-        pattern = self.NUMBERED_LIST_PATTERN if is_numbered else self.BULLETED_LIST_PATTERN
-        block_type = BlockType.NUMBERED_LIST if is_numbered else BlockType.BULLETED_LIST
-
-        i = start
-        while i < len(lines):
-            line = lines[i]
-            if not line.strip():
-                i += 1
-                break
-
-            match = pattern.match(line)
-            if match:
-                text = match.group(2)
-                blocks.append(MarkdownBlock(
-                    block_type=block_type,
-                    content=self._parse_inline(text),
-                ))
-                i += 1
+        top_type = BlockType.NUMBERED_LIST if is_numbered else BlockType.BULLETED_LIST
+        base_indent = items[0][0]
+        top_level: list[Block] = []
+        stack: list[tuple[int, Block]] = []  # open ancestors, outermost first
+
+        for indent, match in items:
+            kind = match.lastgroup
+            metadata: Mapping[str, Any] = EMPTY_METADATA
+            if indent <= base_indent:
+                block_type = top_type
+                if kind == "todo":
+                    # Checkbox syntax inside a running bullet list stays a bullet
+                    text = self.BULLETED_LIST_PATTERN.match(match.string).group(2)
+                else:
+                    text = match.group(f"{kind}_text")
+            elif kind == "todo":
+                block_type = BlockType.TODO
+                text = match.group("todo_text")
+                metadata = {"checked": match.group("checked").lower() == "x"}
+            else:
+                block_type = LIST_ITEM_TYPES[kind]
+                text = match.group(f"{kind}_text")
+
+            block = self._make_block(
+                block_type=block_type,
+                content=self._parse_inline(text),
+                metadata=metadata,
+            )
+
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            if indent <= base_indent:
+                top_level.append(block)
             else:
-                break
+                self._add_child(stack[-1][1], block)
+            stack.append((indent, block))
 
-        return blocks, i
+        return top_level
 
-    def _parse_table(
-        self, lines: list[str], start: int
-    ) -> tuple[MarkdownBlock, int]:
-        """Parse a Markdown table.
+    def _parse_table(self, row_cells: list[str]) -> Block:
+        """Build a Markdown table.
 
         Args:
-            lines: All lines
-            start: Starting line index
+            row_cells: Inner text of each row between the outer pipes,
+                header first, separator row excluded
 
         Returns:
-            Tuple of (MarkdownBlock, next line index)
+            Block for the table
         """
-        rows: list[list[str]] = []
-        i = start
-
-        # Parse header row
-        header_match = self.TABLE_ROW_PATTERN.match(lines[i])
-        if header_match:
-            cells = [c.strip() for c in header_match.group(1).split("|")]
-            rows.append(cells)
-            i += 1
-
-        # Skip separator row
-        if i < len(lines) and self.TABLE_SEPARATOR_PATTERN.match(lines[i]):
-            i += 1
-
-        # Parse data rows
-        while i < len(lines):
-            row_match = self.TABLE_ROW_PATTERN.match(lines[i])
-            if row_match:
-                cells = [c.strip() for c in row_match.group(1).split("|")]
-                rows.append(cells)
-                i += 1
-            else:
-                break
-
-        return (
-            MarkdownBlock(
-                block_type=BlockType.TABLE,
-                metadata={
-                    "rows": rows,
-                    "has_header": True,
-                    "column_count": len(rows[0]) if rows else 0,
-                },
-            ),
-            i,
+        rows = [[c.strip() for c in cells.split("|")] for cells in row_cells]
+
+        return self._make_block(
+            block_type=BlockType.TABLE,
+            metadata={
+                "rows": rows,
+                "has_header": True,
+                "column_count": len(rows[0]) if rows else 0,
+            },
         )
 
-    def _parse_paragraph(
-        self, lines: list[str], start: int
-    ) -> tuple[MarkdownBlock, int]:
-        """Parse a paragraph.
+    def _parse_paragraph(self, para_lines: list[str]) -> Block:
+        """Build a paragraph.
 
         Args:
-            lines: All lines
-            start: Starting line index
+            para_lines: Raw source lines of the paragraph
 
         Returns:
-            Tuple of (MarkdownBlock, next line index)
+            Block for the paragraph
         """
-        para_lines = []
-        i = start
-
-        while i < len(lines):
-            line = lines[i]
-            # Stop at empty line or new block-level element
-            if not line.strip():
-                break
-            if self.HEADING_PATTERN.match(line):
-                break
-            if self.CODE_BLOCK_START.match(line):
-                break
-            if self.BULLETED_LIST_PATTERN.match(line):
-                break
-            if self.NUMBERED_LIST_PATTERN.match(line):
-                break
-            if self.QUOTE_PATTERN.match(line):
-                break
-            if self.DIVIDER_PATTERN.match(line.strip()):
-                break
-            if self.TODO_PATTERN.match(line):
-                break
-            # Stop at image lines to allow them to be parsed as IMAGE blocks
-            if line.strip().startswith("![") and self.IMAGE_PATTERN.search(line):
-                break
-
-            para_lines.append(line)
-            i += 1
-
         # Handle trailing double spaces as line breaks
         processed_lines = []
         for line in para_lines:
@@ -552,14 +781,222 @@ class MarkdownParser:
                 processed_lines.append(line + " ")
         content = "".join(processed_lines).strip()
 
+        return self._make_block(
+            block_type=BlockType.PARAGRAPH,
+            content=self._parse_inline(content),
+        )
+
+
+class MarkdownParser(MarkdownStateMachine[MarkdownBlock]):
+    """Parser for Markdown text."""
+
+    _make_block = MarkdownBlock
+    _make_run = InlineStyle
+
+    def parse(self, markdown_text: str) -> list[MarkdownBlock]:
+        """Parse Markdown text into a list of blocks.
+
+        Args:
+            markdown_text: The Markdown text to parse
+
+        Returns:
+            List of MarkdownBlock objects
+        """
+        return list(self._iter_blocks(markdown_text.split("\n")))
+
+    def parse_stream(self, lines: Iterable[str]) -> Iterator[MarkdownBlock]:
+        """Parse Markdown lines lazily, yielding blocks as they close.
+
+        Only the block currently being built is held in memory; the one
+        line of lookahead needed to confirm a table header is the longest
+        the parser ever waits. Yields exactly what parse() returns for
+        "".join(lines).
+
+        Args:
+            lines: Iterable of lines, each optionally ending in "\n"
+                (e.g. an open text file)
+
+        Yields:
+            MarkdownBlock objects in document order
+        """
+        return self._iter_blocks(self._strip_newlines(lines))
+
+    def reparse(
+        self,
+        previous_blocks: list[MarkdownBlock],
+        markdown_text: str,
+        edits: Iterable[tuple[str, int, int, int, int]],
+    ) -> list[MarkdownBlock]:
+        """Re-parse only the blocks touched by a line-level edit.
+
+        Parsing restarts at the last block boundary before the first
+        changed line and stops as soon as a block starts, past the last
+        changed line, at a position where the previous parse also started
+        a block. Everything after that point is reused from
+        previous_blocks with its line span shifted.
+
+        Args:
+            previous_blocks: Result of parse()/reparse() on the old text
+            markdown_text: The new Markdown text
+            edits: Line opcodes from the old to the new text, as produced
+                by line_diff() or difflib.SequenceMatcher.get_opcodes()
+
+        Returns:
+            List of MarkdownBlock objects equal to parse(markdown_text)
+
+        Raises:
+            ValueError: If previous_blocks carry no line spans
+        """
+        hunks = [edit for edit in edits if edit[0] != "equal"]
+        if not hunks:
+            return list(previous_blocks)
+        if previous_blocks and not previous_blocks[0].start_line:
+            raise ValueError("previous_blocks have no line spans; parse them with MarkdownParser")
+
+        # Treat all hunks as one dirty range: old [lo, hi) became new [lo, new_hi)
+        lo = min(edit[1] for edit in hunks)
+        hi = max(edit[2] for edit in hunks)
+        new_hi = max(edit[4] for edit in hunks)
+        delta = new_hi - hi
+
+        # Keep blocks whose closing line lies before the change (end_line is
+        # 1-based, so end_line < lo means the line after the block is < lo)
+        keep = bisect_left(previous_blocks, lo, key=lambda b: b.end_line)
+        while 0 < keep < len(previous_blocks) and self._continues_list(
+            previous_blocks[keep - 1], previous_blocks[keep]
+        ):
+            keep -= 1
+        restart = previous_blocks[keep - 1].end_line if keep else 0
+
+        lines = markdown_text.split("\n")
+        result = previous_blocks[:keep]
+        old_index = keep
+        for block in self._iter_blocks(islice(lines, restart, None), restart):
+            start = block.start_line - 1
+            if start >= new_hi:
+                # Find the old block at the same (shifted) position, if any
+                old_start = start - delta
+                while (
+                    old_index < len(previous_blocks)
+                    and previous_blocks[old_index].start_line - 1 < old_start
+                ):
+                    old_index += 1
+                if (
+                    old_index < len(previous_blocks)
+                    and previous_blocks[old_index].start_line - 1 == old_start
+                    and not (result and self._continues_list(result[-1], block))
+                    and not (old_index and self._continues_list(
+                        previous_blocks[old_index - 1], previous_blocks[old_index]
+                    ))
+                ):
+                    # Both parses start a fresh block on identical input from here
+                    result.extend(
+                        self._shift_span(old, delta) for old in previous_blocks[old_index:]
+                    )
+                    return result
+            result.append(block)
+        return result
+
+    @staticmethod
+    def _continues_list(previous: MarkdownBlock, block: MarkdownBlock) -> bool:
+        """Return True if block is a later item of the same list as previous."""
         return (
-            MarkdownBlock(
-                block_type=BlockType.PARAGRAPH,
-                content=self._parse_inline(content),
-            ),
-            i,
+            block.block_type in (BlockType.BULLETED_LIST, BlockType.NUMBERED_LIST)
+            and previous.block_type is block.block_type
+            and previous.end_line + 1 == block.start_line
         )
 
+    @classmethod
+    def _shift_span(cls, block: MarkdownBlock, delta: int) -> MarkdownBlock:
+        """Return block (and its nested items) with line spans moved by delta lines."""
+        if not delta:
+            return block
+        children = block.children
+        if children:
+            children = [cls._shift_span(child, delta) for child in children]
+        return MarkdownBlock(
+            block.block_type,
+            block.content,
+            children,
+            block.metadata,
+            block.start_line + delta,
+            block.end_line + delta,
+        )
+
+    @staticmethod
+    def _set_span(block: MarkdownBlock, first: int, last: int) -> MarkdownBlock:
+        """Record a block's 0-based line range as its 1-based span."""
+        block.start_line = first + 1
+        block.end_line = last + 1
+        return block
+
+    def _parse_list_items(
+        self, items: list[tuple[int, re.Match[str]]], is_numbered: bool, first: int
+    ) -> list[MarkdownBlock]:
+        """Build list item trees with spans for lines starting at `first`.
+
+        Each item covers its own line plus the lines of its nested items.
+        """
+        blocks = self._parse_list(items, is_numbered)
+        line = first
+
+        def assign(block: MarkdownBlock) -> None:
+            nonlocal line
+            block.start_line = line + 1
+            line += 1
+            for child in block.children:
+                assign(child)
+            block.end_line = line
+
+        for block in blocks:
+            assign(block)
+        return blocks
+
+    @staticmethod
+    def _add_child(parent: MarkdownBlock, child: MarkdownBlock) -> None:
+        """Append a nested list item to its parent item."""
+        if parent.children is EMPTY_CHILDREN:
+            parent.children = []
+        parent.children.append(child)
+
+
+def line_diff(old_text: str, new_text: str) -> list[tuple[str, int, int, int, int]]:
+    """Compute a single-hunk line diff for MarkdownParser.reparse.
+
+    Trims the common leading and trailing lines, which is linear and
+    enough for the usual "small edit in a large document" case.
+
+    Args:
+        old_text: Previous Markdown text
+        new_text: New Markdown text
+
+    Returns:
+        Empty list if the texts are equal, otherwise one difflib-style
+        (tag, i1, i2, j1, j2) opcode over lines
+    """
+    if old_text == new_text:
+        return []
+    old_lines = old_text.split("\n")
+    new_lines = new_text.split("\n")
+    limit = min(len(old_lines), len(new_lines))
+
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+
+    old_end = len(old_lines) - suffix
+    new_end = len(new_lines) - suffix
+    if prefix == old_end:
+        tag = "insert"
+    elif prefix == new_end:
+        tag = "delete"
+    else:
+        tag = "replace"
+    return [(tag, prefix, old_end, prefix, new_end)]
+
 
 def main():
     """Test the Markdown parser."""
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Notion API.
+
+Answers the endpoints NotionClient uses (pages, block children, blocks,
+file uploads and search) from in-memory state, so the client and the
+uploader can be exercised and load tested without a network or Notion's
+rate limits. Requests that break Notion's payload limits get the same 400
+validation errors the API returns. Latency, a server-side rate limit and
+random 429 responses can be configured to see how a workload behaves
+under real-world conditions.
+
+Only the standard library and block_packer (for the limits) are used.
+
+Usage:
+    python mock_notion_server.py [--port 8765] [--latency 0.1] [--rate-limit 3]
+
+Point a client at it with NotionConfig(base_url=...) or, for the command
+line tools, NOTION_BASE_URL=http://127.0.0.1:8765/v1 (any NOTION_API_KEY
+is accepted).
+"""
+
+import argparse
+import copy
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from block_packer import (
+    MAX_ARRAY_BLOCKS,
+    MAX_NESTING_LEVELS,
+    MAX_PAYLOAD_BYTES,
+    MAX_REQUEST_BLOCKS,
+    MAX_RICH_TEXT_ITEMS,
+    MAX_TEXT_LENGTH,
+)
+
+# Notion's file upload limits: whole file in single_part mode, each part in multi_part mode
+MAX_SINGLE_PART_BYTES = 20 * 1024 * 1024
+MAX_UPLOAD_PART_BYTES = 20 * 1024 * 1024
+
+
+class MockNotionServer:
+    """In-process HTTP server answering the Notion endpoints the client uses.
+
+    Records every request as (method, path, json body or None) and tracks
+    the highest number of requests handled at once. Multipart bodies are
+    recorded as a dict of form fields. Set latency (and jitter) to slow
+    responses; append (status, headers) to failures to fail the next
+    requests whose path matches fail_pattern. With fail_after_commit set,
+    those requests are carried out before failing, as when a gateway times
+    out on a write Notion has already made.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float = 0.0,
+        burst: int = 3,
+        throttle_rate: float = 0.0,
+        record: bool = True,
+        seed: int | None = None,
+    ):
+        """Create the server (call start() to begin answering).
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one
+            latency: Seconds added to every response
+            jitter: Up to this many extra seconds, drawn uniformly per request
+            rate_limit: Requests per second allowed on average before
+                answering 429 with Retry-After, as Notion does; 0 disables
+            burst: Requests allowed back to back under rate_limit
+            throttle_rate: Fraction of requests answered 429 at random
+            record: Keep every request in self.requests; turn off for long
+                load tests (counts are kept either way)
+            seed: Seed for jitter and throttle_rate, for repeatable runs
+        """
+        self.requests = []
+        self.failures = []
+        self.fail_pattern = ".*"
+        self.fail_after_commit = False
+        self.blocks = {}  # block id -> stored block
+        self.pages = {}  # page id -> stored page
+        self._edits = 0
+        self.children = {}  # page or block id -> ordered child ids
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.throttle_rate = throttle_rate
+        self.record = record
+        self.request_count = 0
+        self.statuses = Counter()  # status code -> responses
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._random = random.Random(seed)
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_port}/v1"
+
+    def start(self) -> None:
+        """Serve requests on a background thread."""
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def serve_forever(self) -> None:
+        """Serve requests on this thread until stop() is called."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockNotionServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def respond(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        query: dict[str, list[str]] | None = None,
+    ) -> tuple[int, dict[str, str], dict[str, Any]]:
+        """Return (status, headers, payload) for a request."""
+        query = query or {}
+        if method in ("POST", "PATCH") and body and "children" in body:
+            if len(json.dumps(body)) > MAX_PAYLOAD_BYTES:
+                return validation_error("payload too large")
+            if error := self._limit_error(body["children"]):
+                return validation_error(error)
+        if method == "POST" and path == "/v1/pages":
+            page_id = str(uuid.uuid4())
+            self.children[page_id] = []
+            self._store_children(page_id, (body or {}).get("children", []))
+            self.pages[page_id] = {
+                "object": "page",
+                "id": page_id,
+                "url": f"https://notion.so/{page_id}",
+                "parent": body["parent"],
+                "properties": body["properties"],
+                "archived": False,
+            }
+            self.touch_page(page_id)
+            return 200, {}, self.pages[page_id]
+        if method == "GET" and path.startswith("/v1/pages/"):
+            page_id = path.rsplit("/", 1)[-1]
+            return 200, {}, self.pages.get(page_id, {"object": "page", "id": page_id})
+        if match := re.fullmatch(r"/v1/blocks/([^/]+)/children", path):
+            parent_id = match.group(1)
+            if method == "PATCH":
+                created = self._store_children(parent_id, body["children"], body.get("after"))
+                return 200, {}, {"object": "list", "results": [self.block_view(b) for b in created]}
+            if method == "GET":
+                return 200, {}, self._list_children(parent_id, query)
+        if match := re.fullmatch(r"/v1/blocks/([^/]+)", path):
+            block = self.blocks.get(match.group(1))
+            if block is None:
+                return 404, {}, {"object": "error", "status": 404, "message": "Could not find block"}
+            if method == "PATCH":
+                block[block["type"]].update(body[block["type"]])
+                return 200, {}, self.block_view(block)
+            if method == "DELETE":
+                with self._lock:
+                    self.children[block["parent_id"]].remove(block["id"])
+                block["archived"] = True
+                return 200, {}, self.block_view(block)
+        if method == "POST" and path == "/v1/file_uploads":
+            upload = {"object": "file_upload", "id": str(uuid.uuid4()), "status": "pending"}
+            upload.update(body or {})
+            return 200, {}, upload
+        if method == "POST" and re.fullmatch(r"/v1/file_uploads/[^/]+/send", path):
+            multi_part = "part_number" in body
+            limit = MAX_UPLOAD_PART_BYTES if multi_part else MAX_SINGLE_PART_BYTES
+            if len(body.get("file", b"")) > limit:
+                return validation_error(f"file is larger than {limit} bytes")
+            status = "pending" if multi_part else "uploaded"
+            return 200, {}, {"object": "file_upload", "id": path.split("/")[3], "status": status}
+        if method == "POST" and re.fullmatch(r"/v1/file_uploads/[^/]+/complete", path):
+            return 200, {}, {"object": "file_upload", "id": path.split("/")[3], "status": "uploaded"}
+        if method == "POST" and path == "/v1/search":
+            return 200, {}, self._search(body or {})
+        return 404, {}, {"object": "error", "status": 404, "message": f"No route for {method} {path}"}
+
+    def touch_page(self, page_id: str, title: str | None = None, archived: bool = False) -> None:
+        """Edit a stored page, advancing its last_edited_time."""
+        page = self.pages[page_id]
+        self._edits += 1
+        page["last_edited_time"] = f"2024-01-01T{self._edits // 3600:02d}:{self._edits // 60 % 60:02d}:{self._edits % 60:02d}.000Z"
+        if title is not None:
+            page["properties"]["title"]["title"] = [{"type": "text", "text": {"content": title}}]
+        page["archived"] = archived
+
+    def _throttle(self) -> float | None:
+        """Apply rate_limit and throttle_rate to one request.
+
+        Returns:
+            Seconds the client should wait if the request is refused, else None
+        """
+        with self._lock:
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                return 1 / self.rate_limit if self.rate_limit else 0.0
+            if not self.rate_limit:
+                return None
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_limit)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return (1 - self._tokens) / self.rate_limit
+
+    def _search(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Search pages by title substring, optionally newest edit first."""
+        query = body.get("query", "").lower()
+        pages = [
+            {**page, "properties": {"title": {"type": "title", "title": [
+                api_rich_text(item) for item in page["properties"]["title"]["title"]
+            ]}}}
+            for page in self.pages.values()
+            if query in page["properties"]["title"]["title"][0]["text"]["content"].lower()
+        ]
+        if body.get("sort"):
+            pages.sort(key=lambda page: page["last_edited_time"], reverse=True)
+        start = int(body.get("start_cursor") or 0)
+        end = start + body.get("page_size", 100)
+        more = end < len(pages)
+        return {
+            "object": "list",
+            "results": pages[start:end],
+            "has_more": more,
+            "next_cursor": str(end) if more else None,
+        }
+
+    def _limit_error(self, blocks: list[dict[str, Any]], level: int = 0) -> str | None:
+        """Describe how blocks break Notion's per-request limits, or return None."""
+        if blocks and level > MAX_NESTING_LEVELS:
+            return f"children nested more than {MAX_NESTING_LEVELS} levels"
+        if len(blocks) > MAX_ARRAY_BLOCKS:
+            return f"more than {MAX_ARRAY_BLOCKS} blocks in children"
+        if level == 0 and self._count_blocks(blocks) > MAX_REQUEST_BLOCKS:
+            return f"more than {MAX_REQUEST_BLOCKS} blocks in request"
+        for block in blocks:
+            body = block[block["type"]]
+            for rich_text in [body.get("rich_text", []), body.get("caption", []), *body.get("cells", [])]:
+                if len(rich_text) > MAX_RICH_TEXT_ITEMS:
+                    return f"more than {MAX_RICH_TEXT_ITEMS} rich text items"
+                if any(len(item["text"]["content"].encode("utf-16-le")) > 2 * MAX_TEXT_LENGTH for item in rich_text):
+                    return f"text content longer than {MAX_TEXT_LENGTH} characters"
+            if error := self._limit_error(body.get("children", []), level + 1):
+                return error
+        return None
+
+    def _count_blocks(self, blocks: list[dict[str, Any]]) -> int:
+        return sum(1 + self._count_blocks(b[b["type"]].get("children", [])) for b in blocks)
+
+    def _store_children(
+        self,
+        parent_id: str,
+        blocks: list[dict[str, Any]],
+        after: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Store blocks (and their nested children) under parent_id."""
+        created = []
+        for block in blocks:
+            block = copy.deepcopy(block)
+            block["id"] = str(uuid.uuid4())
+            block["parent_id"] = parent_id
+            nested = block[block["type"]].pop("children", [])
+            block["has_children"] = bool(nested)
+            self.blocks[block["id"]] = block
+            self.children[block["id"]] = []
+            self._store_children(block["id"], nested)
+            created.append(block)
+
+        with self._lock:
+            siblings = self.children.setdefault(parent_id, [])
+            position = siblings.index(after) + 1 if after else len(siblings)
+            siblings[position:position] = [block["id"] for block in created]
+            if created and parent_id in self.blocks:
+                self.blocks[parent_id]["has_children"] = True
+        return created
+
+    def _list_children(self, parent_id: str, query: dict[str, list[str]]) -> dict[str, Any]:
+        page_size = int(query.get("page_size", ["100"])[0])
+        start = int(query.get("start_cursor", ["0"])[0])
+        ids = self.children.get(parent_id, [])
+        end = start + page_size
+        return {
+            "object": "list",
+            "results": [self.block_view(self.blocks[i]) for i in ids[start:end]],
+            "has_more": end < len(ids),
+            "next_cursor": str(end) if end < len(ids) else None,
+        }
+
+    def page_blocks(self, page_id: str) -> list[dict[str, Any]]:
+        """Current top-level blocks of a page, as the API would return them."""
+        return [self.block_view(self.blocks[i]) for i in self.children[page_id]]
+
+    @staticmethod
+    def block_view(block: dict[str, Any]) -> dict[str, Any]:
+        """Render a stored block the way Notion returns it (defaults filled in)."""
+        view = copy.deepcopy(block)
+        view["object"] = "block"
+        del view["parent_id"]
+        body = view[view["type"]]
+        for key in ("rich_text", "caption"):
+            if key in body:
+                body[key] = [api_rich_text(item) for item in body[key] if item["text"]["content"]]
+        if "cells" in body:
+            body["cells"] = [[api_rich_text(item) for item in cell] for cell in body["cells"]]
+        if body.get("type") == "file_upload":
+            # Attached uploads come back as signed file URLs that change on every read
+            del body["file_upload"]
+            body["type"] = "file"
+            body["file"] = {"url": f"https://files.notion.test/{uuid.uuid4()}/image", "expiry_time": None}
+        return view
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, as the real API
+            disable_nagle_algorithm = True  # or each reply waits on a delayed ACK
+
+            def _handle(self):
+                with server._lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    server.request_count += 1
+                    delay = server.latency + server._random.uniform(0, server.jitter)
+                status = None
+                try:
+                    raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                    content_type = self.headers.get("Content-Type", "")
+                    body = None
+                    if raw and content_type.startswith("application/json"):
+                        body = json.loads(raw)
+                    elif content_type.startswith("multipart/form-data"):
+                        body = parse_multipart(content_type, raw)
+                    url = urlsplit(self.path)
+                    if server.record:
+                        server.requests.append((self.command, url.path, body))
+                    if delay:
+                        time.sleep(delay)
+
+                    if server.failures and re.search(server.fail_pattern, self.path):
+                        status, headers = server.failures.pop(0)
+                        if server.fail_after_commit:
+                            server.respond(self.command, url.path, body, parse_qs(url.query))
+                        payload = {"object": "error", "status": status, "message": "injected"}
+                    elif (retry_after := server._throttle()) is not None:
+                        status, headers, payload = rate_limited(retry_after)
+                    else:
+                        status, headers, payload = server.respond(
+                            self.command, url.path, body, parse_qs(url.query)
+                        )
+                    data = json.dumps(payload).encode()
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                        if status is not None:
+                            server.statuses[status] += 1
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def validation_error(message: str) -> tuple[int, dict[str, str], dict[str, Any]]:
+    """Response Notion gives a request that breaks its limits."""
+    return 400, {}, {"object": "error", "status": 400, "code": "validation_error", "message": message}
+
+
+def rate_limited(retry_after: float) -> tuple[int, dict[str, str], dict[str, Any]]:
+    """Response Notion gives a request over its rate limit."""
+    return (
+        429,
+        {"Retry-After": f"{retry_after:.3f}"},  # Notion sends whole seconds; finer helps local runs
+        {"object": "error", "status": 429, "code": "rate_limited", "message": "rate limited"},
+    )
+
+
+def api_rich_text(item: dict[str, Any]) -> dict[str, Any]:
+    """Fill in the fields Notion adds to a rich text object."""
+    item = copy.deepcopy(item)
+    item["text"].setdefault("link", None)
+    annotations = {
+        "bold": False,
+        "italic": False,
+        "strikethrough": False,
+        "underline": False,
+        "code": False,
+        "color": "default",
+    }
+    annotations.update(item.get("annotations", {}))
+    item["annotations"] = annotations
+    item["plain_text"] = item["text"]["content"]
+    item["href"] = (item["text"]["link"] or {}).get("url")
+    return item
+
+
+def parse_multipart(content_type: str, raw: bytes) -> dict[str, bytes | str]:
+    """Decode a multipart/form-data body into {field name: bytes or str}."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + raw
+    )
+    fields: dict[str, bytes | str] = {}
+    for part in message.iter_parts():
+        value = part.get_payload(decode=True)
+        fields[part.get_param("name", header="content-disposition")] = (
+            value if part.get_filename() else value.decode()
+        )
+    return fields
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Serve a local stand-in for the Notion API",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python mock_notion_server.py --port 8765
+    python mock_notion_server.py --port 8765 --latency 0.15 --jitter 0.1 --rate-limit 3
+    python mock_notion_server.py --port 8765 --throttle-rate 0.05
+
+    NOTION_API_KEY=test NOTION_BASE_URL=http://127.0.0.1:8765/v1 \\
+        python upload_md.py README.md --parent-page-id 0123456789abcdef0123456789abcdef
+        """,
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per response")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Average requests/second allowed before answering 429 (default: unlimited)",
+    )
+    parser.add_argument("--burst", type=int, default=3, help="Back-to-back requests allowed under --rate-limit")
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered 429 at random",
+    )
+    args = parser.parse_args()
+
+    server = MockNotionServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        throttle_rate=args.throttle_rate,
+        record=False,
+    )
+    print(f"Mock Notion API at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"{server.request_count} requests: {dict(sorted(server.statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
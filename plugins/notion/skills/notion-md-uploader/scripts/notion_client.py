@@ -6,16 +6,69 @@ This module provides a wrapper around the Notion API for:
 - Creating pages with content blocks
 - Uploading files (images, documents)
 - Appending blocks to existing pages
+
+AsyncNotionClient exposes the same calls as coroutines so many pages or
+uploads can be in flight at once.
 """
 
+import asyncio
 import json
 import mimetypes
+import mmap
 import os
-from dataclasses import dataclass
+import random
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Collection, Iterator, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from block_packer import MAX_ARRAY_BLOCKS, pack_blocks, send_deferred
+
+T = TypeVar("T")
+
+# Transient server-side failures. Unlike a 429, one may arrive after Notion
+# has committed a write, so only idempotent requests are retried on them.
+SERVER_ERROR_STATUSES = frozenset({500, 502, 503, 504})
+
+# Requests besides GET and DELETE that are safe to resend: block edits set
+# content rather than add it, search only reads, and a file upload send
+# fills the same upload object again.
+IDEMPOTENT_REQUESTS = (
+    ("PATCH", re.compile(r"/blocks/[^/]+")),
+    ("POST", re.compile(r"/search")),
+    ("POST", re.compile(r"/file_uploads/[^/]+/send")),
+)
+
+# Fields kept from page responses in lean mode
+LEAN_PAGE_FIELDS = ("object", "id", "url")
+
+# Files above Notion's single-part limit are sent as multi-part uploads
+SINGLE_PART_UPLOAD_LIMIT = 20 * 1024 * 1024
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+
+# Page, block and file upload IDs in request paths, dashed or not
+ID_SEGMENT = re.compile(r"(?<=/)[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}(?=/|$)")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Return an endpoint with its IDs replaced by {id} (e.g. /blocks/{id}/children)."""
+    return ID_SEGMENT.sub("{id}", "/" + endpoint.lstrip("/"))
+
+
+def is_idempotent(method: str, endpoint: str) -> bool:
+    """Whether sending a request twice has the same effect as sending it once."""
+    if method in ("GET", "DELETE"):
+        return True
+    path = "/" + endpoint.lstrip("/")
+    return any(method == m and pattern.fullmatch(path) for m, pattern in IDEMPOTENT_REQUESTS)
 
 
 @dataclass
@@ -25,13 +78,26 @@ class NotionConfig:
     api_key: str
     api_version: str = "2022-06-28"
     base_url: str = "https://api.notion.com/v1"
+    # Notion allows an average of 3 requests/s with short bursts; 0 disables the limiter
+    requests_per_second: float = 3.0
+    burst: int = 3
+    max_retries: int = 5
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
 
     @classmethod
     def from_env(cls) -> "NotionConfig":
-        """Create config from environment variables."""
+        """Create config from environment variables.
+
+        NOTION_API_KEY is required; NOTION_BASE_URL optionally points the
+        client elsewhere, e.g. at mock_notion_server.py.
+        """
         api_key = os.getenv("NOTION_API_KEY")
         if not api_key:
             raise ValueError("NOTION_API_KEY environment variable is not set")
+        base_url = os.getenv("NOTION_BASE_URL")
+        if base_url:
+            return cls(api_key=api_key, base_url=base_url.rstrip("/"))
         return cls(api_key=api_key)
 
 
@@ -45,8 +111,116 @@ class NotionAPIError(Exception):
         super().__init__(f"Notion API Error ({status_code}): {message}")
 
 
+class TokenBucket:
+    """Thread-safe token bucket refilled at rate tokens/s up to capacity.
+
+    Callers reserve a token and then sleep for the returned delay, so
+    concurrent callers are spaced out instead of all waking at once.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token.
+
+        Returns:
+            Seconds to wait before the token may be used (0 if available now)
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def defer(self, seconds: float) -> None:
+        """Hold back the next token for at least seconds, e.g. after a 429."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+@dataclass
+class RequestMetrics:
+    """Counters describing rate limiting and retries for a client."""
+
+    requests: int = 0
+    bytes_sent: int = 0  # request bodies, retries included
+    retries: int = 0
+    rate_limited: int = 0  # 429 responses
+    server_errors: int = 0  # retryable 5xx responses
+    throttled_seconds: float = 0.0  # waiting on the client-side token bucket
+    backoff_seconds: float = 0.0  # sleeping between retries
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **deltas: float) -> None:
+        """Atomically add to one or more counters."""
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self) -> dict[str, float]:
+        """Return a consistent copy of the counters."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "bytes_sent": self.bytes_sent,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "server_errors": self.server_errors,
+                "throttled_seconds": self.throttled_seconds,
+                "backoff_seconds": self.backoff_seconds,
+            }
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """One HTTP attempt, as passed to response hooks."""
+
+    method: str
+    endpoint: str  # endpoint_template() form
+    status: int
+    seconds: float  # from sending the request to reading the whole response
+    bytes_sent: int
+    bytes_received: int
+    new_connection: bool  # a connection was opened for it (approximate under concurrency)
+
+
 class NotionClient:
-    """Client for interacting with Notion API."""
+    """Client for interacting with Notion API.
+
+    Requests pass through a token-bucket limiter (config.requests_per_second)
+    and are retried with jittered exponential backoff, honouring
+    Retry-After: on 429 always, on 5xx only when idempotent. A 5xx from
+    creating a page or appending blocks is raised instead, since the write
+    may have landed; the upload journal resumes such uploads safely.
+    Time spent waiting is recorded in self.metrics.
+
+    Callables in request_hooks get (method, endpoint template) before each
+    HTTP attempt, retries included; those in response_hooks get a
+    RequestEvent after it.
+    """
 
     def __init__(self, config: NotionConfig | None = None):
         """Initialize the Notion client.
@@ -57,6 +231,18 @@ class NotionClient:
         self.config = config or NotionConfig.from_env()
         self._session = requests.Session()
         self._session.headers.update(self._default_headers())
+        self._limiter = (
+            TokenBucket(self.config.requests_per_second, self.config.burst)
+            if self.config.requests_per_second > 0
+            else None
+        )
+        self._sleep = time.sleep
+        self.metrics = RequestMetrics()
+        self.request_hooks: list[Callable[[str, str], None]] = []
+        self.response_hooks: list[Callable[[RequestEvent], None]] = []
+        # Connection pool -> connections it had opened when last checked
+        self._pool_connections: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._pool_lock = threading.Lock()
 
     def _default_headers(self) -> dict[str, str]:
         """Return default headers for API requests."""
@@ -71,6 +257,7 @@ class NotionClient:
         method: str,
         endpoint: str,
         json_data: dict[str, Any] | None = None,
+        fields: Collection[str] | None = None,
         **kwargs: Any,
     ) -> dict[str, Any]:
         """Make an API request to Notion.
@@ -79,6 +266,8 @@ class NotionClient:
             method: HTTP method (GET, POST, PATCH, DELETE)
             endpoint: API endpoint (without base URL)
             json_data: JSON payload for the request
+            fields: Keep only these top-level fields of the response, so the
+                rest of the body can be freed as soon as this returns
             **kwargs: Additional arguments for requests
 
         Returns:
@@ -89,11 +278,17 @@ class NotionClient:
         """
         url = f"{self.config.base_url}/{endpoint.lstrip('/')}"
 
-        response = self._session.request(
-            method=method,
-            url=url,
-            json=json_data,
-            **kwargs,
+        response = self._send(
+            partial(
+                self._session.request,
+                method=method,
+                url=url,
+                json=json_data,
+                **kwargs,
+            ),
+            method,
+            endpoint_template(endpoint),
+            retry_server_errors=is_idempotent(method, endpoint),
         )
 
         if not response.ok:
@@ -103,7 +298,106 @@ class NotionClient:
                 response_body=response.text,
             )
 
-        return response.json()
+        body = response.json()
+        if fields is None:
+            return body
+        return {key: body[key] for key in fields if key in body}
+
+    def _send(
+        self,
+        send: Callable[[], requests.Response],
+        method: str,
+        endpoint: str,
+        retry_server_errors: bool = False,
+    ) -> requests.Response:
+        """Issue a request under the rate limiter, retrying 429 and 5xx.
+
+        Args:
+            send: Zero-argument callable performing one HTTP attempt
+            method: HTTP method, for hooks
+            endpoint: Endpoint template, for hooks
+            retry_server_errors: Retry 5xx responses too (only safe for
+                idempotent requests)
+
+        Returns:
+            The first non-retryable response, or the last one once
+            config.max_retries is exhausted
+        """
+        for attempt in range(self.config.max_retries + 1):
+            if self._limiter is not None:
+                wait = self._limiter.reserve()
+                if wait > 0:
+                    self._sleep(wait)
+                    self.metrics.add(throttled_seconds=wait)
+
+            for hook in self.request_hooks:
+                hook(method, endpoint)
+            start = time.perf_counter()
+            response = send()
+            elapsed = time.perf_counter() - start
+            body = response.request.body
+            bytes_sent = len(body) if body else 0
+            self.metrics.add(requests=1, bytes_sent=bytes_sent)
+            if self.response_hooks:
+                event = RequestEvent(
+                    method=method,
+                    endpoint=endpoint,
+                    status=response.status_code,
+                    seconds=elapsed,
+                    bytes_sent=bytes_sent,
+                    bytes_received=len(response.content),
+                    new_connection=self._opened_connection(response),
+                )
+                for hook in self.response_hooks:
+                    hook(event)
+            retryable = response.status_code == 429 or (
+                retry_server_errors and response.status_code in SERVER_ERROR_STATUSES
+            )
+            if not retryable or attempt == self.config.max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            if response.status_code == 429:
+                self.metrics.add(rate_limited=1)
+                if self._limiter is not None:
+                    # Hold back every thread sharing this client, not just this one
+                    self._limiter.defer(delay)
+            else:
+                self.metrics.add(server_errors=1)
+            self._sleep(delay)
+            self.metrics.add(retries=1, backoff_seconds=delay)
+
+        return response
+
+    def _opened_connection(self, response: requests.Response) -> bool:
+        """Whether a new connection was opened for a response.
+
+        Compares the pool's count of opened connections with the last
+        response's, so with concurrent requests on one pool the new
+        connection may be credited to a neighbour.
+        """
+        pool = getattr(response.raw, "_pool", None)  # urllib3 keeps the originating pool
+        if pool is None:
+            return False
+        with self._pool_lock:
+            seen = self._pool_connections.get(pool, 0)
+            self._pool_connections[pool] = pool.num_connections
+        return pool.num_connections > seen
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After if given, else full-jitter backoff."""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        return self._backoff_delay(attempt)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given 0-based attempt."""
+        ceiling = min(self.config.backoff_max, self.config.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
 
     def create_page(
         self,
@@ -112,6 +406,7 @@ class NotionClient:
         children: list[dict[str, Any]] | None = None,
         icon: dict[str, Any] | None = None,
         cover: dict[str, Any] | None = None,
+        lean: bool = False,
     ) -> dict[str, Any]:
         """Create a new page under a parent page.
 
@@ -121,6 +416,7 @@ class NotionClient:
             children: List of block objects for page content
             icon: Page icon (emoji or file)
             cover: Page cover image
+            lean: Return only the page's object, id and url
 
         Returns:
             Created page object
@@ -141,51 +437,76 @@ class NotionClient:
         if cover:
             payload["cover"] = cover
 
-        return self._request("POST", "/pages", json_data=payload)
+        return self._request(
+            "POST", "/pages", json_data=payload, fields=LEAN_PAGE_FIELDS if lean else None
+        )
 
     def append_blocks(
         self,
         block_id: str,
         children: list[dict[str, Any]],
+        after: str | None = None,
+        lean: bool = False,
     ) -> dict[str, Any]:
         """Append blocks to an existing page or block.
 
-        Note: Notion API has a limit of 100 blocks per request.
-        For larger content, use append_blocks_chunked.
+        Note: Notion API limits the number, nesting and size of blocks
+        per request. For larger content, use append_blocks_chunked.
 
         Args:
             block_id: ID of the page or block to append to
             children: List of block objects to append
+            after: Insert after this child block instead of at the end
+            lean: Return only the id and type of each appended block, not
+                the full block JSON Notion echoes back
 
         Returns:
             Response containing the appended blocks
         """
-        return self._request(
+        payload: dict[str, Any] = {"children": children}
+        if after:
+            payload["after"] = after
+
+        response = self._request(
             "PATCH",
             f"/blocks/{block_id}/children",
-            json_data={"children": children},
+            json_data=payload,
+            fields=("object", "results") if lean else None,
         )
+        if lean:
+            response["results"] = [
+                {"object": "block", "id": block["id"], "type": block["type"]}
+                for block in response["results"]
+            ]
+        return response
 
     def append_blocks_chunked(
         self,
         block_id: str,
         children: list[dict[str, Any]],
-        chunk_size: int = 100,
+        chunk_size: int = MAX_ARRAY_BLOCKS,
+        lean: bool = False,
     ) -> list[dict[str, Any]]:
-        """Append blocks in chunks to handle Notion's 100 block limit.
+        """Append any amount of content in as few requests as the API allows.
+
+        Blocks are packed by count, nesting depth and serialized size, and
+        text over Notion's length limits is split (see block_packer).
+        Nested children that can't go in the same request are appended to
+        their parent afterwards.
 
         Args:
             block_id: ID of the page or block to append to
             children: List of block objects to append
-            chunk_size: Maximum blocks per request (default 100)
+            chunk_size: Maximum top-level blocks per request (default 100)
+            lean: Keep only block IDs from each response (see append_blocks)
 
         Returns:
-            List of responses from each chunk
+            List of responses from each top-level request
         """
         responses = []
-        for i in range(0, len(children), chunk_size):
-            chunk = children[i : i + chunk_size]
-            response = self.append_blocks(block_id, chunk)
+        for request in pack_blocks(children, chunk_size):
+            response = self.append_blocks(block_id, request.children, lean=lean)
+            send_deferred(self, response["results"], request)
             responses.append(response)
         return responses
 
@@ -193,21 +514,27 @@ class NotionClient:
         self,
         filename: str | None = None,
         content_type: str | None = None,
+        number_of_parts: int | None = None,
     ) -> dict[str, Any]:
         """Create a file upload object.
 
         Args:
             filename: Optional filename
             content_type: Optional MIME type
+            number_of_parts: If set, create a multi-part upload expecting
+                this many parts (required for files over 20MB)
 
         Returns:
             File upload object with id and upload_url
         """
-        payload = {}
+        payload: dict[str, Any] = {}
         if filename:
             payload["filename"] = filename
         if content_type:
             payload["content_type"] = content_type
+        if number_of_parts:
+            payload["mode"] = "multi_part"
+            payload["number_of_parts"] = number_of_parts
 
         return self._request("POST", "/file_uploads", json_data=payload)
 
@@ -215,12 +542,16 @@ class NotionClient:
         self,
         file_upload_id: str,
         file_path: str | Path,
+        content: bytes | None = None,
+        part_number: int | None = None,
     ) -> dict[str, Any]:
-        """Upload file contents to a file upload object.
+        """Upload file contents (or one part of them) to a file upload object.
 
         Args:
             file_upload_id: ID from create_file_upload
             file_path: Path to the file to upload
+            content: Bytes to send instead of the whole file (e.g. one part)
+            part_number: 1-based part number for multi-part uploads
 
         Returns:
             Updated file upload object with status 'uploaded'
@@ -234,53 +565,184 @@ class NotionClient:
         if mime_type is None:
             mime_type = "application/octet-stream"
 
-        url = f"{self.config.base_url}/file_uploads/{file_upload_id}/send"
+        if content is None:
+            content = file_path.read_bytes()
+        files = {"file": (file_path.name, content, mime_type)}
+        data = {"part_number": str(part_number)} if part_number else None
 
-        with open(file_path, "rb") as f:
-            files = {"file": (file_path.name, f, mime_type)}
-            # Remove Content-Type header for multipart/form-data
-            headers = {
-                "Authorization": f"Bearer {self.config.api_key}",
-                "Notion-Version": self.config.api_version,
-            }
-            response = requests.post(url, headers=headers, files=files)
+        # Drop the session's JSON Content-Type so requests sets the multipart boundary
+        return self._request(
+            "POST",
+            f"/file_uploads/{file_upload_id}/send",
+            files=files,
+            data=data,
+            headers={"Content-Type": None},
+        )
 
-        if not response.ok:
-            raise NotionAPIError(
-                status_code=response.status_code,
-                message=response.reason,
-                response_body=response.text,
-            )
+    def complete_file_upload(self, file_upload_id: str) -> dict[str, Any]:
+        """Finish a multi-part upload once every part has been sent.
 
-        return response.json()
+        Args:
+            file_upload_id: ID from create_file_upload
+
+        Returns:
+            File upload object with status 'uploaded'
+        """
+        return self._request("POST", f"/file_uploads/{file_upload_id}/complete")
 
-    def upload_file(self, file_path: str | Path) -> str:
+    def upload_file(
+        self,
+        file_path: str | Path,
+        part_size: int = UPLOAD_PART_SIZE,
+        max_workers: int = 3,
+    ) -> str:
         """Upload a file to Notion and return the file_upload ID.
 
         This is a convenience method that combines create_file_upload
-        and send_file_upload.
+        and send_file_upload. Files larger than SINGLE_PART_UPLOAD_LIMIT are
+        sent as a multi-part upload: fixed-size parts are sliced from a
+        memory-mapped file and sent concurrently, each with its own retries.
 
         Args:
             file_path: Path to the file to upload
+            part_size: Bytes per part for multi-part uploads (Notion accepts
+                5-20MB; every part but the last must be this size)
+            max_workers: Maximum parts in flight at once
 
         Returns:
             File upload ID that can be used in blocks
         """
         file_path = Path(file_path)
         mime_type, _ = mimetypes.guess_type(str(file_path))
+        size = file_path.stat().st_size
+
+        if size <= SINGLE_PART_UPLOAD_LIMIT:
+            # Step 1: Create file upload object
+            file_upload = self.create_file_upload(
+                filename=file_path.name,
+                content_type=mime_type,
+            )
+            file_upload_id = file_upload["id"]
+
+            # Step 2: Send file contents
+            self.send_file_upload(file_upload_id, file_path)
+            return file_upload_id
 
-        # Step 1: Create file upload object
-        file_upload = self.create_file_upload(
+        number_of_parts = -(-size // part_size)
+        file_upload_id = self.create_file_upload(
             filename=file_path.name,
             content_type=mime_type,
-        )
-        file_upload_id = file_upload["id"]
+            number_of_parts=number_of_parts,
+        )["id"]
 
-        # Step 2: Send file contents
-        self.send_file_upload(file_upload_id, file_path)
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
 
+            def send_part(part_number: int) -> None:
+                start = (part_number - 1) * part_size
+                # Slicing the map reads just this part; at most max_workers are held
+                content = mm[start : start + part_size]
+                self._retry_transport_errors(
+                    partial(self.send_file_upload, file_upload_id, file_path, content, part_number)
+                )
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, number_of_parts)) as pool:
+                # list() re-raises the first part that failed after its retries
+                list(pool.map(send_part, range(1, number_of_parts + 1)))
+
+        self.complete_file_upload(file_upload_id)
         return file_upload_id
 
+    def _retry_transport_errors(self, send: Callable[[], T]) -> T:
+        """Retry an idempotent call on connection errors and timeouts.
+
+        HTTP-level retries (429/5xx) already happen in _send; this covers
+        requests that never got a response, which is safe for resending a
+        single upload part.
+        """
+        attempt = 0
+        while True:
+            try:
+                return send()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.config.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                self._sleep(delay)
+                self.metrics.add(retries=1, backoff_seconds=delay)
+                attempt += 1
+
+    def get_block_children(
+        self,
+        block_id: str,
+        start_cursor: str | None = None,
+        page_size: int = 100,
+    ) -> dict[str, Any]:
+        """Retrieve one page of a block's children.
+
+        Args:
+            block_id: ID of the page or block
+            start_cursor: next_cursor from the previous response
+            page_size: Number of children per response (max 100)
+
+        Returns:
+            List object with results, has_more and next_cursor
+        """
+        params: dict[str, Any] = {"page_size": page_size}
+        if start_cursor:
+            params["start_cursor"] = start_cursor
+
+        return self._request("GET", f"/blocks/{block_id}/children", params=params)
+
+    def iter_block_children(
+        self,
+        block_id: str,
+        page_size: int = 100,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every child of a block, following pagination cursors.
+
+        Args:
+            block_id: ID of the page or block
+            page_size: Number of children per request (max 100)
+
+        Yields:
+            Child block objects in order
+        """
+        cursor = None
+        while True:
+            response = self.get_block_children(block_id, cursor, page_size)
+            yield from response.get("results", [])
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return
+
+    def update_block(
+        self,
+        block_id: str,
+        payload: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Update a block's content in place.
+
+        Args:
+            block_id: ID of the block
+            payload: Fields to change, keyed by block type
+                (e.g. {"paragraph": {"rich_text": [...]}})
+
+        Returns:
+            Updated block object
+        """
+        return self._request("PATCH", f"/blocks/{block_id}", json_data=payload)
+
+    def delete_block(self, block_id: str) -> dict[str, Any]:
+        """Delete (archive) a block.
+
+        Args:
+            block_id: ID of the block
+
+        Returns:
+            Archived block object
+        """
+        return self._request("DELETE", f"/blocks/{block_id}")
+
     def get_page(self, page_id: str) -> dict[str, Any]:
         """Retrieve a page by ID.
 
@@ -297,13 +759,19 @@ class NotionClient:
         query: str = "",
         filter_type: str | None = None,
         page_size: int = 100,
+        start_cursor: str | None = None,
+        sort_direction: str | None = None,
     ) -> dict[str, Any]:
         """Search for pages and databases.
 
+        Returns one page of results; use iter_search to follow cursors.
+
         Args:
             query: Search query string
             filter_type: Filter by 'page' or 'database'
             page_size: Number of results per page
+            start_cursor: next_cursor from a previous response
+            sort_direction: 'ascending' or 'descending' by last_edited_time
 
         Returns:
             Search results
@@ -313,9 +781,189 @@ class NotionClient:
             payload["query"] = query
         if filter_type:
             payload["filter"] = {"property": "object", "value": filter_type}
+        if start_cursor:
+            payload["start_cursor"] = start_cursor
+        if sort_direction:
+            payload["sort"] = {"direction": sort_direction, "timestamp": "last_edited_time"}
 
         return self._request("POST", "/search", json_data=payload)
 
+    def iter_search(
+        self,
+        query: str = "",
+        filter_type: str | None = None,
+        page_size: int = 100,
+        sort_direction: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every search result, following pagination cursors.
+
+        Stop iterating early to avoid fetching further pages.
+
+        Args:
+            query: Search query string
+            filter_type: Filter by 'page' or 'database'
+            page_size: Number of results per request (max 100)
+            sort_direction: 'ascending' or 'descending' by last_edited_time
+
+        Yields:
+            Page and database objects
+        """
+        cursor = None
+        while True:
+            response = self.search(query, filter_type, page_size, cursor, sort_direction)
+            yield from response.get("results", [])
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return
+
+
+class AsyncNotionClient:
+    """Asyncio client for Notion API with the same methods as NotionClient.
+
+    Requests run on a pooled requests.Session in a bounded worker pool, so
+    up to max_concurrency calls share keep-alive connections concurrently
+    while the event loop stays free. Use as an async context manager, or
+    call aclose() when done.
+
+    Example:
+        async with AsyncNotionClient(max_concurrency=3) as client:
+            pages = await asyncio.gather(
+                *(client.create_page(parent_id, title) for title in titles)
+            )
+    """
+
+    def __init__(
+        self,
+        config: NotionConfig | None = None,
+        max_concurrency: int = 3,
+    ):
+        """Initialize the async client.
+
+        Args:
+            config: NotionConfig instance. If None, loads from environment.
+            max_concurrency: Maximum requests in flight at once
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.max_concurrency = max_concurrency
+        self._client = NotionClient(config)
+        self.config = self._client.config
+        self.metrics = self._client.metrics
+
+        # One keep-alive connection per concurrent request
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self._client._session.mount("https://", adapter)
+        self._client._session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="notion",
+        )
+
+    async def __aenter__(self) -> "AsyncNotionClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Wait for in-flight requests and release connections."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, partial(self._executor.shutdown, wait=True)
+        )
+        self._client._session.close()
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking NotionClient call on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def create_page(
+        self,
+        parent_page_id: str,
+        title: str,
+        children: list[dict[str, Any]] | None = None,
+        icon: dict[str, Any] | None = None,
+        cover: dict[str, Any] | None = None,
+        lean: bool = False,
+    ) -> dict[str, Any]:
+        """Create a new page under a parent page. See NotionClient.create_page."""
+        return await self._run(
+            self._client.create_page, parent_page_id, title, children, icon, cover, lean
+        )
+
+    async def append_blocks(
+        self,
+        block_id: str,
+        children: list[dict[str, Any]],
+        after: str | None = None,
+        lean: bool = False,
+    ) -> dict[str, Any]:
+        """Append blocks to a page or block. See NotionClient.append_blocks."""
+        return await self._run(self._client.append_blocks, block_id, children, after, lean)
+
+    async def append_blocks_chunked(
+        self,
+        block_id: str,
+        children: list[dict[str, Any]],
+        chunk_size: int = MAX_ARRAY_BLOCKS,
+        lean: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Append packed requests. See NotionClient.append_blocks_chunked.
+
+        Requests for one parent are sent in order, since Notion appends each
+        batch after the previous one; run several parents concurrently instead.
+        """
+        responses = []
+        for request in pack_blocks(children, chunk_size):
+            response = await self.append_blocks(block_id, request.children, lean=lean)
+            await self._run(send_deferred, self._client, response["results"], request)
+            responses.append(response)
+        return responses
+
+    async def upload_file(
+        self,
+        file_path: str | Path,
+        part_size: int = UPLOAD_PART_SIZE,
+        max_workers: int = 3,
+    ) -> str:
+        """Upload a file and return its file_upload ID. See NotionClient.upload_file."""
+        return await self._run(self._client.upload_file, file_path, part_size, max_workers)
+
+    async def get_block_children(
+        self,
+        block_id: str,
+        start_cursor: str | None = None,
+        page_size: int = 100,
+    ) -> dict[str, Any]:
+        """Retrieve one page of a block's children. See NotionClient.get_block_children."""
+        return await self._run(self._client.get_block_children, block_id, start_cursor, page_size)
+
+    async def update_block(self, block_id: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Update a block in place. See NotionClient.update_block."""
+        return await self._run(self._client.update_block, block_id, payload)
+
+    async def delete_block(self, block_id: str) -> dict[str, Any]:
+        """Delete (archive) a block. See NotionClient.delete_block."""
+        return await self._run(self._client.delete_block, block_id)
+
+    async def get_page(self, page_id: str) -> dict[str, Any]:
+        """Retrieve a page by ID. See NotionClient.get_page."""
+        return await self._run(self._client.get_page, page_id)
+
+    async def search(
+        self,
+        query: str = "",
+        filter_type: str | None = None,
+        page_size: int = 100,
+        start_cursor: str | None = None,
+        sort_direction: str | None = None,
+    ) -> dict[str, Any]:
+        """Search for pages and databases. See NotionClient.search."""
+        return await self._run(
+            self._client.search, query, filter_type, page_size, start_cursor, sort_direction
+        )
+
 
 def main():
     """Test the Notion client."""
@@ -5,11 +5,34 @@ Notion Block Converter.
 Converts parsed Markdown blocks to Notion API block objects.
 """
 
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
 from markdown_parser import BlockType, InlineStyle, MarkdownBlock
 
+# Code block languages Notion accepts
+NOTION_LANGUAGES = frozenset({
+    "abap", "arduino", "bash", "basic", "c", "clojure", "coffeescript",
+    "c++", "c#", "css", "dart", "diff", "docker", "elixir", "elm",
+    "erlang", "flow", "fortran", "f#", "gherkin", "glsl", "go", "graphql",
+    "groovy", "haskell", "html", "java", "javascript", "json", "julia",
+    "kotlin", "latex", "less", "lisp", "livescript", "lua", "makefile",
+    "markdown", "markup", "matlab", "mermaid", "nix", "objective-c",
+    "ocaml", "pascal", "perl", "php", "plain text", "powershell",
+    "prolog", "protobuf", "python", "r", "reason", "ruby", "rust",
+    "sass", "scala", "scheme", "scss", "shell", "sql", "swift",
+    "typescript", "vb.net", "verilog", "vhdl", "visual basic",
+    "webassembly", "xml", "yaml", "java/c/c++/c#",
+})
+
+# Heading block type -> Notion block type
+NOTION_HEADING_TYPES = {
+    BlockType.HEADING1: "heading_1",
+    BlockType.HEADING2: "heading_2",
+    BlockType.HEADING3: "heading_3",
+}
+
 
 class NotionBlockConverter:
     """Converts MarkdownBlock objects to Notion API block format."""
@@ -34,6 +57,25 @@ class NotionBlockConverter:
         "": "plain text",
     }
 
+    # Callout type -> emoji name
+    CALLOUT_EMOJI = {
+        "note": "information_source",
+        "warning": "warning",
+        "tip": "bulb",
+        "important": "star",
+        "caution": "construction",
+    }
+
+    # Emoji name -> emoji character
+    EMOJI = {
+        "information_source": "ℹ️",
+        "warning": "⚠️",
+        "bulb": "💡",
+        "star": "⭐",
+        "construction": "🚧",
+        "memo": "📝",
+    }
+
     def __init__(
         self,
         image_uploader: Any | None = None,
@@ -47,6 +89,21 @@ class NotionBlockConverter:
         """
         self.image_uploader = image_uploader
         self.base_path = Path(base_path) if base_path else Path.cwd()
+        self._converters = {
+            BlockType.HEADING1: self._convert_heading,
+            BlockType.HEADING2: self._convert_heading,
+            BlockType.HEADING3: self._convert_heading,
+            BlockType.PARAGRAPH: self._convert_paragraph,
+            BlockType.BULLETED_LIST: self._convert_bulleted_list,
+            BlockType.NUMBERED_LIST: self._convert_numbered_list,
+            BlockType.CODE_BLOCK: self._convert_code_block,
+            BlockType.QUOTE: self._convert_quote,
+            BlockType.DIVIDER: self._convert_divider,
+            BlockType.IMAGE: self._convert_image,
+            BlockType.TABLE: self._convert_table,
+            BlockType.TODO: self._convert_todo,
+            BlockType.CALLOUT: self._convert_callout,
+        }
 
     def convert_blocks(
         self,
@@ -60,15 +117,30 @@ class NotionBlockConverter:
         Returns:
             List of Notion block objects
         """
-        notion_blocks = []
+        return list(self.iter_convert_blocks(blocks))
+
+    def iter_convert_blocks(
+        self,
+        blocks: Iterable[MarkdownBlock],
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily convert MarkdownBlocks to Notion blocks.
+
+        Pairs with MarkdownParser.parse_stream so conversion (and image
+        uploads) can start before the whole document has been parsed.
+
+        Args:
+            blocks: Iterable of parsed MarkdownBlock objects
+
+        Yields:
+            Notion block objects
+        """
         for block in blocks:
             converted = self.convert_block(block)
             if converted:
                 if isinstance(converted, list):
-                    notion_blocks.extend(converted)
+                    yield from converted
                 else:
-                    notion_blocks.append(converted)
-        return notion_blocks
+                    yield converted
 
     def convert_block(
         self,
@@ -82,26 +154,17 @@ class NotionBlockConverter:
         Returns:
             Notion block object, list of blocks, or None
         """
-        converters = {
-            BlockType.HEADING1: self._convert_heading,
-            BlockType.HEADING2: self._convert_heading,
-            BlockType.HEADING3: self._convert_heading,
-            BlockType.PARAGRAPH: self._convert_paragraph,
-            BlockType.BULLETED_LIST: self._convert_bulleted_list,
-            BlockType.NUMBERED_LIST: self._convert_numbered_list,
-            BlockType.CODE_BLOCK: self._convert_code_block,
-            BlockType.QUOTE: self._convert_quote,
-            BlockType.DIVIDER: self._convert_divider,
-            BlockType.IMAGE: self._convert_image,
-            BlockType.TABLE: self._convert_table,
-            BlockType.TODO: self._convert_todo,
-            BlockType.CALLOUT: self._convert_callout,
-        }
-
-        converter = converters.get(block.block_type)
-        if converter:
-            return converter(block)
-        return None
+        converter = self._converters.get(block.block_type)
+        if not converter:
+            return None
+
+        converted = converter(block)
+        if block.children and isinstance(converted, dict):
+            # Nested list items travel inside their parent block
+            converted[converted["type"]]["children"] = list(
+                self.iter_convert_blocks(block.children)
+            )
+        return converted
 
     def _convert_rich_text(
         self,
@@ -145,12 +208,7 @@ class NotionBlockConverter:
         block: MarkdownBlock,
     ) -> dict[str, Any]:
         """Convert heading block."""
-        heading_map = {
-            BlockType.HEADING1: "heading_1",
-            BlockType.HEADING2: "heading_2",
-            BlockType.HEADING3: "heading_3",
-        }
-        heading_type = heading_map[block.block_type]
+        heading_type = NOTION_HEADING_TYPES[block.block_type]
 
         return {
             "object": "block",
@@ -209,26 +267,7 @@ class NotionBlockConverter:
         block: MarkdownBlock,
     ) -> dict[str, Any]:
         """Convert code block."""
-        language = block.metadata.get("language", "plain text")
-        language = self.LANGUAGE_MAP.get(language, language)
-
-        # Notion has specific language values
-        valid_languages = {
-            "abap", "arduino", "bash", "basic", "c", "clojure", "coffeescript",
-            "c++", "c#", "css", "dart", "diff", "docker", "elixir", "elm",
-            "erlang", "flow", "fortran", "f#", "gherkin", "glsl", "go", "graphql",
-            "groovy", "haskell", "html", "java", "javascript", "json", "julia",
-            "kotlin", "latex", "less", "lisp", "livescript", "lua", "makefile",
-            "markdown", "markup", "matlab", "mermaid", "nix", "objective-c",
-            "ocaml", "pascal", "perl", "php", "plain text", "powershell",
-            "prolog", "protobuf", "python", "r", "reason", "ruby", "rust",
-            "sass", "scala", "scheme", "scss", "shell", "sql", "swift",
-            "typescript", "vb.net", "verilog", "vhdl", "visual basic",
-            "webassembly", "xml", "yaml", "java/c/c++/c#",
-        }
-
-        if language.lower() not in valid_languages:
-            language = "plain text"
+        language = self.code_language(block.metadata.get("language", "plain text"))
 
         return {
             "object": "block",
@@ -237,7 +276,7 @@ class NotionBlockConverter:
                 "rich_text": [
                     {"type": "text", "text": {"content": block.content}}
                 ],
-                "language": language.lower(),
+                "language": language,
                 "caption": [],
             },
         }
@@ -267,14 +306,88 @@ class NotionBlockConverter:
             "divider": {},
         }
 
+    @classmethod
+    def code_language(cls, language: str) -> str:
+        """Map a fence language tag to a Notion code language.
+
+        Args:
+            language: Language tag from the opening fence
+
+        Returns:
+            Notion language name ("plain text" if Notion has no match)
+        """
+        language = cls.LANGUAGE_MAP.get(language, language).lower()
+        return language if language in NOTION_LANGUAGES else "plain text"
+
+    def local_image_paths(self, blocks: Iterable[MarkdownBlock]) -> list[str]:
+        """Collect the local image files that conversion would upload.
+
+        Lets callers upload every image up front (e.g. concurrently) and then
+        convert with an image_uploader that just looks up the resulting IDs.
+
+        Args:
+            blocks: Parsed MarkdownBlock objects
+
+        Returns:
+            Distinct existing image paths, in document order, exactly as
+            they will be passed to image_uploader
+        """
+        paths: dict[str, None] = {}
+        for block in blocks:
+            if block.block_type != BlockType.IMAGE:
+                continue
+            url = block.metadata.get("url", "")
+            if url.startswith(("http://", "https://")):
+                continue
+            local_path = self.base_path / url
+            if local_path.exists():
+                paths[str(local_path)] = None
+        return list(paths)
+
+    @staticmethod
+    def image_upload_failed_block(url: str, error: Exception) -> dict[str, Any]:
+        """Build the paragraph that stands in for an image whose upload failed.
+
+        Args:
+            url: Image path as written in the Markdown source
+            error: Exception raised by the uploader
+
+        Returns:
+            Notion paragraph block with a red italic error message
+        """
+        return {
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": f"[Image upload failed: {url}] - {error}"},
+                        "annotations": {"italic": True, "color": "red"},
+                    }
+                ],
+            },
+        }
+
     def _convert_image(
         self,
         block: MarkdownBlock,
     ) -> dict[str, Any]:
         """Convert image block."""
-        url = block.metadata.get("url", "")
         alt_text = block.content if isinstance(block.content, str) else ""
+        return self.image_block(block.metadata.get("url", ""), alt_text)
+
+    def image_block(self, url: str, alt_text: str = "") -> dict[str, Any]:
+        """Build the block for an image, uploading it if it is a local file.
 
+        Args:
+            url: Image URL or path relative to base_path
+            alt_text: Alt text, used as the caption
+
+        Returns:
+            Notion image block, or a paragraph placeholder when the image
+            is missing or its upload failed
+        """
         # Check if it's a local file or URL
         if url.startswith(("http://", "https://")):
             # External URL
@@ -308,19 +421,7 @@ class NotionBlockConverter:
                     }
                 except Exception as e:
                     # Fall back to paragraph with error message
-                    return {
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {"content": f"[Image upload failed: {url}] - {e}"},
-                                    "annotations": {"italic": True, "color": "red"},
-                                }
-                            ],
-                        },
-                    }
+                    return self.image_upload_failed_block(url, e)
             else:
                 # No uploader or file not found
                 return {
@@ -405,16 +506,7 @@ class NotionBlockConverter:
     ) -> dict[str, Any]:
         """Convert callout block."""
         callout_type = block.metadata.get("type", "note")
-
-        # Emoji mapping
-        emoji_map = {
-            "note": "information_source",
-            "warning": "warning",
-            "tip": "bulb",
-            "important": "star",
-            "caution": "construction",
-        }
-        emoji = emoji_map.get(callout_type, "memo")
+        emoji = self.CALLOUT_EMOJI.get(callout_type, "memo")
 
         return {
             "object": "block",
@@ -428,15 +520,7 @@ class NotionBlockConverter:
 
     def _get_emoji(self, name: str) -> str:
         """Get emoji character from name."""
-        emoji_map = {
-            "information_source": "ℹ️",
-            "warning": "⚠️",
-            "bulb": "💡",
-            "star": "⭐",
-            "construction": "🚧",
-            "memo": "📝",
-        }
-        return emoji_map.get(name, "ℹ️")
+        return self.EMOJI.get(name, "ℹ️")
 
 
 def main():
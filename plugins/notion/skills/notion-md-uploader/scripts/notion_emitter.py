@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Single-pass Markdown to Notion block emitter.
+
+Runs the line state machine MarkdownParser is built on
+(MarkdownStateMachine) with factories that build Notion block dicts and
+rich text runs directly, so no MarkdownBlock or InlineStyle objects are
+created and there is no second walk over the document. Output is
+identical to NotionBlockConverter.convert_blocks(MarkdownParser.parse(text)).
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from markdown_parser import (
+    EMPTY_METADATA,
+    STYLE_BOLD,
+    STYLE_CODE,
+    STYLE_ITALIC,
+    STYLE_STRIKETHROUGH,
+    BlockType,
+    MarkdownStateMachine,
+)
+from notion_converter import NOTION_HEADING_TYPES, NotionBlockConverter
+
+# Annotations for every combination of InlineStyle.flags bits
+ANNOTATIONS = tuple(
+    {
+        "bold": bool(flags & STYLE_BOLD),
+        "italic": bool(flags & STYLE_ITALIC),
+        "strikethrough": bool(flags & STYLE_STRIKETHROUGH),
+        "underline": False,
+        "code": bool(flags & STYLE_CODE),
+        "color": "default",
+    }
+    for flags in range(16)
+)
+
+# Block types whose body is just rich_text and color
+TEXT_BLOCK_TYPES = {
+    BlockType.PARAGRAPH: "paragraph",
+    BlockType.BULLETED_LIST: "bulleted_list_item",
+    BlockType.NUMBERED_LIST: "numbered_list_item",
+    BlockType.QUOTE: "quote",
+}
+
+
+def rich_text_run(text: str, flags: int = 0, link: str | None = None) -> dict[str, Any]:
+    """Build one Notion rich_text item; same signature as InlineStyle.
+
+    Args:
+        text: Run text
+        flags: STYLE_* bits
+        link: Link target (kept only for HTTP(S) URLs)
+
+    Returns:
+        Notion rich_text item
+    """
+    run = {
+        "type": "text",
+        "text": {"content": text},
+        "annotations": ANNOTATIONS[flags].copy(),
+    }
+    if link and link.startswith(("http://", "https://")):
+        run["text"]["link"] = {"url": link}
+    return run
+
+
+class NotionEmitter(MarkdownStateMachine[dict[str, Any]]):
+    """Converts Markdown straight to Notion blocks in one pass.
+
+    Emitted blocks carry no source line spans; use MarkdownParser where
+    incremental reparsing is needed.
+    """
+
+    _make_run = staticmethod(rich_text_run)
+
+    def __init__(self, converter: NotionBlockConverter | None = None):
+        """Initialize the emitter.
+
+        Args:
+            converter: Converter supplying image handling (image_uploader,
+                base_path). If None, a default converter is used.
+        """
+        self.converter = converter or NotionBlockConverter()
+        super().__init__(str(self.converter.base_path))
+        self._builders = {
+            BlockType.HEADING1: self._heading,
+            BlockType.HEADING2: self._heading,
+            BlockType.HEADING3: self._heading,
+            BlockType.PARAGRAPH: self._text,
+            BlockType.BULLETED_LIST: self._text,
+            BlockType.NUMBERED_LIST: self._text,
+            BlockType.QUOTE: self._text,
+            BlockType.CODE_BLOCK: self._code,
+            BlockType.DIVIDER: self._divider,
+            BlockType.IMAGE: self._image,
+            BlockType.TABLE: self._table,
+            BlockType.TODO: self._todo,
+            BlockType.CALLOUT: self._callout,
+        }
+
+    def emit(self, markdown_text: str) -> list[dict[str, Any]]:
+        """Convert Markdown text to Notion blocks.
+
+        Args:
+            markdown_text: The Markdown text to convert
+
+        Returns:
+            List of Notion block objects
+        """
+        return list(self._iter_blocks(markdown_text.split("\n")))
+
+    def emit_stream(self, lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+        """Convert Markdown lines lazily, yielding blocks as they close.
+
+        Args:
+            lines: Iterable of lines, each optionally ending in "\n"
+                (e.g. an open text file)
+
+        Yields:
+            Notion block objects in document order
+        """
+        return self._iter_blocks(self._strip_newlines(lines))
+
+    # Factory hooks
+
+    def _make_block(
+        self,
+        block_type: BlockType,
+        content: list[dict[str, Any]] | str = "",
+        metadata: Mapping[str, Any] = EMPTY_METADATA,
+    ) -> dict[str, Any]:
+        return self._builders[block_type](block_type, content, metadata)
+
+    @staticmethod
+    def _add_child(parent: dict[str, Any], child: dict[str, Any]) -> None:
+        parent[parent["type"]].setdefault("children", []).append(child)
+
+    def _parse_inline(self, text: str) -> list[dict[str, Any]]:
+        if not text:
+            return [{"type": "text", "text": {"content": ""}}]
+        return self._tokenize_inline(text)
+
+    # Block builders, matching NotionBlockConverter's output
+
+    def _heading(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build a heading block."""
+        heading_type = NOTION_HEADING_TYPES[block_type]
+        return {
+            "object": "block",
+            "type": heading_type,
+            heading_type: {"rich_text": content, "color": "default", "is_toggleable": False},
+        }
+
+    def _text(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build a paragraph, list item or quote block."""
+        notion_type = TEXT_BLOCK_TYPES[block_type]
+        return {
+            "object": "block",
+            "type": notion_type,
+            notion_type: {"rich_text": content, "color": "default"},
+        }
+
+    def _code(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build a code block."""
+        return {
+            "object": "block",
+            "type": "code",
+            "code": {
+                "rich_text": [{"type": "text", "text": {"content": content}}],
+                "language": self.converter.code_language(metadata["language"]),
+                "caption": [],
+            },
+        }
+
+    def _divider(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build a divider block."""
+        return {"object": "block", "type": "divider", "divider": {}}
+
+    def _image(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build an image block, uploading a local file through the converter."""
+        return self.converter.image_block(metadata["url"], content)
+
+    def _table(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build a table block with its rows as children."""
+        column_count = metadata["column_count"]
+        table_rows = []
+        for row in metadata["rows"]:
+            cells = row[:column_count]
+            cells.extend([""] * (column_count - len(cells)))
+            table_rows.append({
+                "object": "block",
+                "type": "table_row",
+                "table_row": {
+                    "cells": [[{"type": "text", "text": {"content": cell}}] for cell in cells]
+                },
+            })
+        return {
+            "object": "block",
+            "type": "table",
+            "table": {
+                "table_width": column_count,
+                "has_column_header": metadata["has_header"],
+                "has_row_header": False,
+                "children": table_rows,
+            },
+        }
+
+    def _todo(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build a to-do block."""
+        return {
+            "object": "block",
+            "type": "to_do",
+            "to_do": {"rich_text": content, "checked": metadata["checked"], "color": "default"},
+        }
+
+    def _callout(
+        self,
+        block_type: BlockType,
+        content: Any,
+        metadata: Mapping[str, Any],
+    ) -> dict[str, Any]:
+        """Build a callout block."""
+        converter = self.converter
+        emoji = converter.CALLOUT_EMOJI.get(metadata["type"], "memo")
+        return {
+            "object": "block",
+            "type": "callout",
+            "callout": {
+                "rich_text": content,
+                "icon": {"type": "emoji", "emoji": converter.EMOJI.get(emoji, "ℹ️")},
+                "color": "default",
+            },
+        }
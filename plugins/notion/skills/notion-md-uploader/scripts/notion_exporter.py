@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Export Notion pages to Markdown.
+
+Walks a page's block tree through paginated blocks/{id}/children calls and
+writes Markdown as it goes, in the syntax MarkdownParser reads back. While
+one block is being written, the children of its siblings and the next page
+of results are already being fetched on a small thread pool. All requests
+go through the shared NotionClient, so its rate limiter and retries apply.
+Only the pages of results on the current path through the tree are held in
+memory, never the whole tree.
+
+Usage:
+    python notion_exporter.py PAGE_ID [--output FILE] [--workers 3]
+"""
+
+import argparse
+import re
+import sys
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TextIO
+
+from notion_client import NotionAPIError, NotionClient
+from notion_converter import NotionBlockConverter
+from upload_md import extract_page_id
+
+# Block types written as Markdown list items; their children are indented
+LIST_PREFIXES = {
+    "bulleted_list_item": "- ",
+    "numbered_list_item": "1. ",
+    "toggle": "- ",
+}
+
+LIST_TYPES = frozenset({*LIST_PREFIXES, "to_do"})
+
+HEADING_PREFIXES = {
+    "heading_1": "# ",
+    "heading_2": "## ",
+    "heading_3": "### ",
+}
+
+# Callout emoji -> GitHub callout type, the reverse of the converter's mapping
+CALLOUT_TYPES = {
+    NotionBlockConverter.EMOJI[emoji]: callout_type.upper()
+    for callout_type, emoji in NotionBlockConverter.CALLOUT_EMOJI.items()
+}
+
+# Fence languages MarkdownParser recognises (CODE_BLOCK_START)
+FENCE_LANGUAGE = re.compile(r"\w+")
+
+INDENT = "  "
+
+
+def rich_text_to_markdown(rich_text: list[dict[str, Any]]) -> str:
+    """Render a Notion rich_text array as inline Markdown.
+
+    Args:
+        rich_text: Rich text items as returned by the API
+
+    Returns:
+        Markdown text
+    """
+    parts = []
+    for item in rich_text:
+        text = item.get("plain_text")
+        if text is None:
+            text = (item.get("text") or {}).get("content", "")
+        if not text:
+            continue
+        annotations = item.get("annotations") or {}
+        if annotations.get("code"):
+            text = f"`{text}`"
+        if annotations.get("bold"):
+            text = f"**{text}**"
+        if annotations.get("italic"):
+            text = f"*{text}*"
+        if annotations.get("strikethrough"):
+            text = f"~~{text}~~"
+        href = item.get("href") or ((item.get("text") or {}).get("link") or {}).get("url")
+        if href:
+            text = f"[{text}]({href})"
+        parts.append(text)
+    return "".join(parts)
+
+
+def _plain_text(rich_text: list[dict[str, Any]]) -> str:
+    return "".join(
+        item.get("plain_text") or (item.get("text") or {}).get("content", "")
+        for item in rich_text
+    )
+
+
+def _page_url(block_id: str) -> str:
+    return f"https://www.notion.so/{block_id.replace('-', '')}"
+
+
+class NotionExporter:
+    """Streams Notion pages out as Markdown."""
+
+    def __init__(self, client: NotionClient, max_workers: int = 3):
+        """Initialize the exporter.
+
+        Args:
+            client: NotionClient used for every request
+            max_workers: Maximum child listings fetched at once
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.client = client
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+
+    def export(self, block_id: str, out: TextIO) -> int:
+        """Write a page's (or block's) children to out as Markdown.
+
+        Args:
+            block_id: ID of the page or block
+            out: Text stream to write to
+
+        Returns:
+            Number of blocks exported, nested blocks and table rows included
+
+        Raises:
+            NotionAPIError: If a request fails after the client's retries
+        """
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="export")
+        self._pool = pool
+        try:
+            return self._write_children(block_id, out, "", None)
+        finally:
+            self._pool = None
+            # Drop prefetches nobody will read if the export failed part way
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def export_to_file(self, block_id: str, path: str | Path) -> int:
+        """Export a page to a Markdown file, writing it as blocks arrive.
+
+        Args:
+            block_id: ID of the page or block
+            path: Output file
+
+        Returns:
+            Number of blocks exported
+        """
+        with open(path, "w", encoding="utf-8") as out:
+            return self.export(block_id, out)
+
+    def _fetch(self, block_id: str, cursor: str | None = None) -> Future:
+        """Start fetching one page of a block's children."""
+        return self._pool.submit(self.client.get_block_children, block_id, cursor)
+
+    def _iter_children(
+        self, block_id: str, first_page: Future | None
+    ) -> Iterator[tuple[dict[str, Any], Future | None]]:
+        """Yield a block's children, each with the fetch of its own first page.
+
+        The next page of results is requested before the current one is
+        handed out, and every child that has children gets its listing
+        started at once, so siblings' subtrees load while earlier ones are
+        being written.
+        """
+        pending = first_page or self._fetch(block_id)
+        while pending is not None:
+            response = pending.result()
+            cursor = response.get("next_cursor")
+            pending = self._fetch(block_id, cursor) if response.get("has_more") and cursor else None
+            results = response.get("results", [])
+            prefetched = [
+                self._fetch(child["id"]) if child.get("has_children") else None
+                for child in results
+            ]
+            yield from zip(results, prefetched)
+
+    def _write_children(
+        self, block_id: str, out: TextIO, indent: str, first_page: Future | None
+    ) -> int:
+        count = 0
+        previous = None
+        for block, children in self._iter_children(block_id, first_page):
+            block_type = block["type"]
+            # Top-level blocks are separated by a blank line, except items of
+            # one list. A different kind of list item must not run on, or
+            # MarkdownParser would continue the previous list with it.
+            if previous is not None and not indent and not (
+                block_type == previous and block_type in LIST_TYPES
+            ):
+                out.write("\n")
+            count += 1 + self._write_block(block, children, out, indent)
+            previous = block_type
+        return count
+
+    def _write_block(
+        self, block: dict[str, Any], children: Future | None, out: TextIO, indent: str
+    ) -> int:
+        """Write one block and its subtree; return the number of nested blocks."""
+        block_type = block["type"]
+        body = block.get(block_type) or {}
+        text = rich_text_to_markdown(body.get("rich_text", []))
+        nested_indent = indent
+
+        if block_type in LIST_PREFIXES:
+            self._write_lines(out, indent, LIST_PREFIXES[block_type] + text)
+            nested_indent = indent + INDENT
+        elif block_type == "to_do":
+            mark = "x" if body.get("checked") else " "
+            self._write_lines(out, indent, f"- [{mark}] {text}")
+            nested_indent = indent + INDENT
+        elif block_type in HEADING_PREFIXES:
+            self._write_lines(out, indent, HEADING_PREFIXES[block_type] + text)
+        elif block_type == "paragraph":
+            # MarkdownParser reads a trailing double space as a line break
+            self._write_lines(out, indent, text.replace("\n", "  \n"))
+        elif block_type == "quote":
+            self._write_lines(out, indent, "\n".join(f"> {line}" for line in text.split("\n")))
+        elif block_type == "callout":
+            emoji = (body.get("icon") or {}).get("emoji")
+            lines = [f"> [!{CALLOUT_TYPES.get(emoji, 'NOTE')}]"]
+            lines.extend(f"> {line}" for line in text.split("\n"))
+            self._write_lines(out, indent, "\n".join(lines))
+        elif block_type == "code":
+            language = body.get("language", "")
+            fence = "```" + (language if FENCE_LANGUAGE.fullmatch(language) else "")
+            code = _plain_text(body.get("rich_text", []))
+            self._write_lines(out, indent, f"{fence}\n{code}\n```")
+        elif block_type == "divider":
+            self._write_lines(out, indent, "---")
+        elif block_type == "image":
+            source = body.get(body.get("type", "external")) or {}
+            caption = _plain_text(body.get("caption", []))
+            self._write_lines(out, indent, f"![{caption}]({source.get('url', '')})")
+        elif block_type == "table":
+            return self._write_table(block, children, out, indent)
+        elif block_type == "child_page":
+            self._write_lines(out, indent, f"[{body.get('title', '')}]({_page_url(block['id'])})")
+        elif block_type in ("bookmark", "embed", "link_preview"):
+            url = body.get("url", "")
+            self._write_lines(out, indent, f"[{url}]({url})")
+        elif block_type == "equation":
+            self._write_lines(out, indent, f"$${body.get('expression', '')}$$")
+        else:
+            self._write_lines(out, indent, f"<!-- unsupported block type: {block_type} -->")
+
+        if children is None:
+            return 0
+        return self._write_children(block["id"], out, nested_indent, children)
+
+    def _write_table(
+        self, block: dict[str, Any], rows: Future | None, out: TextIO, indent: str
+    ) -> int:
+        """Write a table from its table_row children; return the row count."""
+        width = (block.get("table") or {}).get("table_width", 0)
+        count = 0
+        if rows is None:
+            return count
+        for row, _ in self._iter_children(block["id"], rows):
+            cells = [
+                rich_text_to_markdown(cell).replace("|", "\\|")
+                for cell in (row.get("table_row") or {}).get("cells", [])
+            ]
+            self._write_lines(out, indent, f"| {' | '.join(cells)} |")
+            if not count:
+                self._write_lines(out, indent, "|" + "---|" * max(width, len(cells), 1))
+            count += 1
+        return count
+
+    @staticmethod
+    def _write_lines(out: TextIO, indent: str, text: str) -> None:
+        if indent:
+            text = "\n".join(indent + line for line in text.split("\n"))
+        out.write(text + "\n")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Export a Notion page to Markdown",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python notion_exporter.py abc123 --output backup/report.md
+    python notion_exporter.py "https://notion.so/My-Report-abc123" > report.md
+    python notion_exporter.py abc123 --output wiki.md --workers 6
+
+Environment Variables:
+    NOTION_API_KEY    Required. Your Notion integration API key.
+        """,
+    )
+    parser.add_argument("page", help="Notion page ID or URL")
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="Markdown file to write (default: standard output)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=3,
+        help="Child listings fetched at once (default: 3)",
+    )
+    args = parser.parse_args()
+
+    try:
+        exporter = NotionExporter(NotionClient(), max_workers=args.workers)
+        page_id = extract_page_id(args.page)
+        if args.output:
+            count = exporter.export_to_file(page_id, args.output)
+            print(f"Exported {count} blocks to {args.output}", file=sys.stderr)
+        else:
+            exporter.export(page_id, sys.stdout)
+    except (NotionAPIError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Diff-based Notion page updates.
+
+Compares a page's existing child blocks with freshly converted blocks and
+produces a short edit script (update in place, insert, delete) so that
+re-syncing an edited document only touches the blocks that changed.
+
+Blocks are matched by a content signature: a hash of the block with
+API-only fields and default values stripped, so a block read back from
+Notion hashes the same as the converter output that created it. Notion
+returns uploaded images as expiring file URLs, so those are signed by the
+content digest of the local image they were uploaded from, recorded by
+block ID. Converter output to diff carries that digest in place of its
+file_upload ID, so images only need uploading once the edit script shows
+they are inserted.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from enum import Enum, auto
+from typing import Any
+
+from block_packer import pack_blocks, send_deferred
+
+# Block types whose content can be replaced with PATCH /blocks/{id}
+UPDATABLE_TYPES = frozenset({
+    "paragraph",
+    "heading_1",
+    "heading_2",
+    "heading_3",
+    "bulleted_list_item",
+    "numbered_list_item",
+    "to_do",
+    "quote",
+    "callout",
+    "code",
+})
+
+# Field values Notion fills in by default; dropped so both sides hash alike
+_DEFAULT_VALUES = (None, False, "default", [], {})
+
+
+class EditKind(Enum):
+    """Operations in a page edit script."""
+
+    UPDATE = auto()
+    DELETE = auto()
+    INSERT = auto()
+
+
+@dataclass
+class BlockEdit:
+    """One step of a page edit script.
+
+    UPDATE replaces the content of block_id with blocks[0]. DELETE removes
+    block_id. INSERT adds blocks after the anchor in after: an existing
+    block ID, the index of an earlier INSERT edit (meaning "after the last
+    block that edit created"), or None to append at the end of the page.
+    """
+
+    kind: EditKind
+    block_id: str | None = None
+    blocks: list[dict[str, Any]] = field(default_factory=list)
+    after: str | int | None = None
+
+
+def block_signature(
+    block: dict[str, Any],
+    image_digests: Mapping[str, str] | None = None,
+) -> str | None:
+    """Return a content hash identifying a block, ignoring API-only fields.
+
+    Args:
+        block: Notion block, either converter output or read from the API
+            (with nested children attached under block[type]["children"]).
+            In converter output, an uploaded image's file_upload ID is
+            taken to be the content digest of its local file.
+        image_digests: Content digests of uploaded image blocks read from
+            the API, by block ID (optional)
+
+    Returns:
+        Hex digest, or None for blocks that can't be matched (images read
+        back from the API whose digest wasn't recorded)
+    """
+    canonical = _canonical_block(block, image_digests or {})
+    if canonical is None:
+        return None
+    encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def record_image_uploads(
+    sent: Iterable[dict[str, Any]],
+    created: Iterable[dict[str, Any]],
+    image_uploads: dict[str, str],
+) -> None:
+    """Note the file_upload ID of each uploaded image block just created.
+
+    Args:
+        sent: Top-level blocks of an append or create request
+        created: The blocks Notion created for them, in the same order
+        image_uploads: Map of block ID to file_upload ID to add to
+    """
+    for block, result in zip(sent, created):
+        body = block[block["type"]]
+        if block["type"] == "image" and body.get("type") == "file_upload":
+            image_uploads[result["id"]] = body["file_upload"]["id"]
+
+
+def _canonical_block(block: dict[str, Any], image_digests: Mapping[str, str]) -> dict[str, Any] | None:
+    block_type = block["type"]
+    body = block.get(block_type) or {}
+    if block_type == "image" and body.get("type") != "external":
+        if body.get("type") == "file_upload":
+            digest = body["file_upload"]["id"]
+        else:
+            digest = image_digests.get(block.get("id"))
+            if digest is None:
+                return None
+        body = {"type": "file_upload", "digest": digest, "caption": body.get("caption", [])}
+
+    canonical: dict[str, Any] = {"type": block_type}
+    for key, value in body.items():
+        if key in ("rich_text", "caption"):
+            value = _canonical_rich_text(value)
+        elif key == "cells":
+            value = [_canonical_rich_text(cell) for cell in value]
+        elif key == "children":
+            value = [_canonical_block(child, image_digests) for child in value]
+            if None in value:
+                return None
+        if value in _DEFAULT_VALUES:
+            continue
+        canonical[key] = value
+    return canonical
+
+
+def _canonical_rich_text(rich_text: list[dict[str, Any]]) -> list[list[Any]]:
+    """Reduce rich text to [content, link, styles] runs, merging equal neighbours."""
+    runs: list[list[Any]] = []
+    for item in rich_text:
+        text = item.get("text") or {}
+        content = text.get("content", "")
+        if not content:
+            continue
+        link = (text.get("link") or {}).get("url")
+        annotations = item.get("annotations") or {}
+        styles = sorted(
+            name if value is True else f"{name}={value}"
+            for name, value in annotations.items()
+            if value not in _DEFAULT_VALUES
+        )
+        if runs and runs[-1][1:] == [link, styles]:
+            runs[-1][0] += content
+        else:
+            runs.append([content, link, styles])
+    return runs
+
+
+def _updatable(old: dict[str, Any], new: dict[str, Any]) -> bool:
+    """Whether old can become new through an in-place update."""
+    block_type = new["type"]
+    return (
+        old["type"] == block_type
+        and block_type in UPDATABLE_TYPES
+        and not old.get("has_children")
+        and "children" not in new[block_type]
+    )
+
+
+class _NeedsRewrite(Exception):
+    """Blocks must be inserted at the top of the page, which the API cannot do."""
+
+
+def diff_blocks(
+    existing: list[dict[str, Any]],
+    new: list[dict[str, Any]],
+    image_digests: Mapping[str, str] | None = None,
+) -> list[BlockEdit]:
+    """Compute an edit script turning existing page blocks into new ones.
+
+    Matching runs are left alone. Changed blocks of the same updatable type
+    are patched in place, and everything else is deleted or inserted.
+    Notion can only insert after an existing block. If content must go
+    before the first surviving block, that block is updated to the first
+    new block and its old content is re-inserted after it. When the types
+    don't allow that, the page is rewritten.
+
+    Args:
+        existing: Current top-level blocks (with "id"), in page order
+        new: Converted blocks for the updated document, with each
+            uploaded image's content digest in place of its file_upload ID
+        image_digests: Content digests of the page's uploaded image
+            blocks, by block ID (optional). Without it, those images never
+            match.
+
+    Returns:
+        Edit script for apply_edits; empty if nothing changed
+    """
+    old_keys = [block_signature(b, image_digests) or f"~old{i}" for i, b in enumerate(existing)]
+    new_keys = [block_signature(b) or f"~new{j}" for j, b in enumerate(new)]
+    matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+
+    edits: list[BlockEdit] = []
+    pending: list[dict[str, Any]] = []
+    anchor: str | int | None = None
+
+    def flush_before(survivor: dict[str, Any], content: dict[str, Any]) -> bool:
+        """Insert pending blocks ahead of a surviving block.
+
+        Returns True if the survivor was consumed by the top-of-page
+        workaround, in which case its final content has been re-inserted.
+        """
+        nonlocal anchor
+        if not pending:
+            return False
+        if anchor is not None:
+            edits.append(BlockEdit(EditKind.INSERT, blocks=pending.copy(), after=anchor))
+            anchor = len(edits) - 1
+            pending.clear()
+            return False
+        if not _updatable(survivor, pending[0]):
+            raise _NeedsRewrite
+        edits.append(BlockEdit(EditKind.UPDATE, survivor["id"], [pending[0]]))
+        edits.append(BlockEdit(EditKind.INSERT, blocks=pending[1:] + [content], after=survivor["id"]))
+        anchor = len(edits) - 1
+        pending.clear()
+        return True
+
+    try:
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                # A consumed one-block run leaves the anchor on the re-inserted copy
+                if not flush_before(existing[i1], new[j1]) or i2 - i1 > 1:
+                    anchor = existing[i2 - 1]["id"]
+                continue
+
+            for k in range(max(i2 - i1, j2 - j1)):
+                old = existing[i1 + k] if i1 + k < i2 else None
+                block = new[j1 + k] if j1 + k < j2 else None
+                if old is not None and block is not None and _updatable(old, block):
+                    if not flush_before(old, block):
+                        edits.append(BlockEdit(EditKind.UPDATE, old["id"], [block]))
+                        anchor = old["id"]
+                    continue
+                if old is not None:
+                    edits.append(BlockEdit(EditKind.DELETE, old["id"]))
+                if block is not None:
+                    pending.append(block)
+
+        if pending:
+            edits.append(BlockEdit(EditKind.INSERT, blocks=pending.copy(), after=anchor))
+    except _NeedsRewrite:
+        edits = [BlockEdit(EditKind.DELETE, block["id"]) for block in existing]
+        edits.append(BlockEdit(EditKind.INSERT, blocks=list(new)))
+
+    return edits
+
+
+def fetch_block_tree(client: Any, block_id: str) -> list[dict[str, Any]]:
+    """Read a block's children, recursing into blocks that have children.
+
+    Nested children are attached under block[type]["children"], matching
+    the shape the converter produces (e.g. table rows).
+
+    Args:
+        client: NotionClient
+        block_id: ID of the page or block
+
+    Returns:
+        Child blocks in order
+    """
+    children = list(client.iter_block_children(block_id))
+    for child in children:
+        if child.get("has_children"):
+            child[child["type"]]["children"] = fetch_block_tree(client, child["id"])
+    return children
+
+
+def apply_edits(
+    client: Any,
+    page_id: str,
+    edits: list[BlockEdit],
+    block_ids: list[str] | None = None,
+    image_uploads: dict[str, str] | None = None,
+) -> dict[str, int]:
+    """Apply an edit script from diff_blocks to a page.
+
+    Args:
+        client: NotionClient
+        page_id: ID of the page being updated
+        edits: Edit script from diff_blocks
+        block_ids: The page's top-level block IDs in order, as diffed
+            (optional). Updated in place to the order after the edits,
+            using the IDs the append responses return.
+        image_uploads: file_upload IDs of uploaded image blocks, by block
+            ID (optional). Updated in place for deleted and inserted blocks.
+
+    Returns:
+        Counts of updated, deleted and inserted blocks, and requests sent
+    """
+    stats = {"updated": 0, "deleted": 0, "inserted": 0, "requests": 0}
+    last_created: dict[int, str] = {}
+
+    for index, edit in enumerate(edits):
+        if edit.kind == EditKind.DELETE:
+            client.delete_block(edit.block_id)
+            if block_ids is not None:
+                block_ids.remove(edit.block_id)
+            if image_uploads is not None:
+                image_uploads.pop(edit.block_id, None)
+            stats["deleted"] += 1
+            stats["requests"] += 1
+        elif edit.kind == EditKind.UPDATE:
+            block = edit.blocks[0]
+            client.update_block(edit.block_id, {block["type"]: block[block["type"]]})
+            stats["updated"] += 1
+            stats["requests"] += 1
+        else:
+            anchor = last_created[edit.after] if isinstance(edit.after, int) else edit.after
+            after = anchor
+            created_ids: list[str] = []
+            for request in pack_blocks(edit.blocks):
+                response = client.append_blocks(page_id, request.children, after=after, lean=True)
+                created = response["results"]
+                stats["requests"] += 1 + send_deferred(client, created, request)
+                created_ids.extend(block["id"] for block in created)
+                if image_uploads is not None:
+                    record_image_uploads(request.children, created, image_uploads)
+                # Later requests go after the last block this one created
+                after = created[-1]["id"]
+            last_created[index] = after
+            if block_ids is not None:
+                position = block_ids.index(anchor) + 1 if anchor is not None else len(block_ids)
+                block_ids[position:position] = created_ids
+            stats["inserted"] += len(edit.blocks)
+
+    return stats
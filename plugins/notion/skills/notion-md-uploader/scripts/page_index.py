@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Local index of Notion page titles.
+
+Keeps a title -> page mapping of every page the integration can see, so
+parents can be named by title and existing pages detected without a
+search request per document. The index is stored in SQLite and held in
+memory for lookups.
+
+The first refresh reads the whole workspace through the search API. Later
+refreshes read results newest-edit first and stop at the first page older
+than the last refresh, so they usually cost a single request. Pages
+archived or moved to the trash are dropped when they show up as edited.
+A page that disappears without a newer edit stays until a full refresh.
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from image_cache import default_cache_path
+
+
+@dataclass(frozen=True)
+class IndexedPage:
+    """One page in the index."""
+
+    page_id: str
+    title: str
+    parent_id: str | None
+    url: str
+    last_edited_time: str
+
+
+def default_index_path() -> Path:
+    """Return the default index location, next to the image upload cache."""
+    return default_cache_path().with_name("page_index.sqlite3")
+
+
+def page_title(page: dict[str, Any]) -> str:
+    """Return the plain-text title of a page object."""
+    for prop in (page.get("properties") or {}).values():
+        if prop.get("type") == "title" or "title" in prop:
+            return "".join(
+                item.get("plain_text") or item.get("text", {}).get("content", "")
+                for item in prop.get("title", [])
+            )
+    return ""
+
+
+def title_key(title: str) -> str:
+    """Normalize a title for lookups (case and surrounding space ignored)."""
+    return title.strip().casefold()
+
+
+def _normalize_id(page_id: str | None) -> str | None:
+    return page_id.replace("-", "") if page_id else None
+
+
+def _parent_id(page: dict[str, Any]) -> str | None:
+    parent = page.get("parent") or {}
+    parent_type = parent.get("type")
+    if parent_type in ("page_id", "database_id", "block_id"):
+        return _normalize_id(parent[parent_type])
+    return None
+
+
+class PageIndex:
+    """SQLite-backed title index of workspace pages.
+
+    Safe to share between threads. Use as a context manager, or call
+    close() when done.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        """Open (creating if needed) the index and load it into memory.
+
+        Args:
+            path: Database file. If None, uses default_index_path().
+        """
+        self.path = Path(path) if path else default_index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                page_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                parent_id TEXT,
+                url TEXT NOT NULL,
+                last_edited_time TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._pages: dict[str, IndexedPage] = {}
+        self._by_title: dict[str, dict[str, IndexedPage]] = {}
+        for row in self._conn.execute("SELECT * FROM pages"):
+            self._remember(IndexedPage(*row))
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_edited_time'").fetchone()
+        self.last_edited_time: str | None = row[0] if row else None
+
+    def __enter__(self) -> "PageIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def find(self, title: str, parent_id: str | None = None) -> list[IndexedPage]:
+        """Return pages with this title, optionally only under one parent.
+
+        Args:
+            title: Page title (matched ignoring case and surrounding space)
+            parent_id: Parent page ID, with or without hyphens
+
+        Returns:
+            Matching pages, most recently edited first
+        """
+        matches = self._by_title.get(title_key(title), {}).values()
+        if parent_id:
+            parent_id = _normalize_id(parent_id)
+            matches = [page for page in matches if page.parent_id == parent_id]
+        return sorted(matches, key=lambda page: page.last_edited_time, reverse=True)
+
+    def get(self, page_id: str) -> IndexedPage | None:
+        """Return the indexed page with this ID, if any."""
+        return self._pages.get(_normalize_id(page_id))
+
+    def add(
+        self,
+        page: dict[str, Any],
+        title: str | None = None,
+        parent_id: str | None = None,
+    ) -> IndexedPage:
+        """Add or replace a page from an API page object.
+
+        Args:
+            page: Page object (from search, or a create_page response)
+            title: Title to record when page has no properties (lean responses)
+            parent_id: Parent to record when page has no parent field
+
+        Returns:
+            The indexed entry
+        """
+        entry = IndexedPage(
+            page_id=_normalize_id(page["id"]),
+            title=page_title(page) if title is None else title,
+            parent_id=_normalize_id(parent_id) if parent_id else _parent_id(page),
+            url=page.get("url", ""),
+            last_edited_time=page.get("last_edited_time", ""),
+        )
+        with self._lock:
+            self._store(entry)
+            self._conn.commit()
+        return entry
+
+    def refresh(self, client: Any, full: bool = False) -> int:
+        """Bring the index up to date with the workspace.
+
+        Args:
+            client: NotionClient
+            full: Rebuild from scratch instead of reading only newer edits
+
+        Returns:
+            Number of pages added, changed or removed
+        """
+        since = None if full else self.last_edited_time
+        newest = since or ""
+        changes: list[dict[str, Any]] = []
+        for page in client.iter_search(filter_type="page", sort_direction="descending"):
+            edited = page.get("last_edited_time", "")
+            if since and edited < since:
+                break
+            newest = max(newest, edited)
+            changes.append(page)
+
+        with self._lock:
+            if full:
+                self._conn.execute("DELETE FROM pages")
+                self._pages.clear()
+                self._by_title.clear()
+            for page in changes:
+                if page.get("archived") or page.get("in_trash"):
+                    self._forget(_normalize_id(page["id"]))
+                else:
+                    self._store(IndexedPage(
+                        _normalize_id(page["id"]),
+                        page_title(page),
+                        _parent_id(page),
+                        page.get("url", ""),
+                        page.get("last_edited_time", ""),
+                    ))
+            if newest:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('last_edited_time', ?)", (newest,)
+                )
+                self.last_edited_time = newest
+            self._conn.commit()
+        return len(changes)
+
+    def _store(self, entry: IndexedPage) -> None:
+        self._forget(entry.page_id)
+        self._conn.execute(
+            "INSERT INTO pages VALUES (?, ?, ?, ?, ?)",
+            (entry.page_id, entry.title, entry.parent_id, entry.url, entry.last_edited_time),
+        )
+        self._remember(entry)
+
+    def _remember(self, entry: IndexedPage) -> None:
+        self._pages[entry.page_id] = entry
+        self._by_title.setdefault(title_key(entry.title), {})[entry.page_id] = entry
+
+    def _forget(self, page_id: str) -> None:
+        old = self._pages.pop(page_id, None)
+        if old is None:
+            return
+        self._conn.execute("DELETE FROM pages WHERE page_id = ?", (page_id,))
+        same_title = self._by_title[title_key(old.title)]
+        del same_title[page_id]
+        if not same_title:
+            del self._by_title[title_key(old.title)]
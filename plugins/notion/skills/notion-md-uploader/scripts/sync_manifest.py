@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Persistent manifest of synced Markdown files.
+
+Records, for every uploaded or updated file, the content hash it was
+synced at, the page it became, the IDs of that page's top-level blocks in
+source order, the file_upload IDs of its images, which top-level image
+block each was attached as and the content digest of its local file, and
+when it was synced.
+Entries are keyed by absolute path and indexed by content hash, and held
+in memory for lookups. Deciding that a file is unchanged, finding its
+page, or recognising a moved file then takes no API requests.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from image_cache import default_cache_path
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """Sync state of one Markdown file."""
+
+    path: str
+    content_hash: str
+    page_id: str
+    parent_page_id: str | None
+    synced_at: float
+
+
+def default_manifest_path() -> Path:
+    """Return the default manifest location, next to the image upload cache."""
+    return default_cache_path().with_name("sync_manifest.sqlite3")
+
+
+def manifest_key(md_file: str | Path) -> str:
+    """Return the key a file is recorded under (its absolute path)."""
+    return str(Path(md_file).resolve())
+
+
+class SyncManifest:
+    """SQLite-backed record of which page each Markdown file became.
+
+    Safe to share between threads. Use as a context manager, or call
+    close() when done.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open (creating if needed) the manifest and load it into memory.
+
+        Args:
+            path: Database file. If None, uses default_manifest_path().
+            clock: Wall-clock time source
+        """
+        self.path = Path(path) if path else default_manifest_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                page_id TEXT NOT NULL,
+                parent_page_id TEXT,
+                synced_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_by_hash ON files (content_hash);
+            CREATE TABLE IF NOT EXISTS blocks (
+                path TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                block_id TEXT NOT NULL,
+                PRIMARY KEY (path, position)
+            );
+            CREATE TABLE IF NOT EXISTS images (
+                path TEXT NOT NULL,
+                file_upload_id TEXT NOT NULL,
+                PRIMARY KEY (path, file_upload_id)
+            );
+            CREATE TABLE IF NOT EXISTS image_blocks (
+                path TEXT NOT NULL,
+                block_id TEXT NOT NULL,
+                file_upload_id TEXT NOT NULL,
+                PRIMARY KEY (path, block_id)
+            );
+            CREATE TABLE IF NOT EXISTS image_digests (
+                path TEXT NOT NULL,
+                block_id TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (path, block_id)
+            );
+            """
+        )
+        self._entries: dict[str, ManifestEntry] = {}
+        self._by_hash: dict[str, set[str]] = {}
+        for row in self._conn.execute("SELECT * FROM files"):
+            self._remember(ManifestEntry(*row))
+
+    def __enter__(self) -> "SyncManifest":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def get(self, md_file: str | Path) -> ManifestEntry | None:
+        """Return the entry for a file, if it was ever synced."""
+        return self._entries.get(manifest_key(md_file))
+
+    def is_unchanged(self, md_file: str | Path, content_hash: str) -> bool:
+        """Whether the file was last synced with exactly this content."""
+        entry = self.get(md_file)
+        return entry is not None and entry.content_hash == content_hash
+
+    def find_by_hash(self, content_hash: str) -> list[ManifestEntry]:
+        """Return entries synced with this content, most recent first."""
+        entries = [self._entries[key] for key in self._by_hash.get(content_hash, ())]
+        return sorted(entries, key=lambda entry: entry.synced_at, reverse=True)
+
+    def block_ids(self, md_file: str | Path) -> list[str]:
+        """Return the page's top-level block IDs recorded at the last sync."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT block_id FROM blocks WHERE path = ? ORDER BY position",
+                (manifest_key(md_file),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def image_ids(self, md_file: str | Path) -> list[str]:
+        """Return the file_upload IDs of the images attached at the last sync."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_upload_id FROM images WHERE path = ?", (manifest_key(md_file),)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def image_uploads(self, md_file: str | Path) -> dict[str, str]:
+        """Return the file_upload ID of each top-level image block, by block ID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT block_id, file_upload_id FROM image_blocks WHERE path = ?", (manifest_key(md_file),)
+            ).fetchall()
+        return dict(rows)
+
+    def image_digests(self, md_file: str | Path) -> dict[str, str]:
+        """Return the local file digest of each top-level image block, by block ID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT block_id, digest FROM image_digests WHERE path = ?", (manifest_key(md_file),)
+            ).fetchall()
+        return dict(rows)
+
+    def record(
+        self,
+        md_file: str | Path,
+        content_hash: str,
+        page_id: str,
+        parent_page_id: str | None = None,
+        block_ids: Iterable[str] = (),
+        image_ids: Iterable[str] = (),
+        image_uploads: Mapping[str, str] | None = None,
+        image_digests: Mapping[str, str] | None = None,
+    ) -> ManifestEntry:
+        """Record a completed sync, replacing the file's previous entry.
+
+        Args:
+            md_file: Synced Markdown file
+            content_hash: file_digest of the content that was synced
+            page_id: Page the file was synced to
+            parent_page_id: Parent of that page (kept from the previous
+                entry when None)
+            block_ids: The page's top-level block IDs, in order
+            image_ids: file_upload IDs of the file's images
+            image_uploads: file_upload IDs of the page's top-level image
+                blocks, by block ID
+            image_digests: file_digest of the local file behind each of
+                those image blocks, by block ID
+
+        Returns:
+            The new entry
+        """
+        key = manifest_key(md_file)
+        with self._lock:
+            previous = self._entries.get(key)
+            if parent_page_id is None and previous is not None:
+                parent_page_id = previous.parent_page_id
+            entry = ManifestEntry(key, content_hash, page_id, parent_page_id, self._clock())
+            self._forget(key)
+            self._conn.execute(
+                "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                (entry.path, entry.content_hash, entry.page_id, entry.parent_page_id, entry.synced_at),
+            )
+            self._conn.executemany(
+                "INSERT INTO blocks VALUES (?, ?, ?)",
+                ((key, position, block_id) for position, block_id in enumerate(block_ids)),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO images VALUES (?, ?)",
+                ((key, file_upload_id) for file_upload_id in image_ids),
+            )
+            self._conn.executemany(
+                "INSERT INTO image_blocks VALUES (?, ?, ?)",
+                ((key, block_id, upload_id) for block_id, upload_id in (image_uploads or {}).items()),
+            )
+            self._conn.executemany(
+                "INSERT INTO image_digests VALUES (?, ?, ?)",
+                ((key, block_id, digest) for block_id, digest in (image_digests or {}).items()),
+            )
+            self._conn.commit()
+            self._remember(entry)
+        return entry
+
+    def move(self, old_file: str | Path, new_file: str | Path) -> ManifestEntry | None:
+        """Re-key an entry after its file was renamed.
+
+        Args:
+            old_file: Path the file was synced from
+            new_file: Path it lives at now
+
+        Returns:
+            The moved entry, or None if old_file has no entry
+        """
+        old_key, new_key = manifest_key(old_file), manifest_key(new_file)
+        with self._lock:
+            old = self._entries.get(old_key)
+            if old is None:
+                return None
+            self._forget(new_key)
+            for table in ("files", "blocks", "images", "image_blocks", "image_digests"):
+                self._conn.execute(f"UPDATE {table} SET path = ? WHERE path = ?", (new_key, old_key))
+            self._conn.commit()
+            self._unremember(old_key)
+            entry = ManifestEntry(new_key, old.content_hash, old.page_id, old.parent_page_id, old.synced_at)
+            self._remember(entry)
+        return entry
+
+    def remove(self, md_file: str | Path) -> None:
+        """Forget a file."""
+        with self._lock:
+            self._forget(manifest_key(md_file))
+            self._conn.commit()
+
+    def _forget(self, key: str) -> None:
+        for table in ("files", "blocks", "images", "image_blocks", "image_digests"):
+            self._conn.execute(f"DELETE FROM {table} WHERE path = ?", (key,))
+        self._unremember(key)
+
+    def _remember(self, entry: ManifestEntry) -> None:
+        self._entries[entry.path] = entry
+        self._by_hash.setdefault(entry.content_hash, set()).add(entry.path)
+
+    def _unremember(self, key: str) -> None:
+        old = self._entries.pop(key, None)
+        if old is None:
+            return
+        same_hash = self._by_hash[old.content_hash]
+        same_hash.discard(key)
+        if not same_hash:
+            del self._by_hash[old.content_hash]
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Upload telemetry: timing spans, counters and progress.
+
+Stages of an upload (reading, parsing, converting, image uploads, page
+creation, each append) are timed as spans. A span's "self" time leaves out
+spans nested inside it on the same thread, so stage totals add up to the
+time spent instead of counting nested work twice. Every span, progress
+update and counter set can be written to a stream as one JSON object per
+line. format_profile() sums them into a breakdown that shows whether an
+upload was bound by local CPU work or by the API.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Callable, TextIO
+
+# Stages that run locally; everything else waits on the Notion API
+CPU_STAGES = frozenset({"read", "parse", "convert", "diff"})
+
+
+class Telemetry:
+    """Collects stage timings and counters, optionally as JSON lines.
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        sink: TextIO | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Initialize telemetry.
+
+        Args:
+            sink: Stream to write JSON lines to (optional; totals are kept
+                either way)
+            clock: Monotonic time source
+        """
+        self.sink = sink
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = clock()
+        self.stages: dict[str, list[float]] = {}  # stage -> [self seconds, calls]
+        self.counters: dict[str, float] = {}
+
+    def event(self, event: str, **fields: Any) -> None:
+        """Write one JSON line to the sink, if there is one."""
+        if self.sink is None:
+            return
+        line = json.dumps({"ts": round(time.time(), 6), "event": event, **fields}, default=str)
+        with self._lock:
+            self.sink.write(line + "\n")
+            self.sink.flush()
+
+    @contextmanager
+    def span(self, stage: str, **fields: Any) -> Iterator[None]:
+        """Time the enclosed code as one call of a stage.
+
+        Args:
+            stage: Stage name
+            **fields: Extra fields for the JSON line (e.g. the file)
+        """
+        stack = self._stack()
+        stack.append(0.0)  # time spent in nested spans
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self._finish(stage, self._clock() - start, stack, fields)
+
+    def timed(self, stage: str, items: Iterable[Any], **fields: Any) -> Iterator[Any]:
+        """Pass items through, timing how long producing them takes.
+
+        Useful for lazy pipelines, where the work happens whenever the
+        consumer asks for the next item. One span with the total is
+        recorded once the items run out (or the consumer stops).
+
+        Args:
+            stage: Stage name
+            items: Iterable whose production is timed
+            **fields: Extra fields for the JSON line
+
+        Yields:
+            The items, unchanged
+        """
+        iterator = iter(items)
+        total = 0.0
+        nested = 0.0
+        count = 0
+        try:
+            while True:
+                stack = self._stack()
+                stack.append(0.0)
+                start = self._clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed = self._clock() - start
+                    nested += stack.pop()
+                    total += elapsed
+                    if stack:
+                        stack[-1] += elapsed
+                count += 1
+                yield item
+        finally:
+            self._record(stage, total, total - nested, {**fields, "items": count})
+
+    def count(self, **deltas: float) -> None:
+        """Add to named counters (e.g. requests=1)."""
+        with self._lock:
+            for name, delta in deltas.items():
+                self.counters[name] = self.counters.get(name, 0) + delta
+
+    def progress(self, done: int, total: int | None, started: float, **fields: Any) -> None:
+        """Report blocks sent so far, with rate and estimated time left.
+
+        Args:
+            done: Blocks sent
+            total: Blocks in the document, if known
+            started: Clock reading when sending began
+            **fields: Extra fields for the JSON line
+        """
+        elapsed = self._clock() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if total is not None and rate > 0:
+            eta = round(max(0, total - done) / rate, 3)
+        self.event(
+            "progress",
+            **fields,
+            blocks_done=done,
+            blocks_total=total,
+            blocks_per_second=round(rate, 1),
+            eta_seconds=eta,
+        )
+
+    def now(self) -> float:
+        """Current clock reading, for progress(started=...)."""
+        return self._clock()
+
+    def _stack(self) -> list[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, stage: str, elapsed: float, stack: list[float], fields: dict[str, Any]) -> None:
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self._record(stage, elapsed, elapsed - nested, fields)
+
+    def _record(self, stage: str, elapsed: float, self_seconds: float, fields: dict[str, Any]) -> None:
+        with self._lock:
+            totals = self.stages.setdefault(stage, [0.0, 0])
+            totals[0] += self_seconds
+            totals[1] += 1
+        self.event(
+            "span",
+            stage=stage,
+            seconds=round(elapsed, 6),
+            self_seconds=round(self_seconds, 6),
+            **fields,
+        )
+
+    def format_profile(self) -> str:
+        """Return a stage breakdown table with a CPU- versus API-bound verdict."""
+        wall = self._clock() - self.started
+        with self._lock:
+            stages = sorted(self.stages.items(), key=lambda item: item[1][0], reverse=True)
+            counters = dict(self.counters)
+        if not stages:
+            return "Profile: no upload stages recorded"
+
+        lines = [f"Profile ({wall:.2f}s wall):", f"  {'stage':<14}{'seconds':>9}{'share':>8}{'calls':>7}"]
+        for stage, (seconds, calls) in stages:
+            share = seconds / wall * 100 if wall > 0 else 0.0
+            lines.append(f"  {stage:<14}{seconds:>9.3f}{share:>7.1f}%{calls:>7}")
+
+        cpu = sum(seconds for stage, (seconds, _) in stages if stage in CPU_STAGES)
+        api = sum(seconds for stage, (seconds, _) in stages if stage not in CPU_STAGES)
+        waited = counters.get("throttled_seconds", 0.0) + counters.get("backoff_seconds", 0.0)
+        lines.append(
+            f"  local CPU {cpu:.3f}s, API {api:.3f}s "
+            f"(of which {waited:.3f}s rate limiting and retry backoff): "
+            + ("API-bound" if api >= cpu else "CPU-bound")
+        )
+        if counters:
+            lines.append(
+                f"  {int(counters.get('requests', 0))} requests, "
+                f"{int(counters.get('bytes_sent', 0)):,} bytes sent, "
+                f"{int(counters.get('retries', 0))} retries, "
+                f"{int(counters.get('rate_limited', 0))} rate limited"
+            )
+        return "\n".join(lines)
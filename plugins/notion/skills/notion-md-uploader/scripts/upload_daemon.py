@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Long-lived upload daemon.
+
+Keeps the imports, the pooled NotionClient session (with its warm TLS
+connections), the image upload cache and the sync manifest alive, and
+runs upload jobs sent over a local Unix socket by daemon_client.py. Each
+job then costs its API calls, not interpreter startup, imports and a cold
+connection.
+
+Jobs run one at a time, in arrival order: they share one client and its
+rate limit, so running them side by side would not finish them sooner.
+
+Usage:
+    python upload_daemon.py [--socket PATH]
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from client_metrics import MetricsRecorder
+from daemon_client import default_socket_path
+from image_cache import ImageUploadCache, default_cache_path
+from notion_client import NotionAPIError, NotionClient
+from sync_manifest import SyncManifest, default_manifest_path
+from upload_journal import JournalError, UploadJournal
+# Also loads .env, if python-dotenv is available
+from upload_md import (
+    DirectorySync,
+    MarkdownToNotionUploader,
+    collect_markdown_files,
+    extract_page_id,
+    is_page_reference,
+)
+
+
+class UploadDaemon:
+    """Serves upload jobs from one warm uploader over a Unix socket."""
+
+    def __init__(
+        self,
+        uploader: MarkdownToNotionUploader,
+        socket_path: str | Path | None = None,
+        metrics: MetricsRecorder | None = None,
+    ):
+        """Bind the socket (readable by this user only).
+
+        Args:
+            uploader: Uploader every job runs through
+            socket_path: Socket to listen on. If None, uses default_socket_path().
+            metrics: Recorder attached to the uploader's client, served by
+                the metrics op (optional)
+
+        Raises:
+            OSError: If another daemon is already listening on the socket
+        """
+        self.uploader = uploader
+        self.metrics = metrics
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.started = time.time()
+        self.jobs = 0
+        self._job_lock = threading.Lock()
+        self._handlers: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "ping": self._ping,
+            "upload": self._upload,
+            "update": self._update,
+            "sync": self._sync,
+            "metrics": self._metrics,
+            "shutdown": self._shutdown,
+        }
+        self._server = self._bind()
+
+    def _bind(self) -> socketserver.ThreadingUnixStreamServer:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(str(self.socket_path))
+                except OSError:
+                    self.socket_path.unlink()  # left behind by a daemon that died
+                else:
+                    raise OSError(f"An upload daemon is already listening on {self.socket_path}")
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    reply = daemon.handle(line)
+                    self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        old_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        finally:
+            os.umask(old_umask)
+        server.daemon_threads = True
+        return server
+
+    def handle(self, line: bytes) -> dict[str, Any]:
+        """Run one request line and return the reply to send back."""
+        try:
+            request = json.loads(line)
+            handler = self._handlers.get(request.get("op"))
+            if handler is None:
+                raise ValueError(f"Unknown op: {request.get('op')!r}")
+            return {"ok": True, "result": handler(request)}
+        except (NotionAPIError, JournalError, OSError, ValueError) as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            # A bug in one job must not take the daemon down with it
+            traceback.print_exc()
+            return {"ok": False, "error": f"Unexpected error: {e!r}"}
+
+    def serve_forever(self) -> None:
+        """Serve jobs until a shutdown job or shutdown() is called."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Stop serve_forever() (from another thread)."""
+        self._server.shutdown()
+
+    @staticmethod
+    def _argument(request: dict[str, Any], name: str) -> Any:
+        value = request.get(name)
+        if not value:
+            raise ValueError(f"Missing argument: {name}")
+        return value
+
+    def _parent(self, request: dict[str, Any]) -> str:
+        parent = self._argument(request, "parent_page_id")
+        if not is_page_reference(parent):
+            raise ValueError("The daemon needs a parent page ID or URL, not a title")
+        return extract_page_id(parent)
+
+    def _run_job(self, job: Callable[[], Any]) -> Any:
+        with self._job_lock:
+            self.jobs += 1
+            return job()
+
+    def _ping(self, request: dict[str, Any]) -> dict[str, Any]:
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 1), "jobs": self.jobs}
+
+    def _metrics(self, request: dict[str, Any]) -> dict[str, Any]:
+        # Not a job: answered at once, even while an upload runs
+        if self.metrics is None:
+            raise ValueError("This daemon does not record request metrics")
+        if request.get("format") == "prometheus":
+            return {"text": self.metrics.to_prometheus()}
+        return self.metrics.snapshot()
+
+    def _upload(self, request: dict[str, Any]) -> dict[str, Any]:
+        md_file = Path(self._argument(request, "md_file"))
+        parent_page_id = self._parent(request)
+
+        def job():
+            # Journaled like upload_md.py, so an interrupted upload can be resumed
+            if UploadJournal.load(md_file):
+                raise JournalError(
+                    f"An unfinished upload of {md_file} is journaled; finish it with upload_md.py --resume"
+                )
+            journal = UploadJournal.create(md_file, parent_page_id, request.get("title"))
+            try:
+                page = self.uploader.upload_markdown(md_file, parent_page_id, request.get("title"), journal)
+            except FileNotFoundError:
+                journal.finish()
+                raise
+            return {"page_id": page["id"], "url": page.get("url", "")}
+
+        return self._run_job(job)
+
+    def _update(self, request: dict[str, Any]) -> dict[str, int]:
+        md_file = self._argument(request, "md_file")
+        page_id = extract_page_id(self._argument(request, "page_id"))
+        return self._run_job(lambda: self.uploader.update_markdown(md_file, page_id))
+
+    def _sync(self, request: dict[str, Any]) -> dict[str, Any]:
+        if self.uploader.manifest is None:
+            raise ValueError("Sync needs the manifest; restart the daemon without --no-manifest")
+        source = self._argument(request, "source")
+        parent_page_id = self._parent(request)
+
+        def job():
+            md_files = collect_markdown_files(source)
+            if not md_files:
+                raise ValueError(f"No Markdown files found: {source}")
+            files = [
+                {
+                    "md_file": str(result.md_file),
+                    "action": result.action.name,
+                    "page_id": result.page_id,
+                    "error": str(result.error) if result.error else None,
+                }
+                for result in DirectorySync(self.uploader, parent_page_id).sync(md_files)
+            ]
+            return {"files": files, "counts": dict(Counter(item["action"] for item in files))}
+
+        return self._run_job(job)
+
+    def _shutdown(self, request: dict[str, Any]) -> dict[str, Any]:
+        # shutdown() waits for serve_forever to return, so not from its own thread
+        threading.Thread(target=self.shutdown, daemon=True).start()
+        return {"jobs": self.jobs}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Serve Markdown uploads to Notion from a long-lived process",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    python upload_daemon.py &
+    python daemon_client.py README.md --parent-page-id abc123
+    python daemon_client.py --stop
+
+Environment Variables:
+    NOTION_API_KEY    Required. Your Notion integration API key.
+        """,
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help=f"Socket to listen on (default: {default_socket_path()})",
+    )
+    parser.add_argument(
+        "--image-workers",
+        type=int,
+        default=3,
+        help="Maximum concurrent image uploads (default: 3)",
+    )
+    parser.add_argument(
+        "--image-cache",
+        type=str,
+        default=None,
+        help=f"Image upload cache file (default: {default_cache_path()})",
+    )
+    parser.add_argument(
+        "--no-image-cache",
+        action="store_true",
+        help="Always upload images, ignoring the persistent cache",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help=f"Sync manifest file (default: {default_manifest_path()})",
+    )
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Don't record which page each file became",
+    )
+    args = parser.parse_args()
+
+    if not os.getenv("NOTION_API_KEY"):
+        print("Error: NOTION_API_KEY environment variable is not set")
+        sys.exit(1)
+
+    client = NotionClient()
+    uploader = MarkdownToNotionUploader(
+        notion_client=client,
+        image_workers=args.image_workers,
+        image_cache=None if args.no_image_cache else ImageUploadCache(args.image_cache),
+        manifest=None if args.no_manifest else SyncManifest(args.manifest),
+    )
+    try:
+        daemon = UploadDaemon(uploader, args.socket, MetricsRecorder(client))
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Upload daemon {os.getpid()} listening on {daemon.socket_path}", flush=True)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Upload daemon stopped after {daemon.jobs} jobs", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Write-ahead journal for resumable uploads.
+
+Each upload of a Markdown file is journaled beside the source file as
+JSON lines. The journal records the parent page, the created page ID,
+uploaded image IDs and every request the API has acknowledged. An
+interrupted upload can then continue from the last acknowledged request
+instead of creating a second page. A journal with no page yet is a queued
+upload, written while the API is unavailable and drained later with
+--resume.
+
+Records are appended and fsynced before the next request is sent. A torn
+final line from a crash is ignored on replay.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from image_cache import DEFAULT_TTL_SECONDS, file_digest
+
+JOURNAL_SUFFIX = ".notion-journal"
+
+
+class JournalError(Exception):
+    """A journal cannot be used to resume an upload."""
+
+
+def journal_path(md_file: str | Path) -> Path:
+    """Return where the journal for a Markdown file lives."""
+    md_path = Path(md_file)
+    return md_path.with_name(md_path.name + JOURNAL_SUFFIX)
+
+
+@dataclass
+class JournalState:
+    """Upload progress replayed from a journal."""
+
+    parent_page_id: str
+    title: str | None
+    source_digest: str
+    page_id: str | None = None
+    requests_done: int = 0  # packed requests fully acknowledged, in order
+    blocks_done: int = 0  # top-level page blocks those requests created
+    images: dict[str, str] = field(default_factory=dict)  # digest -> file_upload_id
+
+
+class UploadJournal:
+    """Append-only journal of one file's upload progress."""
+
+    def __init__(
+        self,
+        md_file: str | Path,
+        state: JournalState,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Wrap an existing journal. Use create() or load() instead.
+
+        Args:
+            md_file: Path to the Markdown file being uploaded
+            state: Progress replayed so far
+            clock: Wall-clock time source
+        """
+        self.md_file = Path(md_file)
+        self.path = journal_path(md_file)
+        self.state = state
+        self._clock = clock
+
+    @classmethod
+    def create(
+        cls,
+        md_file: str | Path,
+        parent_page_id: str,
+        title: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> "UploadJournal":
+        """Start a new journal, replacing any existing one.
+
+        Args:
+            md_file: Path to the Markdown file to upload
+            parent_page_id: ID of the parent Notion page
+            title: Custom page title, if any
+            clock: Wall-clock time source
+
+        Returns:
+            Journal for the new upload
+        """
+        state = JournalState(parent_page_id, title, file_digest(md_file))
+        journal = cls(md_file, state, clock)
+        journal.path.unlink(missing_ok=True)
+        journal._append({
+            "event": "start",
+            "parent_page_id": parent_page_id,
+            "title": title,
+            "source_digest": state.source_digest,
+        })
+        return journal
+
+    @classmethod
+    def load(
+        cls,
+        md_file: str | Path,
+        clock: Callable[[], float] = time.time,
+    ) -> "UploadJournal | None":
+        """Replay the journal for a Markdown file.
+
+        Image IDs older than Notion's file upload validity window are
+        dropped, since they can no longer be attached.
+
+        Args:
+            md_file: Path to the Markdown file
+            clock: Wall-clock time source
+
+        Returns:
+            The journal, or None if the file has none
+
+        Raises:
+            JournalError: If the journal is unreadable or the file has
+                changed since the upload started
+        """
+        path = journal_path(md_file)
+        if not path.exists():
+            return None
+
+        state = None
+        lines = path.read_text(encoding="utf-8").splitlines()
+        for number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                if number == len(lines):
+                    break  # torn write from a crash
+                raise JournalError(f"Corrupt journal line {number}: {path}") from None
+
+            event = record["event"]
+            if event == "start":
+                state = JournalState(
+                    record["parent_page_id"], record["title"], record["source_digest"]
+                )
+            elif state is None:
+                raise JournalError(f"Journal has no start record: {path}")
+            elif event == "page":
+                state.page_id = record["page_id"]
+            elif event == "image":
+                if record["time"] + DEFAULT_TTL_SECONDS > clock():
+                    state.images[record["digest"]] = record["file_upload_id"]
+            elif event == "request":
+                state.requests_done = record["index"] + 1
+                state.blocks_done += record["blocks"]
+
+        if state is None:
+            raise JournalError(f"Journal has no start record: {path}")
+        if file_digest(md_file) != state.source_digest:
+            raise JournalError(
+                f"{md_file} changed since its upload started; "
+                f"delete {path} to start over"
+            )
+        return cls(md_file, state, clock)
+
+    @property
+    def queued(self) -> bool:
+        """Whether no part of the upload has reached Notion yet."""
+        return self.state.page_id is None
+
+    def record_page(self, page_id: str) -> None:
+        """Record the created page."""
+        self.state.page_id = page_id
+        self._append({"event": "page", "page_id": page_id})
+
+    def record_image(self, digest: str, file_upload_id: str) -> None:
+        """Record an uploaded image."""
+        self.state.images[digest] = file_upload_id
+        self._append({
+            "event": "image",
+            "digest": digest,
+            "file_upload_id": file_upload_id,
+            "time": self._clock(),
+        })
+
+    def record_request(self, index: int, blocks: int) -> None:
+        """Record that packed request index (and its deferred children) is done.
+
+        Args:
+            index: Position of the request in the packed sequence
+            blocks: Top-level page blocks the request created
+        """
+        self.state.requests_done = index + 1
+        self.state.blocks_done += blocks
+        self._append({"event": "request", "index": index, "blocks": blocks})
+
+    def finish(self) -> None:
+        """Remove the journal after a completed upload."""
+        self.path.unlink(missing_ok=True)
+
+    def _append(self, record: dict[str, Any]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -5,16 +5,28 @@ Markdown to Notion Uploader.
 Main script for uploading Markdown files to Notion pages.
 
 Usage:
-    python upload_md.py <md_file> --parent-page-id <page_id> [options]
+    python upload_md.py <md_file|directory|glob> --parent-page-id <page_id> [options]
 
 Examples:
     python upload_md.py README.md --parent-page-id abc123
     python upload_md.py docs/report.md --parent-page-id abc123 --title "Custom Title"
+    python upload_md.py docs/ --parent-page-id abc123 --workers 4
 """
 
 import argparse
+import glob
 import os
+import re
 import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from enum import Enum, auto
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -28,25 +40,120 @@ except ImportError:
 # Add scripts directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+from block_packer import pack_blocks, send_deferred, split_block
+from client_metrics import MetricsRecorder
+from file_watcher import PollingWatcher, debounced_changes, open_watcher
+from image_cache import DEFAULT_TTL_SECONDS, ImageUploadCache, default_cache_path, file_digest
 from markdown_parser import BlockType, MarkdownParser
 from notion_client import NotionClient, NotionAPIError, NotionConfig
 from notion_converter import NotionBlockConverter
+from notion_emitter import NotionEmitter
+from page_diff import EditKind, apply_edits, diff_blocks, fetch_block_tree, record_image_uploads
+from page_index import IndexedPage, PageIndex, default_index_path
+from sync_manifest import SyncManifest, default_manifest_path
+from telemetry import Telemetry
+from upload_journal import JournalError, UploadJournal, journal_path
+
+# Placeholder file_upload IDs handed out while converting in worker processes
+PENDING_IMAGE_PREFIX = "pending-image:"
+
+
+@dataclass
+class ConvertedDocument:
+    """A Markdown file parsed and converted to Notion blocks, not yet uploaded.
+
+    Local images are not uploaded during conversion; their image blocks carry
+    a placeholder file_upload ID listed in pending_images.
+    """
+
+    md_file: str
+    title: str
+    blocks: list[dict[str, Any]]
+    pending_images: dict[str, str]  # placeholder id -> local image path
+    convert_seconds: float
+    source_digest: str = ""  # file_digest of the Markdown that was converted
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one file in a multi-file upload."""
+
+    md_file: str
+    document: ConvertedDocument | None = None
+    page: dict[str, Any] | None = None
+    error: Exception | None = None
+    upload_seconds: float = 0.0
+    existing: IndexedPage | None = None  # set when skipped as already uploaded
+
+
+class SyncAction(Enum):
+    """What a watched directory sync did with one file."""
+
+    UNCHANGED = auto()
+    CREATED = auto()
+    UPDATED = auto()
+    MOVED = auto()  # renamed file adopted its page from the manifest
+    FAILED = auto()
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one changed file."""
+
+    md_file: Path
+    action: SyncAction
+    page_id: str | None = None
+    stats: dict[str, int] | None = None  # update_markdown counts, for UPDATED
+    error: Exception | None = None
 
 
 class MarkdownToNotionUploader:
     """Uploads Markdown files to Notion pages."""
 
-    def __init__(self, notion_client: NotionClient | None = None):
+    def __init__(
+        self,
+        notion_client: NotionClient | None = None,
+        image_workers: int = 3,
+        image_cache: ImageUploadCache | None = None,
+        page_index: PageIndex | None = None,
+        manifest: SyncManifest | None = None,
+        telemetry: Telemetry | None = None,
+        image_ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
         """Initialize the uploader.
 
         Args:
             notion_client: NotionClient instance. If None, creates from env.
+            image_workers: Maximum concurrent image uploads
+            image_cache: Persistent upload cache shared across runs (optional)
+            page_index: Title index to record created pages in and check
+                for existing ones (optional)
+            manifest: Sync manifest to record which page each file became
+                (optional)
+            telemetry: Where stage timings, counters and progress go
+                (defaults to totals only, no output)
+            image_ttl_seconds: How long an uploaded image ID stays
+                reusable, as for the image cache
+            clock: Wall-clock time source for image upload expiry
         """
         self.client = notion_client or NotionClient()
-        self._uploaded_images: dict[str, str] = {}  # path -> file_upload_id
+        self.image_workers = image_workers
+        self.image_cache = image_cache
+        self.page_index = page_index
+        self.manifest = manifest
+        self.telemetry = telemetry or Telemetry()
+        self.image_ttl_seconds = image_ttl_seconds
+        self._clock = clock
+        # content digest -> (file_upload_id, expiry time)
+        self._uploaded_images: dict[str, tuple[str, float]] = {}
+        self._upload_digests: dict[str, str] = {}  # file_upload_id -> content digest
+        self._stats_lock = threading.Lock()
+        self.images_uploaded = 0
+        self.images_reused = 0  # served from image_cache
 
     def upload_image(self, image_path: str) -> str:
-        """Upload an image to Notion.
+        """Upload an image to Notion, reusing earlier uploads of the same bytes.
 
         Args:
             image_path: Path to the image file
@@ -57,26 +164,122 @@ class MarkdownToNotionUploader:
         Raises:
             FileNotFoundError: If image file doesn't exist
         """
-        # Check cache first
-        if image_path in self._uploaded_images:
-            return self._uploaded_images[image_path]
+        return self._upload_image(file_digest(image_path), image_path)
 
-        file_upload_id = self.client.upload_file(image_path)
-        self._uploaded_images[image_path] = file_upload_id
+    def _upload_image(self, digest: str, image_path: str) -> str:
+        """Upload image_path unless unexpired content with this digest is known."""
+        # Check this uploader's earlier uploads first, then earlier runs
+        known = self._known_image(digest)
+        if known is not None:
+            return known
+
+        entry = self.image_cache.get_entry(digest) if self.image_cache else None
+        if entry:
+            file_upload_id, expires_at = entry
+            with self._stats_lock:
+                self.images_reused += 1
+        else:
+            file_upload_id = self.client.upload_file(image_path)
+            with self._stats_lock:
+                self.images_uploaded += 1
+            if self.image_cache:
+                self.image_cache.put(digest, file_upload_id)
+            expires_at = self._clock() + self.image_ttl_seconds
+
+        self._uploaded_images[digest] = (file_upload_id, expires_at)
+        self._upload_digests[file_upload_id] = digest
         return file_upload_id
 
+    def _known_image(self, digest: str) -> str | None:
+        """Return the unexpired file_upload ID this uploader holds for a digest.
+
+        Notion rejects upload IDs past their validity window, so an
+        uploader kept alive across jobs (the daemon, watch mode) must not
+        keep serving them.
+        """
+        entry = self._uploaded_images.get(digest)
+        if entry is None:
+            return None
+        if entry[1] <= self._clock():
+            self._uploaded_images.pop(digest, None)
+            return None
+        return entry[0]
+
+    def upload_images(self, image_paths: Iterable[str]) -> dict[str, str | Exception]:
+        """Upload several images concurrently on a bounded thread pool.
+
+        Each upload is two round-trips (create, then send), so running them
+        side by side hides most of the latency. The client's rate limiter
+        still paces the underlying requests. Paths with identical contents
+        share a single upload.
+
+        Args:
+            image_paths: Paths to the image files
+
+        Returns:
+            Mapping of path to file upload ID, or to the exception its
+            upload raised
+        """
+        results: dict[str, str | Exception] = {}
+        paths_by_digest: dict[str, list[str]] = {}
+        for path in dict.fromkeys(image_paths):
+            try:
+                paths_by_digest.setdefault(file_digest(path), []).append(path)
+            except OSError as e:
+                results[path] = e
+
+        if paths_by_digest:
+            workers = min(self.image_workers, len(paths_by_digest))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(self._upload_image, digest, paths[0]): paths
+                    for digest, paths in paths_by_digest.items()
+                }
+                for future in as_completed(futures):
+                    try:
+                        outcome: str | Exception = future.result()
+                    except Exception as e:
+                        outcome = e
+                    for path in futures[future]:
+                        results[path] = outcome
+
+        return results
+
+    def _resolved_image_uploader(
+        self,
+        resolved: dict[str, str | Exception],
+    ) -> Callable[[str], str]:
+        """Build an image_uploader that serves IDs from upload_images results."""
+
+        def uploader(image_path: str) -> str:
+            outcome = resolved.get(image_path)
+            if outcome is None:
+                return self.upload_image(image_path)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        return uploader
+
     def upload_markdown(
         self,
         md_file: str | Path,
         parent_page_id: str,
         title: str | None = None,
+        journal: UploadJournal | None = None,
     ) -> dict[str, Any]:
         """Upload a Markdown file to Notion.
 
+        With a journal, the created page, uploaded images and each
+        acknowledged request are recorded as they happen. If the journal
+        already holds progress, the upload continues from there instead of
+        creating a new page. The journal is removed once the upload is done.
+
         Args:
             md_file: Path to the Markdown file
             parent_page_id: ID of the parent Notion page
             title: Optional custom title (defaults to filename)
+            journal: Write-ahead journal to record progress in (optional)
 
         Returns:
             Created page object from Notion API
@@ -85,51 +288,552 @@ class MarkdownToNotionUploader:
             FileNotFoundError: If Markdown file doesn't exist
             NotionAPIError: If Notion API returns an error
         """
+        with self._measured("upload", md_file):
+            if journal:
+                # The journal only replays uploads still within their window
+                expires_at = self._clock() + self.image_ttl_seconds
+                for digest, file_upload_id in journal.state.images.items():
+                    self._uploaded_images[digest] = (file_upload_id, expires_at)
+                    self._upload_digests[file_upload_id] = digest
+            # Hash before reading, so an edit made meanwhile is synced next time
+            source_digest = file_digest(md_file) if self.manifest is not None else ""
+            title, notion_blocks, block_count = self._prepare_blocks(md_file, title)
+            if journal:
+                for digest, (file_upload_id, _) in list(self._uploaded_images.items()):
+                    if journal.state.images.get(digest) != file_upload_id:
+                        journal.record_image(digest, file_upload_id)
+
+            image_ids: list[str] = []
+            block_ids: list[str] | None = [] if self.manifest is not None else None
+            image_uploads: dict[str, str] | None = {} if self.manifest is not None else None
+            notion_blocks = _collect_image_ids(notion_blocks, image_ids)
+            page = self._create_page(
+                parent_page_id, title, notion_blocks, journal, block_count, block_ids, image_uploads
+            )
+            if journal:
+                journal.finish()
+            self._record_sync(
+                md_file, source_digest, page["id"], parent_page_id, block_ids, image_ids, image_uploads
+            )
+            return page
+
+    def _create_page(
+        self,
+        parent_page_id: str,
+        title: str,
+        notion_blocks: Iterable[dict[str, Any]],
+        journal: UploadJournal | None = None,
+        block_count: int | None = None,
+        block_ids: list[str] | None = None,
+        image_uploads: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """Create a page and append its blocks in as few requests as possible.
+
+        Progress is reported to telemetry after every request, against
+        block_count (the document's top-level blocks) when known.
+
+        If block_ids is given, the page's top-level block IDs are appended
+        to it in order. They come from the append responses, plus one
+        listing of the blocks sent with the page, since page creation
+        doesn't return them. If image_uploads is given, the file_upload ID
+        of each uploaded image block sent is added to it by block ID
+        (blocks kept from an interrupted upload are not included).
+        """
+        telemetry = self.telemetry
+        started = telemetry.now()
+        sent = 0
+        requests = enumerate(pack_blocks(notion_blocks))
+        if journal and journal.state.page_id:
+            with telemetry.span("resume", title=title):
+                page = self.client.get_page(journal.state.page_id)
+                kept = self._discard_unacknowledged(page["id"], journal.state.blocks_done)
+            if block_ids is not None:
+                block_ids.extend(kept)
+            requests = islice(requests, journal.state.requests_done, None)
+        else:
+            _, first = next(requests, (0, None))
+            with telemetry.span("create_page", title=title, blocks=len(first.children) if first else 0):
+                page = self.client.create_page(
+                    parent_page_id=parent_page_id,
+                    title=title,
+                    children=first.children if first else [],
+                    lean=True,
+                )
+                if journal:
+                    journal.record_page(page["id"])
+                if self.page_index is not None:
+                    self.page_index.add(page, title=title, parent_id=parent_page_id)
+                if first and (first.deferred or block_ids is not None or image_uploads is not None):
+                    # Page creation doesn't return the new blocks; list them for their IDs
+                    created = self.client.get_block_children(page["id"])["results"]
+                    send_deferred(self.client, created, first)
+                    if block_ids is not None:
+                        block_ids.extend(block["id"] for block in created)
+                    if image_uploads is not None:
+                        record_image_uploads(first.children, created, image_uploads)
+            if first:
+                if journal:
+                    journal.record_request(0, len(first.children))
+                sent += len(first.children)
+                telemetry.progress(sent, block_count, started, page_id=page["id"])
+
+        # Append remaining blocks as they are converted
+        for index, request in requests:
+            with telemetry.span("append", request=index, blocks=len(request.children)):
+                response = self.client.append_blocks(page["id"], request.children, lean=True)
+                send_deferred(self.client, response["results"], request)
+            if block_ids is not None:
+                block_ids.extend(block["id"] for block in response["results"])
+            if image_uploads is not None:
+                record_image_uploads(request.children, response["results"], image_uploads)
+            if journal:
+                journal.record_request(index, len(request.children))
+            sent += len(request.children)
+            telemetry.progress(sent, block_count, started, page_id=page["id"])
+
+        return page
+
+    def _record_sync(
+        self,
+        md_file: str | Path,
+        source_digest: str,
+        page_id: str,
+        parent_page_id: str | None,
+        block_ids: Iterable[str] | None,
+        image_ids: Iterable[str],
+        image_uploads: Mapping[str, str] | None = None,
+        image_digests: Mapping[str, str] | None = None,
+    ) -> None:
+        """Record a finished sync in the manifest, if there is one.
+
+        Args:
+            block_ids: The page's top-level block IDs, in order, as
+                collected from the responses while sending
+            image_uploads: file_upload IDs of the page's top-level image
+                blocks, by block ID
+            image_digests: Content digests already known for some of those
+                blocks; the rest come from this uploader's uploads
+        """
+        if self.manifest is None:
+            return
+        known = image_digests or {}
+        digests = {}
+        for block_id, file_upload_id in (image_uploads or {}).items():
+            digest = known.get(block_id) or self._upload_digests.get(file_upload_id)
+            if digest:
+                digests[block_id] = digest
+        with self.telemetry.span("manifest", md_file=str(md_file)):
+            self.manifest.record(
+                md_file,
+                source_digest,
+                page_id,
+                parent_page_id,
+                block_ids or (),
+                image_ids,
+                image_uploads,
+                digests,
+            )
+
+    @contextmanager
+    def _measured(self, stage: str, md_file: str | Path) -> Iterator[None]:
+        """Time one file's upload or update, and record the requests it made."""
+        before = self.client.metrics.snapshot()
+        try:
+            with self.telemetry.span(stage, md_file=str(md_file)):
+                yield
+        finally:
+            after = self.client.metrics.snapshot()
+            counts = {name: after[name] - before[name] for name in after}
+            self.telemetry.count(**counts)
+            self.telemetry.event("counters", md_file=str(md_file), **counts)
+
+    def find_existing_page(self, title: str, parent_page_id: str) -> IndexedPage | None:
+        """Return an indexed page with this title under the parent, if any."""
+        if self.page_index is None:
+            return None
+        matches = self.page_index.find(title, parent_page_id)
+        return matches[0] if matches else None
+
+    def _discard_unacknowledged(self, page_id: str, keep: int) -> list[str]:
+        """Delete page blocks past the first keep, left by an interrupted request.
+
+        Returns:
+            IDs of the blocks kept
+        """
+        block_ids = [b["id"] for b in self.client.iter_block_children(page_id)]
+        for block_id in block_ids[keep:]:
+            self.client.delete_block(block_id)
+        return block_ids[:keep]
+
+    def update_markdown(
+        self,
+        md_file: str | Path,
+        page_id: str,
+    ) -> dict[str, int]:
+        """Sync a Markdown file into an existing page, sending only changes.
+
+        The page's current blocks are read back and diffed against the
+        converted document by content signature. Uploaded images are
+        matched on the content digests the manifest recorded for their
+        blocks, so unchanged images are kept, and only images in inserted
+        blocks are uploaded. Only changed blocks are updated, inserted or
+        deleted. Blocks added by hand in Notion are removed, and the page
+        title is left as is.
+
+        Args:
+            md_file: Path to the Markdown file
+            page_id: ID of the page to update
+
+        Returns:
+            Counts of updated, deleted, inserted and unchanged blocks, and
+            requests sent (excluding reads and image uploads)
+
+        Raises:
+            FileNotFoundError: If Markdown file doesn't exist
+            NotionAPIError: If Notion API returns an error
+        """
+        telemetry = self.telemetry
+        with self._measured("update", md_file):
+            source_digest = file_digest(md_file) if self.manifest is not None else ""
+            deferred_images: dict[str, str] = {}  # content digest -> path
+            _, notion_blocks, _ = self._prepare_blocks(md_file, deferred_images=deferred_images)
+            # Diff against blocks as Notion will store them, after text splitting
+            new_blocks = [part for block in notion_blocks for part in split_block(block)]
+            with telemetry.span("fetch", page_id=page_id):
+                existing = fetch_block_tree(self.client, page_id)
+
+            image_uploads: dict[str, str] = {}  # block ID -> file_upload_id
+            image_digests: dict[str, str] = {}  # block ID -> content digest
+            if self.manifest is not None:
+                image_uploads = self.manifest.image_uploads(md_file)
+                image_digests = self.manifest.image_digests(md_file)
+            with telemetry.span("diff", blocks=len(new_blocks)):
+                edits = diff_blocks(existing, new_blocks, image_digests)
+            inserted = [block for edit in edits if edit.kind == EditKind.INSERT for block in edit.blocks]
+            with telemetry.span("upload_images", md_file=str(md_file)):
+                self._resolve_images(inserted, deferred_images)
+            block_ids = [block["id"] for block in existing]
+            with telemetry.span("apply", page_id=page_id):
+                stats = apply_edits(self.client, page_id, edits, block_ids, image_uploads)
+            stats["unchanged"] = len(new_blocks) - stats["updated"] - stats["inserted"]
+            # Forget blocks that were removed from the page by other means
+            image_uploads = {
+                block_id: image_uploads[block_id] for block_id in block_ids if block_id in image_uploads
+            }
+            image_ids = list(image_uploads.values())
+            list(_collect_image_ids(inserted, image_ids))
+            self._record_sync(
+                md_file, source_digest, page_id, None, block_ids, image_ids, image_uploads, image_digests
+            )
+            return stats
+
+    def _prepare_blocks(
+        self,
+        md_file: str | Path,
+        title: str | None = None,
+        deferred_images: dict[str, str] | None = None,
+    ) -> tuple[str, Iterator[dict[str, Any]], int]:
+        """Parse a file and upload its images.
+
+        Args:
+            md_file: Path to the Markdown file
+            title: Optional custom title (defaults to filename)
+            deferred_images: If given, images are not uploaded. Each image
+                block carries the content digest of its file in place of
+                a file_upload ID, and digest -> path is added here for
+                _resolve_images.
+
+        Returns:
+            (title, lazy Notion blocks, number of top-level blocks)
+        """
         md_path = Path(md_file)
         if not md_path.exists():
             raise FileNotFoundError(f"Markdown file not found: {md_file}")
 
-        # Read Markdown content
-        content = md_path.read_text(encoding="utf-8")
-
-        # Determine title
-        if not title:
-            # Try to extract from first heading
-            for line in content.split("\n"):
-                line = line.strip()
-                if line.startswith("# "):
-                    title = line[2:].strip()
-                    break
+        telemetry = self.telemetry
+        with md_path.open(encoding="utf-8") as md_stream:
+            # Determine title
             if not title:
-                title = md_path.stem  # Use filename without extension
+                title = extract_title(md_stream) or md_path.stem  # Fall back to filename
+                md_stream.seek(0)
+
+            parser = MarkdownParser(base_path=str(md_path.parent))
+            with telemetry.span("parse", md_file=str(md_path)):
+                blocks = list(parser.parse_stream(telemetry.timed("read", md_stream, md_file=str(md_path))))
+
+        converter = NotionBlockConverter(base_path=str(md_path.parent))
+        if deferred_images is not None:
+
+            def defer_upload(image_path: str) -> str:
+                digest = file_digest(image_path)
+                deferred_images[digest] = image_path
+                return digest
+
+            converter.image_uploader = defer_upload
+        else:
+            # Upload every local image concurrently before converting, instead of
+            # one blocking upload per image block inside the conversion loop
+            image_paths = converter.local_image_paths(blocks)
+            with telemetry.span("upload_images", md_file=str(md_path)):
+                resolved = self.upload_images(image_paths)
+            converter.image_uploader = self._resolved_image_uploader(resolved)
+        notion_blocks = telemetry.timed("convert", converter.iter_convert_blocks(blocks), md_file=str(md_path))
+        return title, notion_blocks, len(blocks)
+
+    def upload_converted(
+        self,
+        document: ConvertedDocument,
+        parent_page_id: str,
+    ) -> dict[str, Any]:
+        """Upload a document produced by convert_document.
+
+        Pending local images are uploaded first (through the shared image
+        cache) and their placeholder IDs replaced in document.blocks before
+        the page is created.
+
+        Args:
+            document: Converted document from convert_document
+            parent_page_id: ID of the parent Notion page
+
+        Returns:
+            Created page object from Notion API
+
+        Raises:
+            NotionAPIError: If Notion API returns an error
+        """
+        with self._measured("upload", document.md_file):
+            with self.telemetry.span("upload_images", md_file=document.md_file):
+                self._resolve_pending_images(document)
+            image_ids: list[str] = []
+            block_ids: list[str] | None = [] if self.manifest is not None else None
+            image_uploads: dict[str, str] | None = {} if self.manifest is not None else None
+            page = self._create_page(
+                parent_page_id,
+                document.title,
+                _collect_image_ids(document.blocks, image_ids),
+                block_count=len(document.blocks),
+                block_ids=block_ids,
+                image_uploads=image_uploads,
+            )
+            if document.source_digest:
+                self._record_sync(
+                    document.md_file,
+                    document.source_digest,
+                    page["id"],
+                    parent_page_id,
+                    block_ids,
+                    image_ids,
+                    image_uploads,
+                )
+            return page
+
+    def upload_many(
+        self,
+        md_files: list[str | Path],
+        parent_page_id: str,
+        workers: int | None = None,
+        skip_existing: bool = False,
+    ) -> Iterator["BatchResult"]:
+        """Upload many Markdown files as sibling pages.
+
+        Files are parsed and converted in a process pool while this process
+        drains finished documents through its single client, so the CPU-bound
+        stage runs on every core and API calls share one connection pool.
+        A failure in one file is reported in its result and does not stop
+        the batch.
+
+        Args:
+            md_files: Markdown files to upload
+            parent_page_id: ID of the parent Notion page
+            workers: Worker process count (defaults to CPU count)
+            skip_existing: Skip documents whose title already exists under
+                the parent in page_index
+
+        Yields:
+            BatchResult per file, in completion order
+        """
+        # Time spent waiting here is time the API sat idle behind conversion
+        converted_documents = self.telemetry.timed("convert", convert_documents(md_files, workers))
+        for md_file, converted in converted_documents:
+            if isinstance(converted, Exception):
+                yield BatchResult(md_file=md_file, error=converted)
+                continue
+
+            result = BatchResult(md_file=md_file, document=converted)
+            if skip_existing:
+                result.existing = self.find_existing_page(converted.title, parent_page_id)
+                if result.existing:
+                    yield result
+                    continue
+            start = time.perf_counter()
+            try:
+                result.page = self.upload_converted(converted, parent_page_id)
+            except Exception as e:
+                result.error = e
+            result.upload_seconds = time.perf_counter() - start
+            yield result
+
+    def _resolve_pending_images(self, document: ConvertedDocument) -> None:
+        """Upload pending images and swap real file_upload IDs into the blocks."""
+        self._resolve_images(document.blocks, document.pending_images)
+        document.pending_images = {}
+
+    def _resolve_images(self, blocks: list[dict[str, Any]], pending: Mapping[str, str]) -> None:
+        """Upload the images in blocks whose file_upload ID is a placeholder.
+
+        Args:
+            blocks: Blocks to resolve in place, children included. An image
+                whose upload fails becomes the converter's error paragraph.
+            pending: Local image path for each placeholder ID
+        """
+        slots = [
+            (siblings, i, pending[siblings[i]["image"]["file_upload"]["id"]])
+            for siblings, i in _image_slots(blocks)
+            if siblings[i]["image"]["file_upload"]["id"] in pending
+        ]
+        resolved = self.upload_images(image_path for _, _, image_path in slots)
+        for siblings, i, image_path in slots:
+            outcome = resolved[image_path]
+            if isinstance(outcome, Exception):
+                siblings[i] = NotionBlockConverter.image_upload_failed_block(image_path, outcome)
+            else:
+                siblings[i]["image"]["file_upload"]["id"] = outcome
 
-        # Parse Markdown
-        parser = MarkdownParser(base_path=str(md_path.parent))
-        blocks = parser.parse(content)
 
-        # Convert to Notion blocks with image upload support
+def _image_slots(blocks: list[dict[str, Any]]) -> Iterator[tuple[list[dict[str, Any]], int]]:
+    """Yield (list, index) for every uploaded image block, children included."""
+    for i, block in enumerate(blocks):
+        if block["type"] == "image" and "file_upload" in block["image"]:
+            yield blocks, i
+        children = block[block["type"]].get("children")
+        if children:
+            yield from _image_slots(children)
+
+
+def _collect_image_ids(
+    blocks: Iterable[dict[str, Any]], image_ids: list[str]
+) -> Iterator[dict[str, Any]]:
+    """Pass blocks through, noting the file_upload ID of each uploaded image."""
+    for block in blocks:
+        if block["type"] == "image" and "file_upload" in block["image"]:
+            image_ids.append(block["image"]["file_upload"]["id"])
+        children = block[block["type"]].get("children")
+        if children:
+            list(_collect_image_ids(children, image_ids))  # nested blocks are already built
+        yield block
+
+
+def convert_document(md_file: str | Path, title: str | None = None) -> ConvertedDocument:
+    """Parse and convert a Markdown file without making any API calls.
+
+    Module-level so it can run in a ProcessPoolExecutor worker.
+
+    Args:
+        md_file: Path to the Markdown file
+        title: Optional custom title (defaults to first heading or filename)
+
+    Returns:
+        ConvertedDocument with placeholder IDs for local images
+    """
+    md_path = Path(md_file)
+    pending_images: dict[str, str] = {}
+
+    def defer_upload(image_path: str) -> str:
+        placeholder = f"{PENDING_IMAGE_PREFIX}{len(pending_images)}"
+        pending_images[placeholder] = image_path
+        return placeholder
+
+    start = time.perf_counter()
+    source_digest = file_digest(md_path)
+    with md_path.open(encoding="utf-8") as md_stream:
+        if not title:
+            title = extract_title(md_stream) or md_path.stem
+            md_stream.seek(0)
+
         converter = NotionBlockConverter(
-            image_uploader=self.upload_image,
+            image_uploader=defer_upload,
             base_path=str(md_path.parent),
         )
-        notion_blocks = converter.convert_blocks(blocks)
+        blocks = list(NotionEmitter(converter).emit_stream(md_stream))
 
-        # Create page with initial blocks (Notion limit: 100 blocks per request)
-        initial_blocks = notion_blocks[:100]
-        remaining_blocks = notion_blocks[100:]
+    return ConvertedDocument(
+        md_file=str(md_path),
+        title=title,
+        blocks=blocks,
+        pending_images=pending_images,
+        convert_seconds=time.perf_counter() - start,
+        source_digest=source_digest,
+    )
 
-        page = self.client.create_page(
-            parent_page_id=parent_page_id,
-            title=title,
-            children=initial_blocks,
-        )
 
-        # Append remaining blocks if any
-        if remaining_blocks:
-            page_id = page["id"]
-            self.client.append_blocks_chunked(page_id, remaining_blocks)
+def convert_documents(
+    md_files: list[str | Path],
+    workers: int | None = None,
+) -> Iterator[tuple[str, ConvertedDocument | Exception]]:
+    """Convert Markdown files in parallel, yielding results as they finish.
 
-        return page
+    Args:
+        md_files: Markdown files to convert
+        workers: Worker process count (defaults to CPU count). With one
+            worker or one file, conversion runs in this process.
+
+    Yields:
+        (md_file, ConvertedDocument or the exception raised converting it)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(md_files) <= 1:
+        for md_file in md_files:
+            try:
+                yield str(md_file), convert_document(md_file)
+            except Exception as e:
+                yield str(md_file), e
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(md_files))) as pool:
+        futures = {pool.submit(convert_document, md_file): str(md_file) for md_file in md_files}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def collect_markdown_files(source: str) -> list[Path]:
+    """Expand a file, directory or glob pattern into Markdown files.
+
+    Directories are searched recursively for *.md files.
+
+    Args:
+        source: File path, directory path or glob pattern
+
+    Returns:
+        Sorted list of matching files (empty if nothing matches)
+    """
+    path = Path(source)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*.md") if p.is_file())
+    if path.is_file():
+        return [path]
+    return sorted(Path(p) for p in glob.glob(source, recursive=True) if Path(p).is_file())
+
+
+def extract_title(lines: Iterable[str]) -> str | None:
+    """Return the text of the first '# ' heading line, if any.
+
+    Stops reading at the first match, so only the top of a large file
+    is scanned in the common case.
+
+    Args:
+        lines: Markdown lines (e.g. an open text file)
+
+    Returns:
+        Heading text, or None if the document has no level-1 heading
+    """
+    for line in lines:
+        line = line.strip()
+        if line.startswith("# "):
+            return line[2:].strip()
+    return None
 
 
 def extract_page_id(page_id_or_url: str) -> str:
@@ -172,6 +876,310 @@ def extract_page_id(page_id_or_url: str) -> str:
     return page_id_or_url  # Return as-is if can't parse
 
 
+def is_page_reference(value: str) -> bool:
+    """Whether value is a page ID or URL, as opposed to a page title."""
+    if "notion.so" in value or "notion.site" in value:
+        return True
+    return re.fullmatch(r"[0-9a-fA-F]{32}", value.replace("-", "")) is not None
+
+
+def resolve_parent_title(page_index: PageIndex, title: str) -> str:
+    """Look up a parent page by title in the index.
+
+    Args:
+        page_index: Refreshed page index
+        title: Title of the parent page
+
+    Returns:
+        Page ID of the single page with that title
+
+    Raises:
+        LookupError: If no page, or more than one, has that title
+    """
+    matches = page_index.find(title)
+    if not matches:
+        raise LookupError(f"No page titled {title!r} is shared with the integration")
+    if len(matches) > 1:
+        candidates = ", ".join(page.url or page.page_id for page in matches)
+        raise LookupError(f"Several pages are titled {title!r}; pass an ID or URL instead: {candidates}")
+    return extract_page_id(matches[0].page_id)
+
+
+def run_batch(
+    md_files: list[Path],
+    parent_page_id: str,
+    workers: int | None,
+    uploader: MarkdownToNotionUploader | None,
+    skip_existing: bool = False,
+) -> None:
+    """Convert and upload many files with progress output.
+
+    Args:
+        md_files: Markdown files to process
+        parent_page_id: ID of the parent Notion page
+        workers: Worker process count for conversion
+        uploader: Uploader to send pages with, or None for a dry run
+        skip_existing: Skip files already uploaded under the parent
+    """
+    dry_run = uploader is None
+    total = len(md_files)
+    print(f"Found {total} Markdown files")
+    if not dry_run:
+        print(f"Parent page: {parent_page_id}")
+
+    failures = 0
+    skipped = 0
+    start = time.perf_counter()
+
+    if dry_run:
+        for done, (md_file, converted) in enumerate(convert_documents(md_files, workers), 1):
+            if isinstance(converted, Exception):
+                failures += 1
+                print(f"[{done}/{total}] FAILED {md_file}: {converted}")
+                continue
+            print(
+                f"[{done}/{total}] {md_file}: {len(converted.blocks)} blocks, "
+                f"{len(converted.pending_images)} local images "
+                f"(convert {converted.convert_seconds:.2f}s)"
+            )
+    else:
+        results = uploader.upload_many(md_files, parent_page_id, workers, skip_existing)
+        for done, result in enumerate(results, 1):
+            if result.error is not None:
+                failures += 1
+                print(f"[{done}/{total}] FAILED {result.md_file}: {result.error}")
+                continue
+            if result.existing:
+                skipped += 1
+                print(f"[{done}/{total}] SKIPPED {result.md_file}: exists at {result.existing.url}")
+                continue
+            print(
+                f"[{done}/{total}] {result.md_file} -> {result.page.get('url', '')} "
+                f"(convert {result.document.convert_seconds:.2f}s, "
+                f"upload {result.upload_seconds:.2f}s)"
+            )
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"\n{total - failures - skipped}/{total} files {'converted' if dry_run else 'uploaded'} "
+        f"in {elapsed:.2f}s" + (f", {skipped} skipped as existing" if skipped else "")
+    )
+    if uploader and (uploader.images_uploaded or uploader.images_reused):
+        print(f"Images uploaded: {uploader.images_uploaded}, reused from cache: {uploader.images_reused}")
+    if failures:
+        sys.exit(1)
+
+
+def resume_uploads(
+    md_files: list[Path],
+    uploader: MarkdownToNotionUploader,
+) -> None:
+    """Continue every interrupted or queued upload among md_files.
+
+    Files without a journal are skipped.
+
+    Args:
+        md_files: Markdown files to look for journals beside
+        uploader: Uploader to send pages with
+    """
+    pending = [md_file for md_file in md_files if journal_path(md_file).exists()]
+    total = len(pending)
+    print(f"Found {total} journaled uploads")
+
+    failures = 0
+    for done, md_file in enumerate(pending, 1):
+        try:
+            journal = UploadJournal.load(md_file)
+            page = uploader.upload_markdown(
+                md_file, journal.state.parent_page_id, journal.state.title, journal
+            )
+        except (JournalError, NotionAPIError, OSError) as e:
+            failures += 1
+            print(f"[{done}/{total}] FAILED {md_file}: {e}")
+            continue
+        print(f"[{done}/{total}] {md_file} -> {page.get('url', '')}")
+
+    print(f"\n{total - failures}/{total} uploads completed")
+    if failures:
+        sys.exit(1)
+
+
+class DirectorySync:
+    """Keeps the Markdown files of a directory synced to pages under one parent.
+
+    Content hashes from the last sync decide which reported files really
+    changed; with the uploader's manifest they carry over between runs. A
+    changed file updates its page in place (found from earlier syncs, the
+    manifest, or by title in the uploader's page index), or becomes a new
+    page. A file whose content the manifest knows from a path that no
+    longer exists was renamed, and takes over that page without any
+    request. The same uploader, and with it the client session, image
+    cache, page index and manifest, serves every sync. Image upload IDs
+    it holds expire with Notion's upload window, so an image edited in
+    hours later is uploaded again rather than attached by a stale ID.
+    """
+
+    def __init__(
+        self,
+        uploader: MarkdownToNotionUploader,
+        parent_page_id: str,
+        md_files: Iterable[Path] = (),
+    ):
+        """Record the current state of the files, which counts as synced.
+
+        Args:
+            uploader: Uploader to send pages with
+            parent_page_id: ID of the parent page for new pages
+            md_files: Files already in Notion as they are now
+        """
+        self.uploader = uploader
+        self.parent_page_id = parent_page_id
+        self.digests: dict[Path, str] = {path: file_digest(path) for path in md_files}
+        self.pages: dict[Path, str] = {}  # file -> page ID, once known
+
+    def sync(self, md_files: Iterable[Path]) -> Iterator[SyncResult]:
+        """Sync files reported as changed, skipping those with unchanged content.
+
+        A failed file keeps its old hash, so it is retried on its next change.
+
+        Args:
+            md_files: Files that may have changed
+
+        Yields:
+            One SyncResult per file
+        """
+        manifest = self.uploader.manifest
+        for md_file in md_files:
+            try:
+                digest = file_digest(md_file)
+                if self.digests.get(md_file) == digest or (
+                    manifest is not None and manifest.is_unchanged(md_file, digest)
+                ):
+                    self.digests[md_file] = digest
+                    yield SyncResult(md_file, SyncAction.UNCHANGED, self._known_page(md_file))
+                    continue
+                result = self._sync_file(md_file, digest)
+            except (NotionAPIError, OSError) as e:
+                yield SyncResult(md_file, SyncAction.FAILED, self._known_page(md_file), error=e)
+                continue
+            self.digests[md_file] = digest
+            self.pages[md_file] = result.page_id
+            yield result
+
+    def _known_page(self, md_file: Path) -> str | None:
+        if md_file in self.pages or self.uploader.manifest is None:
+            return self.pages.get(md_file)
+        entry = self.uploader.manifest.get(md_file)
+        return entry.page_id if entry else None
+
+    def _sync_file(self, md_file: Path, digest: str) -> SyncResult:
+        manifest = self.uploader.manifest
+        if manifest is not None and manifest.get(md_file) is None:
+            for entry in manifest.find_by_hash(digest):
+                if entry.parent_page_id == self.parent_page_id and not Path(entry.path).exists():
+                    manifest.move(entry.path, md_file)
+                    return SyncResult(md_file, SyncAction.MOVED, entry.page_id)
+
+        page_id = self._known_page(md_file)
+        if page_id is None:
+            with md_file.open(encoding="utf-8") as md_stream:
+                title = extract_title(md_stream) or md_file.stem
+            existing = self.uploader.find_existing_page(title, self.parent_page_id)
+            if existing:
+                page_id = extract_page_id(existing.page_id)
+        if page_id is None:
+            page = self.uploader.upload_markdown(md_file, self.parent_page_id)
+            return SyncResult(md_file, SyncAction.CREATED, page["id"])
+        stats = self.uploader.update_markdown(md_file, page_id)
+        return SyncResult(md_file, SyncAction.UPDATED, page_id, stats)
+
+
+def print_sync_result(result: SyncResult, prefix: str = "") -> None:
+    """Print one line for a sync that did something (unchanged files are quiet)."""
+    if result.action is SyncAction.FAILED:
+        print(f"{prefix}FAILED {result.md_file}: {result.error}")
+    elif result.action is SyncAction.CREATED:
+        print(f"{prefix}Created {result.md_file} -> {result.page_id}")
+    elif result.action is SyncAction.MOVED:
+        print(f"{prefix}Moved {result.md_file} -> {result.page_id}")
+    elif result.action is SyncAction.UPDATED:
+        stats = result.stats
+        print(
+            f"{prefix}Updated {result.md_file}: {stats['updated']} updated, "
+            f"{stats['inserted']} inserted, {stats['deleted']} deleted"
+        )
+
+
+def run_sync(
+    md_files: list[Path],
+    parent_page_id: str,
+    uploader: MarkdownToNotionUploader,
+) -> None:
+    """Create, update or skip each file according to the manifest, with progress output.
+
+    Args:
+        md_files: Markdown files to sync
+        parent_page_id: ID of the parent page for new pages
+        uploader: Uploader with a manifest
+    """
+    total = len(md_files)
+    print(f"Syncing {total} Markdown files ({len(uploader.manifest)} in the manifest)")
+    counts: Counter[SyncAction] = Counter()
+    start = time.perf_counter()
+    for done, result in enumerate(DirectorySync(uploader, parent_page_id).sync(md_files), 1):
+        counts[result.action] += 1
+        print_sync_result(result, f"[{done}/{total}] ")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"\n{counts[SyncAction.CREATED]} created, {counts[SyncAction.UPDATED]} updated, "
+        f"{counts[SyncAction.MOVED]} moved, {counts[SyncAction.UNCHANGED]} unchanged "
+        f"in {elapsed:.2f}s"
+    )
+    if counts[SyncAction.FAILED]:
+        print(f"{counts[SyncAction.FAILED]} failed")
+        sys.exit(1)
+
+
+def run_watch(
+    directory: Path,
+    parent_page_id: str,
+    uploader: MarkdownToNotionUploader,
+    debounce: float = 1.0,
+    polling: bool = False,
+) -> None:
+    """Sync a directory's Markdown files to Notion as they change, until interrupted.
+
+    Args:
+        directory: Directory to watch, recursively
+        parent_page_id: ID of the parent page for new pages
+        uploader: Uploader to send pages with
+        debounce: Seconds of quiet that end a burst of edits
+        polling: Poll for changes instead of using inotify
+    """
+    md_files = collect_markdown_files(str(directory))
+    watcher = open_watcher(directory, polling=polling)
+    if uploader.manifest is None:
+        # Without a manifest, whatever is on disk now counts as synced
+        sync = DirectorySync(uploader, parent_page_id, md_files)
+    else:
+        # The manifest knows what was synced before; catch up on the rest
+        sync = DirectorySync(uploader, parent_page_id)
+        for result in sync.sync(md_files):
+            print_sync_result(result)
+    mode = "polling" if isinstance(watcher, PollingWatcher) else "inotify"
+    print(f"Watching {directory} ({len(md_files)} Markdown files, {mode}); Ctrl+C to stop")
+
+    try:
+        for changed in debounced_changes(watcher, debounce):
+            for result in sync.sync(sorted(changed)):
+                print_sync_result(result)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -182,6 +1190,17 @@ Examples:
     python upload_md.py README.md --parent-page-id abc123
     python upload_md.py docs/report.md --parent-page-id "https://notion.so/page-abc123"
     python upload_md.py report.md --parent-page-id abc123 --title "My Report"
+    python upload_md.py docs/ --parent-page-id abc123 --workers 4
+    python upload_md.py "notes/**/*.md" --parent-page-id abc123 --dry-run
+    python upload_md.py report.md --update "https://notion.so/My-Report-abc123"
+    python upload_md.py report.md --resume
+    python upload_md.py docs/ --parent-page-id abc123 --queue
+    python upload_md.py docs/ --resume
+    python upload_md.py docs/ --parent-page-id "Team Notes" --skip-existing
+    python upload_md.py docs/ --parent-page-id abc123 --watch
+    python upload_md.py docs/ --parent-page-id abc123 --sync
+    python upload_md.py report.md --parent-page-id abc123 --profile --telemetry spans.jsonl
+    python upload_md.py docs/ --parent-page-id abc123 --sync --metrics /var/lib/node_exporter/notion.prom
 
 Environment Variables:
     NOTION_API_KEY    Required. Your Notion integration API key.
@@ -196,14 +1215,22 @@ Setup:
     parser.add_argument(
         "md_file",
         type=str,
-        help="Path to the Markdown file to upload",
+        help="Markdown file, directory (searched recursively) or glob pattern to upload",
     )
     parser.add_argument(
         "--parent-page-id",
         "-p",
         type=str,
-        required=True,
-        help="Notion parent page ID or URL",
+        default=None,
+        help="Notion parent page ID, URL or title (required unless --update or --resume is given)",
+    )
+    parser.add_argument(
+        "--update",
+        "-u",
+        type=str,
+        default=None,
+        metavar="PAGE_ID",
+        help="Update this existing page in place, sending only changed blocks",
     )
     parser.add_argument(
         "--title",
@@ -212,14 +1239,181 @@ Setup:
         default=None,
         help="Custom page title (defaults to first heading or filename)",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue interrupted or queued uploads from their journals",
+    )
+    parser.add_argument(
+        "--queue",
+        action="store_true",
+        help="Journal the upload without contacting Notion; send it later with --resume",
+    )
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Skip files whose title already exists under the parent page",
+    )
+    parser.add_argument(
+        "--page-index",
+        type=str,
+        default=None,
+        help=f"Page title index file (default: {default_index_path()})",
+    )
+    parser.add_argument(
+        "--refresh-page-index",
+        action="store_true",
+        help="Rebuild the page title index from scratch instead of incrementally",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Upload new files, update changed ones in place and skip unchanged ones, using the manifest",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help=f"Sync manifest file (default: {default_manifest_path()})",
+    )
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Don't record which page each file became",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and sync files in the directory as they change",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="With --watch, seconds of quiet before a burst of edits is synced (default: 1.0)",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll for changes instead of using inotify",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Parse and convert without uploading",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print where the time went (per stage, CPU versus API) when done",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Append timing spans, progress and request counters to FILE as JSON lines ('-' for stderr)",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write per-endpoint request metrics to FILE when done (Prometheus text for *.prom, else JSON)",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Worker processes for parsing multiple files (default: CPU count)",
+    )
+    parser.add_argument(
+        "--image-workers",
+        type=int,
+        default=3,
+        help="Maximum concurrent image uploads (default: 3)",
+    )
+    parser.add_argument(
+        "--image-cache",
+        type=str,
+        default=None,
+        help=f"Image upload cache file (default: {default_cache_path()})",
+    )
+    parser.add_argument(
+        "--no-image-cache",
+        action="store_true",
+        help="Always upload images, ignoring the persistent cache",
+    )
 
     args = parser.parse_args()
 
+    if args.telemetry == "-":
+        sink = sys.stderr
+    elif args.telemetry:
+        sink = open(args.telemetry, "a", encoding="utf-8")
+    else:
+        sink = None
+    telemetry = Telemetry(sink)
+    metrics = MetricsRecorder() if args.metrics else None
+    try:
+        run(parser, args, telemetry, metrics)
+    finally:
+        if args.profile:
+            print(f"\n{telemetry.format_profile()}")
+        if sink is not None and sink is not sys.stderr:
+            sink.close()
+        if metrics is not None and metrics.client is not None:
+            metrics.write(args.metrics)
+
+
+def run(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    telemetry: Telemetry,
+    metrics: MetricsRecorder | None = None,
+) -> None:
+    """Carry out a parsed command line.
+
+    Args:
+        parser: The parser, for reporting usage errors
+        args: Parsed arguments
+        telemetry: Collects stage timings for --profile and --telemetry
+        metrics: Records the client's requests for --metrics (optional)
+    """
+    if not args.parent_page_id and not (args.update or args.resume):
+        parser.error("--parent-page-id is required unless --update or --resume is given")
+    if args.update and (args.resume or args.queue):
+        parser.error("--update cannot be combined with --resume or --queue")
+    if args.watch:
+        if not Path(args.md_file).is_dir():
+            parser.error("--watch requires a directory")
+        if args.update or args.resume or args.queue or args.dry_run or args.title:
+            parser.error("--watch cannot be combined with --update, --resume, --queue, --dry-run or --title")
+    if args.sync:
+        if args.no_manifest:
+            parser.error("--sync needs the manifest; drop --no-manifest")
+        if args.update or args.resume or args.queue or args.dry_run or args.title or args.watch:
+            parser.error(
+                "--sync cannot be combined with --update, --resume, --queue, --dry-run, --title or --watch"
+            )
+
+    # Extract clean page ID
+    parent_page_id = extract_page_id(args.parent_page_id) if args.parent_page_id else None
+    md_path = Path(args.md_file)
+
+    # Journal uploads for later, without needing the API
+    if args.queue:
+        if not parent_page_id or not is_page_reference(args.parent_page_id):
+            parser.error("--queue requires a --parent-page-id ID or URL")
+        md_files = collect_markdown_files(args.md_file)
+        title = args.title if md_path.is_file() else None
+        for md_file in md_files:
+            UploadJournal.create(md_file, parent_page_id, title)
+            print(f"Queued: {md_file}")
+        print(f"\n{len(md_files)} uploads queued. Send them with --resume.")
+        return
+
     # Check API key
     if not os.getenv("NOTION_API_KEY"):
         print("Error: NOTION_API_KEY environment variable is not set")
@@ -229,14 +1423,71 @@ Setup:
         print("  NOTION_API_KEY=your_api_key_here")
         sys.exit(1)
 
-    # Validate file exists
-    md_path = Path(args.md_file)
-    if not md_path.exists():
-        print(f"Error: File not found: {args.md_file}")
-        sys.exit(1)
+    client = NotionClient()
+    if metrics is not None:
+        metrics.attach(client)
 
-    # Extract clean page ID
-    parent_page_id = extract_page_id(args.parent_page_id)
+    # Titles (of the parent, or of pages that may already exist) are looked
+    # up in a local index kept current from the search API
+    parent_is_title = args.parent_page_id and not is_page_reference(args.parent_page_id)
+    page_index = None
+    if parent_is_title or args.skip_existing or args.refresh_page_index or args.watch:
+        page_index = PageIndex(args.page_index)
+        try:
+            refreshed = page_index.refresh(client, full=args.refresh_page_index)
+        except NotionAPIError as e:
+            print(f"Notion API Error while refreshing the page index: {e}")
+            sys.exit(1)
+        print(f"Page index: {len(page_index)} pages ({refreshed} refreshed)")
+        if parent_is_title:
+            try:
+                parent_page_id = resolve_parent_title(page_index, args.parent_page_id)
+            except LookupError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+
+    def make_uploader() -> MarkdownToNotionUploader:
+        image_cache = None if args.no_image_cache else ImageUploadCache(args.image_cache)
+        manifest = None if args.no_manifest else SyncManifest(args.manifest)
+        return MarkdownToNotionUploader(
+            notion_client=client,
+            image_workers=args.image_workers,
+            image_cache=image_cache,
+            page_index=page_index,
+            manifest=manifest,
+            telemetry=telemetry,
+        )
+
+    # Watched directory: pages of edited files are found through the
+    # manifest or the index
+    if args.watch:
+        run_watch(md_path, parent_page_id, make_uploader(), args.debounce, args.poll)
+        return
+
+    # Sync: only files whose content differs from the manifest touch the network
+    if args.sync:
+        md_files = collect_markdown_files(args.md_file)
+        if not md_files:
+            print(f"Error: No Markdown files found: {args.md_file}")
+            sys.exit(1)
+        run_sync(md_files, parent_page_id, make_uploader())
+        return
+
+    # Directory or glob: convert in parallel and upload one page per file
+    if not md_path.is_file():
+        md_files = collect_markdown_files(args.md_file)
+        if not md_files:
+            print(f"Error: No Markdown files found: {args.md_file}")
+            sys.exit(1)
+        if args.title or args.update:
+            print("Error: --title and --update can only be used with a single file")
+            sys.exit(1)
+        if args.resume:
+            resume_uploads(md_files, make_uploader())
+            return
+        uploader = None if args.dry_run else make_uploader()
+        run_batch(md_files, parent_page_id, args.workers, uploader, args.skip_existing)
+        return
 
     if args.dry_run:
         # Dry run mode
@@ -293,27 +1544,82 @@ Setup:
         print("\nDry run complete. Use without --dry-run to upload.")
         return
 
-    # Upload
+    # Update an existing page
+    if args.update:
+        page_id = extract_page_id(args.update)
+        try:
+            print(f"Updating: {args.md_file}")
+            print(f"Page: {page_id}")
+
+            uploader = make_uploader()
+            stats = uploader.update_markdown(args.md_file, page_id)
+
+            print("\nSuccess!")
+            print(
+                f"Blocks: {stats['unchanged']} unchanged, {stats['updated']} updated, "
+                f"{stats['inserted']} inserted, {stats['deleted']} deleted "
+                f"({stats['requests']} write requests)"
+            )
+        except NotionAPIError as e:
+            print(f"\nNotion API Error: {e}")
+            sys.exit(1)
+        except FileNotFoundError as e:
+            print(f"\nFile Error: {e}")
+            sys.exit(1)
+        return
+
+    # Upload, journaling progress beside the file so it can be resumed
+    try:
+        journal = UploadJournal.load(md_path)
+    except JournalError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if journal and not args.resume:
+        print(f"Error: An unfinished upload of {args.md_file} is journaled in {journal.path}")
+        print("Use --resume to continue it, or delete the journal to start over.")
+        sys.exit(1)
+    if journal:
+        parent_page_id = journal.state.parent_page_id
+        title = journal.state.title
+    elif not parent_page_id:
+        print(f"Error: No journaled upload to resume for {args.md_file}")
+        sys.exit(1)
+    else:
+        title = args.title
+        if args.skip_existing:
+            with md_path.open(encoding="utf-8") as md_stream:
+                page_title = title or extract_title(md_stream) or md_path.stem
+            existing = page_index.find(page_title, parent_page_id)
+            if existing:
+                print(f"Skipped: {page_title!r} already exists at {existing[0].url}")
+                return
+        journal = UploadJournal.create(md_path, parent_page_id, title)
+
     try:
-        print(f"Uploading: {args.md_file}")
+        resuming = not journal.queued
+        print(f"{'Resuming' if resuming else 'Uploading'}: {args.md_file}")
         print(f"Parent page: {parent_page_id}")
+        if resuming:
+            print(f"Continuing after {journal.state.requests_done} acknowledged requests")
 
-        uploader = MarkdownToNotionUploader()
+        uploader = make_uploader()
         page = uploader.upload_markdown(
             md_file=args.md_file,
             parent_page_id=parent_page_id,
-            title=args.title,
+            title=title,
+            journal=journal,
         )
 
         page_url = page.get("url", "")
         page_id = page.get("id", "")
-        image_count = len(uploader._uploaded_images)
 
         print(f"\nSuccess!")
         print(f"Page ID: {page_id}")
         print(f"URL: {page_url}")
-        if image_count > 0:
-            print(f"Images uploaded: {image_count}")
+        if uploader.images_uploaded > 0:
+            print(f"Images uploaded: {uploader.images_uploaded}")
+        if uploader.images_reused > 0:
+            print(f"Images reused from cache: {uploader.images_reused}")
 
     except NotionAPIError as e:
         print(f"\nNotion API Error: {e}")
@@ -323,12 +1629,15 @@ Setup:
             print("2. Click '...' in the top right")
             print("3. Click 'Add connections'")
             print("4. Select your integration")
+        print(f"\nProgress is saved in {journal.path}; rerun with --resume to continue.")
         sys.exit(1)
     except FileNotFoundError as e:
+        journal.finish()
         print(f"\nFile Error: {e}")
         sys.exit(1)
     except Exception as e:
         print(f"\nUnexpected Error: {e}")
+        print(f"Progress is saved in {journal.path}; rerun with --resume to continue.")
         raise
 
 
@@ -0,0 +1 @@
+# Test package for notion-md-uploader
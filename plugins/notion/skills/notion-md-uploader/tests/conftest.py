@@ -0,0 +1,57 @@
+"""Pytest configuration and fixtures for notion-md-uploader tests."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Scripts import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from mock_notion_server import MockNotionServer
+
+
+@pytest.fixture
+def sample_markdown() -> str:
+    """Markdown document touching every supported block type."""
+    return """# Heading 1
+
+This is a paragraph with **bold** and *italic* text.
+It continues on a second line.
+
+## Heading 2
+
+- Bullet item 1
+- Bullet item 2
+
+1. Numbered item 1
+2. Numbered item 2
+
+```python
+def hello():
+    print("Hello, World!")
+```
+
+> This is a quote
+
+> [!NOTE]
+> This is a callout
+
+| Col1 | Col2 |
+|------|------|
+| A    | B    |
+
+- [x] Completed task
+- [ ] Pending task
+
+![Alt text](image.png)
+
+---
+"""
+
+
+@pytest.fixture
+def notion_stub():
+    """Running MockNotionServer; point NotionConfig.base_url at notion_stub.base_url."""
+    with MockNotionServer() as stub:
+        yield stub
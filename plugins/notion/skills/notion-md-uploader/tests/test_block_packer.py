@@ -0,0 +1,175 @@
+import json
+
+from block_packer import (
+    MAX_PAYLOAD_BYTES,
+    MAX_REQUEST_BLOCKS,
+    append_packed,
+    block_children,
+    pack_blocks,
+    split_block,
+)
+from notion_client import NotionClient, NotionConfig
+from upload_md import MarkdownToNotionUploader
+
+
+def make_client(stub):
+    return NotionClient(NotionConfig(api_key="secret", base_url=stub.base_url, requests_per_second=0))
+
+
+def item(text, children=()):
+    block = {
+        "object": "block",
+        "type": "bulleted_list_item",
+        "bulleted_list_item": {"rich_text": [{"type": "text", "text": {"content": text}}]},
+    }
+    if children:
+        block["bulleted_list_item"]["children"] = list(children)
+    return block
+
+
+def stored_tree(stub, parent_id):
+    """Return [(text, subtree)] for the blocks stored under parent_id."""
+    tree = []
+    for block_id in stub.children[parent_id]:
+        block = stub.blocks[block_id]
+        text = block[block["type"]]["rich_text"][0]["text"]["content"]
+        tree.append((text, stored_tree(stub, block_id)))
+    return tree
+
+
+def expected_tree(blocks):
+    return [
+        (b[b["type"]]["rich_text"][0]["text"]["content"], expected_tree(block_children(b)))
+        for b in blocks
+    ]
+
+
+def writes(stub):
+    return [r for r in stub.requests if r[0] != "GET"]
+
+
+def test_outline_uploads_in_one_request(notion_stub, tmp_path):
+    outline = "\n".join(
+        f"- Section {i}\n  - Point {i}.1\n    - Detail {i}.1.1\n  - Point {i}.2" for i in range(20)
+    )
+    md_file = tmp_path / "outline.md"
+    md_file.write_text(outline)
+
+    uploader = MarkdownToNotionUploader(notion_client=make_client(notion_stub))
+    page = uploader.upload_markdown(md_file, "parent")
+
+    # 80 blocks across three levels fit in the page creation request
+    assert [r[:2] for r in notion_stub.requests] == [("POST", "/v1/pages")]
+    tree = stored_tree(notion_stub, page["id"])
+    assert len(tree) == 20
+    assert tree[3] == ("Section 3", [("Point 3.1", [("Detail 3.1.1", [])]), ("Point 3.2", [])])
+
+
+def test_nesting_deeper_than_two_levels_is_deferred(notion_stub):
+    deep = item("l0", [item("l1", [item("l2", [item("l3", [item("l4")])])]), item("l1b")])
+    blocks = [item("first"), deep, item("last")]
+
+    sent = append_packed(make_client(notion_stub), "page", blocks)
+
+    # l1's subtree follows once l0 exists, then l2's once l1 exists
+    assert sent == 3
+    assert stored_tree(notion_stub, "page") == expected_tree(blocks)
+
+
+def test_wide_children_are_split_and_kept_in_order(notion_stub):
+    blocks = [item("parent", [item(f"child {i}", [item(f"leaf {i}")]) for i in range(250)])]
+
+    sent = append_packed(make_client(notion_stub), "page", blocks)
+
+    assert sent == 3
+    assert stored_tree(notion_stub, "page") == expected_tree(blocks)
+
+
+def test_requests_stay_under_total_block_limit():
+    blocks = [item(f"{i}", [item(f"{i}.{j}") for j in range(9)]) for i in range(300)]
+
+    requests = list(pack_blocks(iter(blocks)))
+
+    assert [len(r.children) for r in requests] == [100, 100, 100]
+    assert all(r.block_count <= MAX_REQUEST_BLOCKS for r in requests)
+    assert not any(r.deferred for r in requests)
+
+    blocks = [item(f"{i}", [item(f"{i}.{j}") for j in range(99)]) for i in range(25)]
+    assert [len(r.children) for r in pack_blocks(blocks)] == [10, 10, 5]
+
+
+def test_deferred_children_on_page_creation(notion_stub, tmp_path):
+    lines = ["- a", "  - b", "    - c", "      - d", "        - e", "- f"]
+    md_file = tmp_path / "deep.md"
+    md_file.write_text("\n".join(lines))
+
+    uploader = MarkdownToNotionUploader(notion_client=make_client(notion_stub))
+    page = uploader.upload_markdown(md_file, "parent")
+
+    assert stored_tree(notion_stub, page["id"]) == [
+        ("a", [("b", [("c", [("d", [("e", [])])])])]),
+        ("f", []),
+    ]
+    # b follows under a, then c (with d and e inline) under b
+    assert len(writes(notion_stub)) == 3
+    assert notion_stub.requests[1][:2] == ("GET", f"/v1/blocks/{page['id']}/children")
+
+
+def code(content):
+    return {
+        "object": "block",
+        "type": "code",
+        "code": {"rich_text": [{"type": "text", "text": {"content": content}}], "language": "python"},
+    }
+
+
+def stored_text(stub, block_id):
+    block = stub.blocks[block_id]
+    return "".join(item["text"]["content"] for item in block[block["type"]]["rich_text"])
+
+
+def test_long_code_block_is_split_into_runs(notion_stub, tmp_path):
+    source = "".join(f"print({i})\n" for i in range(2000))
+    md_file = tmp_path / "code.md"
+    md_file.write_text(f"```python\n{source}```\n")
+
+    uploader = MarkdownToNotionUploader(notion_client=make_client(notion_stub))
+    page = uploader.upload_markdown(md_file, "parent")
+
+    (block_id,) = notion_stub.children[page["id"]]
+    rich_text = notion_stub.blocks[block_id]["code"]["rich_text"]
+    assert len(rich_text) > 1
+    assert all(len(item["text"]["content"]) <= 2000 for item in rich_text)
+    assert stored_text(notion_stub, block_id) == source.rstrip("\n")
+
+
+def test_split_counts_utf16_units():
+    (block,) = split_block(code("\U0001f600" * 1500))
+    pieces = [item["text"]["content"] for item in block["code"]["rich_text"]]
+    assert [len(p) for p in pieces] == [1000, 500]
+
+
+def test_text_past_run_limit_becomes_several_blocks():
+    content = "x" * (2000 * 250)
+    block = item("huge", [item("child")])
+    block["bulleted_list_item"]["rich_text"][0]["text"]["content"] = content
+
+    parts = split_block(block)
+
+    assert len(parts) == 3
+    assert all(len(p["bulleted_list_item"]["rich_text"]) <= 100 for p in parts)
+    assert "".join(
+        i["text"]["content"] for p in parts for i in p["bulleted_list_item"]["rich_text"]
+    ) == content
+    assert [bool(block_children(p)) for p in parts] == [False, False, True]
+
+
+def test_requests_stay_under_payload_limit(notion_stub):
+    blocks = [code("y" * 30_000) for _ in range(40)]
+
+    responses = make_client(notion_stub).append_blocks_chunked("page", blocks)
+
+    sizes = [len(json.dumps(body)) for _, _, body in notion_stub.requests]
+    assert len(responses) == 3
+    assert max(sizes) <= MAX_PAYLOAD_BYTES
+    assert [stored_text(notion_stub, i) for i in notion_stub.children["page"]] == ["y" * 30_000] * 40
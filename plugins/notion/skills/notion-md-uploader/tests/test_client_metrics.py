@@ -0,0 +1,71 @@
+import json
+
+from client_metrics import Histogram, MetricsRecorder
+from notion_client import NotionClient, NotionConfig, RequestEvent, endpoint_template
+
+
+def test_endpoint_template_hides_ids():
+    assert endpoint_template("/blocks/0f1e2d3c-4b5a-6978-8796-a5b4c3d2e1f0/children") == "/blocks/{id}/children"
+    assert endpoint_template("pages/0f1e2d3c4b5a69788796a5b4c3d2e1f0") == "/pages/{id}"
+    assert endpoint_template("/search") == "/search"
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.99) is None  # in the +Inf bucket
+
+
+def test_recorder_tracks_endpoints_statuses_and_connection_reuse(notion_stub):
+    client = NotionClient(NotionConfig(api_key="secret", base_url=notion_stub.base_url, requests_per_second=0))
+    client._sleep = lambda seconds: None
+    recorder = MetricsRecorder(client)
+    events = []
+    client.response_hooks.append(events.append)
+    started = []
+    client.request_hooks.append(lambda method, endpoint: started.append((method, endpoint)))
+
+    notion_stub.failures = [(429, {"Retry-After": "0"})]
+    page = client.create_page("parent", "Title")
+    client.append_blocks(page["id"], [{"type": "divider", "divider": {}}])
+    client.get_block_children(page["id"])
+
+    assert started == [
+        ("POST", "/pages"),
+        ("POST", "/pages"),
+        ("PATCH", "/blocks/{id}/children"),
+        ("GET", "/blocks/{id}/children"),
+    ]
+    assert [e.new_connection for e in events] == [True, False, False, False]
+    assert all(isinstance(e, RequestEvent) and e.seconds > 0 for e in events)
+
+    snapshot = json.loads(json.dumps(recorder.snapshot()))
+    endpoints = {(e["method"], e["endpoint"]): e for e in snapshot["endpoints"]}
+    pages = endpoints[("POST", "/pages")]
+    assert pages["statuses"] == {"200": 1, "429": 1}
+    assert pages["latency_seconds"]["count"] == 2
+    assert endpoints[("PATCH", "/blocks/{id}/children")]["request_bytes"]["sum"] == events[2].bytes_sent
+    assert snapshot["connections"] == {"new": 1, "reused": 3}
+    assert snapshot["client"]["rate_limited"] == 1
+
+    text = recorder.to_prometheus()
+    assert 'notion_responses_total{method="POST",endpoint="/pages",status="429"} 1' in text
+    assert 'notion_request_duration_seconds_bucket{method="POST",endpoint="/pages",le="+Inf"} 2' in text
+    assert 'notion_request_duration_seconds_count{method="GET",endpoint="/blocks/{id}/children"} 1' in text
+    assert 'notion_connections_total{reused="true"} 3' in text
+    assert "notion_client_retries_total 1" in text
+
+
+def test_recorder_writes_prometheus_or_json_by_suffix(tmp_path):
+    recorder = MetricsRecorder()
+    recorder(RequestEvent("GET", "/search", 200, 0.2, 0, 512, True))
+
+    recorder.write(tmp_path / "notion.prom")
+    recorder.write(tmp_path / "notion.json")
+
+    assert "# TYPE notion_request_duration_seconds histogram" in (tmp_path / "notion.prom").read_text()
+    assert json.loads((tmp_path / "notion.json").read_text())["connections"] == {"new": 1, "reused": 0}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["notion.json", "notion.prom"]
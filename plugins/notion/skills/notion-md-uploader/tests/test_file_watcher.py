@@ -0,0 +1,72 @@
+import threading
+import time
+
+from file_watcher import InotifyWatcher, PollingWatcher, debounced_changes, open_watcher
+
+
+def make_watchers(root):
+    watchers = [PollingWatcher(root, interval=0.02)]
+    try:
+        watchers.append(InotifyWatcher(root))
+    except OSError:
+        pass  # not Linux; polling alone is covered
+    return watchers
+
+
+def test_watchers_report_changed_markdown_files(tmp_path):
+    (tmp_path / "docs").mkdir()
+    existing = tmp_path / "docs" / "a.md"
+    existing.write_text("a")
+
+    for watcher in make_watchers(tmp_path):
+        try:
+            time.sleep(0.01)  # let mtimes move on for the polling snapshot
+            existing.write_text("a2")
+            (tmp_path / "notes.txt").write_text("ignored")
+            (tmp_path / "new").mkdir(exist_ok=True)
+            (tmp_path / "new" / "b.md").write_text("b")
+
+            changed = set()
+            deadline = time.monotonic() + 2
+            while len(changed) < 2 and time.monotonic() < deadline:
+                changed |= watcher.wait(0.1)
+            assert changed == {existing, tmp_path / "new" / "b.md"}, type(watcher)
+            assert watcher.wait(0.05) == set()
+        finally:
+            watcher.close()
+
+
+def test_debounce_coalesces_a_burst_of_edits(tmp_path):
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("v0")
+    watcher = open_watcher(tmp_path, poll_interval=0.02)
+
+    def edit():
+        for i in range(5):
+            time.sleep(0.03)
+            md_file.write_text(f"v{i + 1}")
+
+    writer = threading.Thread(target=edit)
+    writer.start()
+    try:
+        batch = next(debounced_changes(watcher, debounce=0.2))
+        writer.join()
+        # Every edit of the burst was taken into the one batch
+        assert watcher.wait(0.1) == set()
+    finally:
+        writer.join()
+        watcher.close()
+
+    assert batch == {md_file}
+
+
+def test_open_watcher_can_be_forced_to_poll(tmp_path):
+    watcher = open_watcher(tmp_path, polling=True)
+    assert isinstance(watcher, PollingWatcher)
+    watcher.close()
+
+
+def test_polling_wait_times_out(tmp_path):
+    start = time.monotonic()
+    assert PollingWatcher(tmp_path, interval=1.0).wait(0.05) == set()
+    assert time.monotonic() - start < 0.5
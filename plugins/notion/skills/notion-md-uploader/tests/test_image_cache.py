@@ -0,0 +1,52 @@
+import hashlib
+
+from image_cache import ImageUploadCache, default_cache_path, file_digest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_file_digest(tmp_path):
+    image = tmp_path / "a.png"
+    image.write_bytes(b"\x89PNG data")
+
+    assert file_digest(image) == hashlib.sha256(b"\x89PNG data").hexdigest()
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = tmp_path / "nested" / "cache.sqlite3"
+
+    with ImageUploadCache(path) as cache:
+        cache.put("abc", "upload-1")
+    with ImageUploadCache(path) as cache:
+        assert cache.get("abc") == "upload-1"
+        assert cache.get("missing") is None
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    clock = FakeClock()
+    with ImageUploadCache(tmp_path / "cache.sqlite3", ttl_seconds=60, clock=clock) as cache:
+        cache.put("abc", "upload-1")
+        cache.put("def", "upload-2")
+
+        clock.now += 59
+        assert cache.get("abc") == "upload-1"
+        assert cache.get_entry("abc") == ("upload-1", 1060.0)
+
+        clock.now += 1
+        assert cache.get("abc") is None
+
+        cache.put("def", "upload-3")  # re-upload refreshes the entry
+        assert cache.purge_expired() == 1
+        assert cache.get("def") == "upload-3"
+
+
+def test_default_cache_path_honours_xdg(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert default_cache_path() == tmp_path / "notion-md-uploader" / "image_uploads.sqlite3"
@@ -0,0 +1,240 @@
+import pickle
+
+from markdown_parser import (
+    EMPTY_METADATA,
+    STYLE_BOLD,
+    STYLE_CODE,
+    BlockType,
+    InlineStyle,
+    LineKind,
+    MarkdownParser,
+    line_diff,
+)
+
+
+def block_types(blocks):
+    return [b.block_type for b in blocks]
+
+
+def test_parse_all_block_types(sample_markdown):
+    blocks = MarkdownParser().parse(sample_markdown)
+    assert block_types(blocks) == [
+        BlockType.HEADING1,
+        BlockType.PARAGRAPH,
+        BlockType.HEADING2,
+        BlockType.BULLETED_LIST,
+        BlockType.BULLETED_LIST,
+        BlockType.NUMBERED_LIST,
+        BlockType.NUMBERED_LIST,
+        BlockType.CODE_BLOCK,
+        BlockType.QUOTE,
+        BlockType.CALLOUT,
+        BlockType.TABLE,
+        BlockType.TODO,
+        BlockType.TODO,
+        BlockType.IMAGE,
+        BlockType.DIVIDER,
+    ]
+
+
+def test_parsed_blocks_pickle(sample_markdown):
+    blocks = MarkdownParser().parse(sample_markdown)
+
+    restored = pickle.loads(pickle.dumps(blocks))
+
+    assert restored == blocks
+    assert restored[0].metadata is EMPTY_METADATA
+    assert restored[-2].metadata == {"url": "image.png"}
+
+
+def test_classify_line_priority():
+    parser = MarkdownParser()
+    assert parser.classify_line("")[0] is LineKind.BLANK
+    assert parser.classify_line("  \t")[0] is LineKind.BLANK
+    assert parser.classify_line("---")[0] is LineKind.DIVIDER
+    assert parser.classify_line("- [x] done")[0] is LineKind.TODO
+    assert parser.classify_line("  - item")[0] is LineKind.BULLET
+    assert parser.classify_line("> [!tip]")[0] is LineKind.CALLOUT
+    assert parser.classify_line("> [!NOTE] inline")[0] is LineKind.QUOTE
+    assert parser.classify_line("  # not a heading")[0] is LineKind.TEXT
+    assert parser.classify_line("plain prose")[0] is LineKind.TEXT
+
+
+def test_paragraph_absorbs_table_rows_without_separator():
+    blocks = MarkdownParser().parse("text\n| a | b |\n| c | d |")
+    assert block_types(blocks) == [BlockType.PARAGRAPH]
+    assert blocks[0].content[0].text == "text | a | b | | c | d |"
+
+
+def test_table_header_without_separator_is_paragraph():
+    blocks = MarkdownParser().parse("| a | b |\nmore text")
+    assert block_types(blocks) == [BlockType.PARAGRAPH]
+    assert blocks[0].content[0].text == "| a | b | more text"
+
+
+def test_paragraph_stops_at_block_start():
+    blocks = MarkdownParser().parse("line one\nline two  \n- item\n![img](a.png)")
+    assert block_types(blocks) == [
+        BlockType.PARAGRAPH,
+        BlockType.BULLETED_LIST,
+        BlockType.IMAGE,
+    ]
+    assert blocks[0].content[0].text == "line one line two"
+    assert blocks[2].metadata == {"url": "a.png"}
+
+
+def test_todo_inside_bullet_list_stays_bullet():
+    blocks = MarkdownParser().parse("- item\n- [ ] task")
+    assert block_types(blocks) == [BlockType.BULLETED_LIST, BlockType.BULLETED_LIST]
+    assert blocks[1].content[0].text == "[ ] task"
+
+
+def test_unterminated_code_block():
+    blocks = MarkdownParser().parse("```sh\necho hi\n\n# not a heading")
+    assert block_types(blocks) == [BlockType.CODE_BLOCK]
+    assert blocks[0].content == "echo hi\n\n# not a heading"
+    assert blocks[0].metadata == {"language": "sh"}
+    assert (blocks[0].start_line, blocks[0].end_line) == (1, 4)
+
+
+def test_inline_styles():
+    segments = MarkdownParser()._parse_inline(
+        "a **b** *c* ~~d~~ `e` [f](https://g) __h__ _i_"
+    )
+    styled = [(s.text, s.bold, s.italic, s.strikethrough, s.code, s.link) for s in segments]
+    assert styled == [
+        ("a ", False, False, False, False, None),
+        ("b", True, False, False, False, None),
+        (" ", False, False, False, False, None),
+        ("c", False, True, False, False, None),
+        (" ", False, False, False, False, None),
+        ("d", False, False, True, False, None),
+        (" ", False, False, False, False, None),
+        ("e", False, False, False, True, None),
+        (" ", False, False, False, False, None),
+        ("f", False, False, False, False, "https://g"),
+        (" ", False, False, False, False, None),
+        ("h", True, False, False, False, None),
+        (" ", False, False, False, False, None),
+        ("i", False, True, False, False, None),
+    ]
+
+
+def test_inline_unclosed_markers_stay_plain():
+    text = "snake_case **kwargs arr[i `tick ~tilde a*b"
+    segments = MarkdownParser()._parse_inline(text)
+    assert [s.text for s in segments] == [text]
+
+
+def test_inline_emphasis_does_not_cross_newline():
+    segments = MarkdownParser()._parse_inline("**a\nb** *c\nd*")
+    assert [s.text for s in segments] == ["**a\nb** *c\nd*"]
+
+
+def test_inline_italic_skips_double_markers():
+    segments = MarkdownParser()._parse_inline("*a**b*")
+    assert [(s.text, s.italic) for s in segments] == [("a**b", True)]
+
+
+def test_parse_stream_matches_parse(sample_markdown):
+    parser = MarkdownParser()
+    lines = sample_markdown.splitlines(keepends=True)
+    assert list(parser.parse_stream(lines)) == parser.parse(sample_markdown)
+
+
+def test_parse_stream_trailing_newline_inside_code():
+    parser = MarkdownParser()
+    for text in ["```\ncode\n", "```\ncode", ""]:
+        lines = text.splitlines(keepends=True)
+        assert list(parser.parse_stream(lines)) == parser.parse(text)
+
+
+def test_parse_stream_yields_before_input_is_exhausted():
+    consumed = []
+
+    def lines():
+        for line in ["# Title\n", "\n", "para\n", "\n", "tail\n"]:
+            consumed.append(line)
+            yield line
+
+    blocks = MarkdownParser().parse_stream(lines())
+    assert next(blocks).block_type is BlockType.HEADING1
+    assert len(consumed) == 1
+
+
+def test_block_spans(sample_markdown):
+    blocks = MarkdownParser().parse(sample_markdown)
+    spans = [(b.start_line, b.end_line) for b in blocks]
+    assert spans == [
+        (1, 1), (3, 4), (6, 6), (8, 8), (9, 9), (11, 11), (12, 12),
+        (14, 17), (19, 19), (21, 22), (24, 26), (28, 28), (29, 29),
+        (31, 31), (33, 33),
+    ]
+
+
+def test_line_diff():
+    assert line_diff("a\nb\nc", "a\nb\nc") == []
+    assert line_diff("a\nb\nc", "a\nx\nc") == [("replace", 1, 2, 1, 2)]
+    assert line_diff("a\nc", "a\nb\nc") == [("insert", 1, 1, 1, 2)]
+    assert line_diff("a\nb\nc", "a\nc") == [("delete", 1, 2, 1, 1)]
+
+
+def test_reparse_matches_full_parse(sample_markdown):
+    parser = MarkdownParser()
+    previous = parser.parse(sample_markdown)
+    edits = [
+        sample_markdown.replace("It continues on a second line.", "Edited line."),
+        sample_markdown.replace("- Bullet item 2\n", "- Bullet item 2\n- [ ] Bullet item 3\n"),
+        sample_markdown.replace("> [!NOTE]\n", ""),
+        sample_markdown.replace("```python\n", "```python\n```\n```\n"),
+        "intro\n" + sample_markdown,
+    ]
+    for new_text in edits:
+        result = parser.reparse(previous, new_text, line_diff(sample_markdown, new_text))
+        assert result == parser.parse(new_text)
+
+
+def test_reparse_reuses_blocks_after_edit(sample_markdown):
+    parser = MarkdownParser()
+    previous = parser.parse(sample_markdown)
+    new_text = sample_markdown.replace("## Heading 2", "## Renamed")
+    result = parser.reparse(previous, new_text, line_diff(sample_markdown, new_text))
+    assert result[0] is previous[0]
+    assert result[2].content[0].text == "Renamed"
+    assert all(new is old for new, old in zip(result[3:], previous[3:]))
+
+
+def test_inline_style_flags():
+    style = InlineStyle("x", bold=True, code=True)
+    assert style.flags == STYLE_BOLD | STYLE_CODE
+    assert (style.bold, style.italic, style.strikethrough, style.code) == (True, False, False, True)
+    assert style == InlineStyle("x", flags=STYLE_BOLD | STYLE_CODE)
+
+
+def test_blocks_share_empty_containers():
+    blocks = MarkdownParser().parse("para one\n\npara two")
+    assert blocks[0].children is blocks[1].children
+    assert blocks[0].metadata is blocks[1].metadata
+    assert not hasattr(blocks[0], "__dict__")
+
+
+def test_indented_list_items_nest():
+    blocks = MarkdownParser().parse("- a\n  - b\n    1. c\n  - [x] d\n\t- e\n- f")
+    assert block_types(blocks) == [BlockType.BULLETED_LIST, BlockType.BULLETED_LIST]
+    a, f = blocks
+    assert block_types(a.children) == [BlockType.BULLETED_LIST, BlockType.TODO]
+    b, d = a.children
+    assert block_types(b.children) == [BlockType.NUMBERED_LIST]
+    assert d.metadata == {"checked": True}
+    assert d.children[0].content[0].text == "e"
+    assert (a.start_line, a.end_line) == (1, 5)
+    assert (d.start_line, d.end_line) == (4, 5)
+    assert (f.start_line, f.end_line) == (6, 6)
+
+
+def test_reparse_inside_nested_list():
+    old = "intro\n\n- a\n  - b\n- c\n\nend"
+    new = "intro\n\n- a\n  - b\n  - b2\n- c\n\nend"
+    parser = MarkdownParser()
+    blocks = parser.reparse(parser.parse(old), new, line_diff(old, new))
+    assert blocks == parser.parse(new)
@@ -0,0 +1,65 @@
+import pytest
+import requests
+
+import mock_notion_server
+from mock_notion_server import MockNotionServer
+from notion_client import NotionAPIError, NotionClient, NotionConfig
+
+
+def make_client(server, **overrides):
+    overrides.setdefault("requests_per_second", 0)
+    return NotionClient(NotionConfig(api_key="secret", base_url=server.base_url, **overrides))
+
+
+def test_rate_limit_answers_429_and_the_client_retries_through():
+    with MockNotionServer(rate_limit=50, burst=1, record=False) as server:
+        client = make_client(server)
+        pages = [client.create_page("parent", f"Page {i}", lean=True) for i in range(5)]
+
+    assert len(server.pages) == len({p["id"] for p in pages}) == 5
+    assert server.requests == []
+    assert server.statuses[200] == 5
+    assert server.statuses[429] == client.metrics.rate_limited > 0
+    assert server.request_count == sum(server.statuses.values())
+
+
+def test_throttle_rate_fails_requests_at_random():
+    with MockNotionServer(throttle_rate=1.0, seed=1) as server:
+        client = make_client(server, max_retries=1)
+        with pytest.raises(NotionAPIError) as excinfo:
+            client.create_page("parent", "Title")
+
+    assert excinfo.value.status_code == 429
+    assert server.statuses == {429: 2}
+
+
+def test_payload_limits_are_enforced(notion_stub, tmp_path, monkeypatch):
+    paragraph = {"type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": "x"}}]}}
+    response = requests.patch(
+        f"{notion_stub.base_url}/blocks/page/children",
+        json={"children": [paragraph] * 101},
+        timeout=5,
+    )
+    assert response.status_code == 400
+    assert response.json()["code"] == "validation_error"
+
+    monkeypatch.setattr(mock_notion_server, "MAX_SINGLE_PART_BYTES", 3)
+    image = tmp_path / "chart.png"
+    image.write_bytes(b"\x89PNG")
+    with pytest.raises(NotionAPIError) as excinfo:
+        make_client(notion_stub).upload_file(image)
+    assert excinfo.value.status_code == 400
+    assert "larger than 3 bytes" in excinfo.value.response_body
+
+
+def test_latency_and_base_url_from_env(monkeypatch):
+    with MockNotionServer(latency=0.05) as server:
+        monkeypatch.setenv("NOTION_API_KEY", "secret")
+        monkeypatch.setenv("NOTION_BASE_URL", server.base_url + "/")
+        client = NotionClient()
+        events = []
+        client.response_hooks.append(events.append)
+        client.create_page("parent", "Title")
+
+    assert client.config.base_url == server.base_url
+    assert events[0].seconds >= 0.05
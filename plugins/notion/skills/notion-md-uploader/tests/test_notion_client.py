@@ -0,0 +1,274 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+import notion_client
+from notion_client import (
+    AsyncNotionClient,
+    NotionAPIError,
+    NotionClient,
+    NotionConfig,
+    TokenBucket,
+)
+
+
+def make_config(stub, **overrides):
+    overrides.setdefault("requests_per_second", 0)
+    return NotionConfig(api_key="secret", base_url=stub.base_url, **overrides)
+
+
+def test_sync_client_against_stub(notion_stub):
+    client = NotionClient(make_config(notion_stub))
+
+    page = client.create_page("parent", "Title", children=[{"type": "divider", "divider": {}}])
+    client.append_blocks(page["id"], [{"type": "divider", "divider": {}}])
+
+    assert [(m, p) for m, p, _ in notion_stub.requests] == [
+        ("POST", "/v1/pages"),
+        ("PATCH", f"/v1/blocks/{page['id']}/children"),
+    ]
+    assert notion_stub.requests[0][2]["properties"]["title"]["title"][0]["text"]["content"] == "Title"
+
+
+def test_lean_responses_keep_only_ids(notion_stub):
+    client = NotionClient(make_config(notion_stub))
+    paragraph = {"type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": "x"}}]}}
+
+    page = client.create_page("parent", "Title", lean=True)
+    response = client.append_blocks(page["id"], [paragraph] * 3, lean=True)
+    chunks = client.append_blocks_chunked(page["id"], [paragraph] * 150, lean=True)
+
+    assert set(page) == {"object", "id", "url"}
+    assert response["results"] == [
+        {"object": "block", "id": block_id, "type": "paragraph"}
+        for block_id in notion_stub.children[page["id"]][:3]
+    ]
+    assert [len(c["results"]) for c in chunks] == [100, 50]
+    assert all(set(b) == {"object", "id", "type"} for c in chunks for b in c["results"])
+
+
+def test_iter_search_follows_cursors(notion_stub):
+    client = NotionClient(make_config(notion_stub))
+    ids = [client.create_page("parent", f"Page {i}")["id"] for i in range(5)]
+
+    found = [page["id"] for page in client.iter_search(page_size=2, sort_direction="descending")]
+
+    assert found == ids[::-1]
+    searches = [body for _, path, body in notion_stub.requests if path == "/v1/search"]
+    assert [body.get("start_cursor") for body in searches] == [None, "2", "4"]
+    assert searches[0]["sort"] == {"direction": "descending", "timestamp": "last_edited_time"}
+
+
+def test_async_client_runs_requests_concurrently(notion_stub):
+    notion_stub.latency = 0.2
+
+    async def create_pages():
+        async with AsyncNotionClient(make_config(notion_stub), max_concurrency=3) as client:
+            return await asyncio.gather(
+                *(client.create_page("parent", f"Page {i}") for i in range(6))
+            )
+
+    start = time.perf_counter()
+    pages = asyncio.run(create_pages())
+    elapsed = time.perf_counter() - start
+
+    assert len({page["id"] for page in pages}) == 6
+    assert notion_stub.max_in_flight == 3
+    assert elapsed < 1.0  # two waves of three, not six sequential requests
+
+
+def test_async_client_method_surface(notion_stub, tmp_path):
+    image = tmp_path / "chart.png"
+    image.write_bytes(b"\x89PNG")
+
+    async def exercise():
+        async with AsyncNotionClient(make_config(notion_stub), max_concurrency=2) as client:
+            page = await client.create_page("parent", "Doc")
+            chunks = await client.append_blocks_chunked(
+                page["id"], [{"type": "divider", "divider": {}}] * 5, chunk_size=2
+            )
+            upload_id = await client.upload_file(image)
+            results = await client.search("Doc")
+            return page, chunks, upload_id, results
+
+    page, chunks, upload_id, results = asyncio.run(exercise())
+
+    assert [len(c["results"]) for c in chunks] == [2, 2, 1]
+    sends = [body for _, path, body in notion_stub.requests if path == f"/v1/file_uploads/{upload_id}/send"]
+    assert sends == [{"file": b"\x89PNG"}]
+    assert [r["id"] for r in results["results"]] == [page["id"]]
+
+
+def test_async_client_rejects_zero_concurrency():
+    with pytest.raises(ValueError):
+        AsyncNotionClient(NotionConfig(api_key="secret"), max_concurrency=0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_spaces_out_requests_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=3.0, capacity=3, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(1 / 3)
+    assert bucket.reserve() == pytest.approx(2 / 3)
+
+    clock.now = 10.0  # refill never exceeds capacity
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    bucket.defer(2.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+
+
+def test_retries_429_honouring_retry_after(notion_stub):
+    notion_stub.failures = [(429, {"Retry-After": "1.5"})]
+    client = NotionClient(make_config(notion_stub))
+    sleeps = []
+    client._sleep = sleeps.append
+
+    page = client.create_page("parent", "Title")
+
+    assert page["object"] == "page"
+    assert sleeps == [1.5]
+    assert len(notion_stub.requests) == 2
+    assert client.metrics.snapshot() == {
+        "requests": 2,
+        "bytes_sent": 2 * len(json.dumps(notion_stub.requests[0][2])),  # the retry resends the body
+        "retries": 1,
+        "rate_limited": 1,
+        "server_errors": 0,
+        "throttled_seconds": 0.0,
+        "backoff_seconds": 1.5,
+    }
+
+
+def test_retries_server_errors_with_bounded_jittered_backoff(notion_stub):
+    notion_stub.failures = [(503, {}), (502, {})]
+    client = NotionClient(make_config(notion_stub, backoff_base=1.0))
+    sleeps = []
+    client._sleep = sleeps.append
+
+    client.search("x")
+
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+    assert client.metrics.server_errors == 2
+
+
+def test_server_error_on_page_create_is_not_resent(notion_stub):
+    notion_stub.fail_pattern = "/pages$"
+    notion_stub.fail_after_commit = True
+    notion_stub.failures = [(502, {})]
+    client = NotionClient(make_config(notion_stub))
+    client._sleep = lambda seconds: None
+
+    with pytest.raises(NotionAPIError) as exc_info:
+        client.create_page("parent", "Title")
+
+    assert exc_info.value.status_code == 502
+    assert len(notion_stub.pages) == 1
+    assert client.metrics.retries == 0
+
+
+def test_server_error_on_append_is_raised_but_block_edits_retry(notion_stub):
+    client = NotionClient(make_config(notion_stub))
+    client._sleep = lambda seconds: None
+    page = client.create_page("parent", "Title")
+    paragraph = {"type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": "x"}}]}}
+    notion_stub.fail_after_commit = True
+    notion_stub.failures = [(504, {})]
+
+    with pytest.raises(NotionAPIError):
+        client.append_blocks(page["id"], [paragraph])
+    (block_id,) = notion_stub.children[page["id"]]
+
+    notion_stub.failures = [(503, {}), (503, {})]
+    client.update_block(block_id, {"paragraph": paragraph["paragraph"]})
+    client.delete_block(block_id)
+
+    assert client.metrics.server_errors == 2
+    assert notion_stub.children[page["id"]] == []
+
+
+def test_gives_up_after_max_retries(notion_stub):
+    notion_stub.failures = [(429, {"Retry-After": "0"})] * 3
+    client = NotionClient(make_config(notion_stub, max_retries=2))
+
+    with pytest.raises(NotionAPIError) as exc_info:
+        client.create_page("parent", "Title")
+
+    assert exc_info.value.status_code == 429
+    assert len(notion_stub.requests) == 3
+
+
+def test_client_errors_are_not_retried(notion_stub):
+    client = NotionClient(make_config(notion_stub))
+
+    with pytest.raises(NotionAPIError) as exc_info:
+        client._request("GET", "/nowhere")
+
+    assert exc_info.value.status_code == 404
+    assert client.metrics.retries == 0
+
+
+def test_limiter_records_throttled_time(notion_stub):
+    client = NotionClient(make_config(notion_stub, requests_per_second=10, burst=1))
+    client._limiter = TokenBucket(rate=10, capacity=1, clock=FakeClock())
+    sleeps = []
+    client._sleep = sleeps.append
+
+    for _ in range(3):
+        client.get_page("p")
+
+    # Time is frozen and sleeps are recorded, not taken, so each call queues behind the last
+    assert sleeps == pytest.approx([0.1, 0.2])
+    assert client.metrics.throttled_seconds == pytest.approx(sum(sleeps))
+
+
+def test_single_part_upload_uses_shared_session(notion_stub, tmp_path, monkeypatch):
+    image = tmp_path / "chart.png"
+    image.write_bytes(b"\x89PNG")
+    client = NotionClient(make_config(notion_stub))
+    monkeypatch.setattr(
+        "requests.post", lambda *a, **k: pytest.fail("bypassed the pooled session")
+    )
+
+    upload_id = client.upload_file(image)
+
+    method, path, body = notion_stub.requests[-1]
+    assert path == f"/v1/file_uploads/{upload_id}/send"
+    assert body == {"file": b"\x89PNG"}
+
+
+def test_large_file_is_sent_in_concurrent_parts(notion_stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(notion_client, "SINGLE_PART_UPLOAD_LIMIT", 1000)
+    data = bytes(range(256)) * 10  # 2560 bytes -> parts of 1000, 1000, 560
+    large = tmp_path / "video.mp4"
+    large.write_bytes(data)
+    notion_stub.latency = 0.1
+    notion_stub.fail_pattern = "/send$"
+    notion_stub.failures = [(503, {"Retry-After": "0"})]
+    client = NotionClient(make_config(notion_stub))
+
+    upload_id = client.upload_file(large, part_size=1000, max_workers=3)
+
+    create = notion_stub.requests[0]
+    assert create[2]["mode"] == "multi_part" and create[2]["number_of_parts"] == 3
+    parts = {
+        body["part_number"]: body["file"]
+        for _, path, body in notion_stub.requests
+        if path.endswith("/send")
+    }
+    assert b"".join(parts[str(n)] for n in (1, 2, 3)) == data
+    assert notion_stub.requests[-1][1] == f"/v1/file_uploads/{upload_id}/complete"
+    assert notion_stub.max_in_flight == 3
+    assert client.metrics.retries == 1  # the failed part was resent on its own
@@ -0,0 +1,102 @@
+import io
+import json
+import random
+
+from markdown_parser import MarkdownParser
+from notion_converter import NotionBlockConverter
+from notion_emitter import NotionEmitter
+
+EDGE_CASES = """>
+
+> [!TIP]
+
+> [!CAUTION]
+> Careful with `code` and **bold**
+
+- [x] done in a bullet list
+  - [ ] nested task
+    1. nested number *em*
+  - back to two
+- last
+
+1. one
+   - under one
+
+| a | b | c |
+|---|---|---|
+| 1 |
+| 1 | 2 | 3 | 4 |
+
+| not a table |
+plain after it
+
+# H1 with [ftp link](ftp://host/x) and [web](https://example.com)
+#### Deep heading ~~gone~~
+
+```unknownlang
+body
+```
+
+```js
+x = 1
+```
+
+Trailing spaces make
+a line break.
+
+![remote](https://example.com/a.png)
+![](missing.png)
+***
+"""
+
+
+def two_stage(text, converter=None):
+    converter = converter or NotionBlockConverter()
+    return json.dumps(converter.convert_blocks(MarkdownParser().parse(text)))
+
+
+def fused(text, converter=None):
+    return json.dumps(NotionEmitter(converter).emit(text))
+
+
+def test_matches_two_stage_output(sample_markdown):
+    assert fused(sample_markdown) == two_stage(sample_markdown)
+    assert fused(EDGE_CASES) == two_stage(EDGE_CASES)
+
+
+def test_matches_two_stage_output_on_random_documents():
+    rng = random.Random(0)
+    pieces = [
+        "# Title", "## Sub *x*", "plain **b** _i_ ~~s~~ `c`", "", "", "- item", "  - deeper",
+        "    - [x] task", "1. num", "  2. num", "- [ ] todo", "> quote", "> [!NOTE]",
+        "| a | b |", "|---|---|", "| 1 | 2 |", "```py", "```", "---", "![a](b.png)",
+        "trailing  ", "\tindented tab", "**unclosed", "[link](http://x)",
+    ]
+    for _ in range(200):
+        text = "\n".join(rng.choice(pieces) for _ in range(rng.randint(1, 30)))
+        assert fused(text) == two_stage(text), text
+
+
+def test_emit_stream_matches_emit(sample_markdown):
+    stream = NotionEmitter().emit_stream(io.StringIO(sample_markdown))
+    assert list(stream) == NotionEmitter().emit(sample_markdown)
+
+
+def test_local_images_go_through_converter(tmp_path):
+    (tmp_path / "chart.png").write_bytes(b"png")
+    uploaded = []
+
+    def uploader(path):
+        uploaded.append(path)
+        return "upload-1"
+
+    converter = NotionBlockConverter(image_uploader=uploader, base_path=str(tmp_path))
+    (block,) = NotionEmitter(converter).emit("![Chart](chart.png)")
+
+    assert block["image"]["file_upload"] == {"id": "upload-1"}
+    assert uploaded == [str(tmp_path / "chart.png")]
+
+
+def test_exposes_only_emitter_api():
+    emitter = NotionEmitter()
+    assert not any(hasattr(emitter, name) for name in ("parse", "parse_stream", "reparse"))
@@ -0,0 +1,94 @@
+import io
+
+from markdown_parser import MarkdownParser
+from notion_client import NotionClient, NotionConfig
+from notion_converter import NotionBlockConverter
+from notion_exporter import NotionExporter, rich_text_to_markdown
+from page_diff import block_signature
+from upload_md import MarkdownToNotionUploader
+
+DOCUMENT = """# Report
+
+This is a paragraph with **bold**, *italic*, ~~old~~, `code` and a [link](https://example.com).
+Second line
+after a break.
+
+## Lists
+
+- Bullet one
+  - Nested *two*
+    - Nested three
+      - Nested four
+- Bullet two
+- [x] Checked under the bullet list
+
+1. First
+2. Second
+
+- [ ] Open task
+- [x] Done task
+
+```python
+def hello():
+    print("Hello")
+```
+
+> A quote
+
+> [!WARNING]
+> Watch out
+
+| Col1 | Col2 |
+|------|------|
+| A    | **B** |
+
+![Logo](https://example.com/logo.png)
+
+---
+"""
+
+
+def make_client(stub):
+    return NotionClient(NotionConfig(api_key="secret", base_url=stub.base_url, requests_per_second=0))
+
+
+def signatures(markdown):
+    blocks = NotionBlockConverter().convert_blocks(MarkdownParser().parse(markdown))
+    return [block_signature(block) for block in blocks]
+
+
+def test_export_round_trips_through_parser(notion_stub, tmp_path):
+    md_file = tmp_path / "report.md"
+    md_file.write_text(DOCUMENT)
+    page = MarkdownToNotionUploader(notion_client=make_client(notion_stub)).upload_markdown(md_file, "parent")
+
+    out = io.StringIO()
+    count = NotionExporter(make_client(notion_stub)).export(page["id"], out)
+
+    assert signatures(out.getvalue()) == signatures(DOCUMENT)
+    assert count == sum(1 for block in notion_stub.blocks.values() if not block.get("archived"))
+
+
+def test_export_follows_pagination_with_concurrent_fetches(notion_stub, tmp_path):
+    md_file = tmp_path / "long.md"
+    md_file.write_text("\n".join(f"- Item {i}\n  - Child {i}" for i in range(250)))
+    page = MarkdownToNotionUploader(notion_client=make_client(notion_stub)).upload_markdown(md_file, "parent")
+    notion_stub.latency = 0.01
+    notion_stub.max_in_flight = 0
+
+    out_file = tmp_path / "export.md"
+    NotionExporter(make_client(notion_stub), max_workers=4).export_to_file(page["id"], out_file)
+
+    assert out_file.read_text() == md_file.read_text() + "\n"
+    assert notion_stub.max_in_flight > 1
+
+
+def test_rich_text_to_markdown_applies_annotations():
+    rich_text = [
+        {"plain_text": "plain ", "annotations": {}},
+        {"plain_text": "both", "annotations": {"bold": True, "italic": True}},
+        {"plain_text": " ", "annotations": {}},
+        {"plain_text": "site", "annotations": {"code": True}, "href": "https://example.com"},
+        {"text": {"content": "raw"}},
+    ]
+    assert rich_text_to_markdown(rich_text) == "plain ***both*** [`site`](https://example.com)raw"
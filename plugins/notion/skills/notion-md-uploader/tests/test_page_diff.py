@@ -0,0 +1,220 @@
+import random
+
+from image_cache import DEFAULT_TTL_SECONDS, ImageUploadCache, file_digest
+from markdown_parser import MarkdownParser
+from notion_client import NotionClient, NotionConfig
+from notion_converter import NotionBlockConverter
+from page_diff import EditKind, block_signature, diff_blocks
+from sync_manifest import SyncManifest
+from upload_md import MarkdownToNotionUploader
+
+
+def make_uploader(stub, manifest=None, **options):
+    config = NotionConfig(api_key="secret", base_url=stub.base_url, requests_per_second=0)
+    return MarkdownToNotionUploader(notion_client=NotionClient(config), manifest=manifest, **options)
+
+
+def convert(markdown):
+    return NotionBlockConverter().convert_blocks(MarkdownParser().parse(markdown))
+
+
+def page_signatures(stub, page_id):
+    signatures = []
+    for block in stub.page_blocks(page_id):
+        if block["has_children"]:
+            block[block["type"]]["children"] = page_children(stub, block["id"])
+        signatures.append(block_signature(block))
+    return signatures
+
+
+def page_children(stub, block_id):
+    children = [stub.block_view(stub.blocks[i]) for i in stub.children[block_id]]
+    for child in children:
+        if child["has_children"]:
+            child[child["type"]]["children"] = page_children(stub, child["id"])
+    return children
+
+
+def sync(stub, tmp_path, old, new):
+    """Create a page from old, update it to new, and return (stats, page_id)."""
+    md_file = tmp_path / "doc.md"
+    md_file.write_text(old)
+    uploader = make_uploader(stub)
+    page = uploader.upload_markdown(md_file, "parent")
+
+    md_file.write_text(new)
+    stats = uploader.update_markdown(md_file, page["id"])
+    assert page_signatures(stub, page["id"]) == [block_signature(b) for b in convert(new)]
+    return stats, page["id"]
+
+
+def test_signature_ignores_fields_the_api_fills_in(notion_stub, sample_markdown):
+    for block in convert(sample_markdown):
+        stored = notion_stub._store_children("page", [block])[0]
+        view = notion_stub.block_view(stored)
+        if view["has_children"]:
+            view[view["type"]]["children"] = page_children(notion_stub, view["id"])
+        assert block_signature(view) == block_signature(block)
+
+
+def test_signature_distinguishes_content_and_style():
+    plain = convert("some text")[0]
+    bold = convert("some **text**")[0]
+    other = convert("other text")[0]
+
+    assert len({block_signature(plain), block_signature(bold), block_signature(other)}) == 3
+
+
+def test_unchanged_document_sends_no_writes(notion_stub, tmp_path, sample_markdown):
+    stats, _ = sync(notion_stub, tmp_path, sample_markdown, sample_markdown)
+
+    assert stats["requests"] == 0
+    assert stats["unchanged"] == len(convert(sample_markdown))
+
+
+def test_long_code_block_round_trips_unchanged(notion_stub, tmp_path):
+    doc = "# Script\n\n```python\n" + "x = 1\n" * 1000 + "```\n"
+    stats, _ = sync(notion_stub, tmp_path, doc, doc)
+    assert stats["requests"] == 0
+
+
+def test_one_line_edit_in_large_document_is_one_request(notion_stub, tmp_path):
+    old = "".join(f"Paragraph {i}\n\n" for i in range(300))
+    new = old.replace("Paragraph 150\n", "Paragraph 150 (edited)\n")
+
+    stats, _ = sync(notion_stub, tmp_path, old, new)
+
+    assert stats == {"updated": 1, "deleted": 0, "inserted": 0, "requests": 1, "unchanged": 299}
+
+
+def test_inserted_and_deleted_runs(notion_stub, tmp_path):
+    old = "# Title\n\nA\n\nB\n\nC\n\nD\n"
+    new = "# Title\n\nA\n\n- new item\n- another\n\nB\n\nD\n\n---\n"
+
+    stats, _ = sync(notion_stub, tmp_path, old, new)
+
+    assert (stats["inserted"], stats["deleted"], stats["updated"]) == (3, 1, 0)
+    assert stats["requests"] == 3  # one insert run, one delete, one append at the end
+
+
+def test_prepending_same_type_reuses_first_block(notion_stub, tmp_path):
+    edits = diff_blocks(
+        [dict(b, id=f"b{i}") for i, b in enumerate(convert("A\n\nB\n"))],
+        convert("New\n\nA\n\nB\n"),
+    )
+
+    assert [(e.kind, e.block_id, len(e.blocks), e.after) for e in edits] == [
+        (EditKind.UPDATE, "b0", 1, None),
+        (EditKind.INSERT, None, 1, "b0"),
+    ]
+    sync(notion_stub, tmp_path, "A\n\nB\n", "New\n\nA\n\nB\n")
+
+
+def test_prepending_other_type_rewrites_page(notion_stub, tmp_path):
+    stats, _ = sync(notion_stub, tmp_path, "A\n\nB\n", "---\n\nA\n\nB\n")
+
+    assert (stats["deleted"], stats["inserted"]) == (2, 3)
+
+
+def test_insert_runs_longer_than_request_limit(notion_stub, tmp_path):
+    old = "# Top\n\nEnd\n"
+    new = "# Top\n\n" + "".join(f"- item {i}\n" for i in range(250)) + "\nEnd\n"
+
+    stats, _ = sync(notion_stub, tmp_path, old, new)
+
+    assert stats["inserted"] == 250
+    assert stats["requests"] == 3
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def file_uploads(stub):
+    return sum(1 for method, path, _ in stub.requests if (method, path) == ("POST", "/v1/file_uploads"))
+
+
+def test_uploaded_images_match_on_recorded_content_digest(notion_stub, tmp_path):
+    (tmp_path / "chart.png").write_bytes(b"\x89PNG chart")
+    (tmp_path / "chart2.png").write_bytes(b"\x89PNG chart2")
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("# Report\n\n![Chart](chart.png)\n\nOld text\n")
+    clock = FakeClock()
+
+    with SyncManifest(tmp_path / "manifest.sqlite3") as manifest, ImageUploadCache(
+        tmp_path / "cache.sqlite3", clock=clock
+    ) as cache:
+        uploader = make_uploader(notion_stub, manifest, image_cache=cache, clock=clock)
+        page_id = uploader.upload_markdown(md_file, "parent")["id"]
+        image_id = notion_stub.children[page_id][1]
+        assert manifest.image_digests(md_file) == {image_id: file_digest(tmp_path / "chart.png")}
+
+        # Notion returns the image as a fresh file URL; the recorded digest still matches it
+        md_file.write_text("# Report\n\n![Chart](chart.png)\n\nNew text\n")
+        stats = uploader.update_markdown(md_file, page_id)
+        assert stats == {"updated": 1, "deleted": 0, "inserted": 0, "requests": 1, "unchanged": 2}
+        assert notion_stub.children[page_id][1] == image_id
+
+        # Hours later, in a new session, the expired upload doesn't matter: nothing is uploaded
+        clock.now += 2 * DEFAULT_TTL_SECONDS
+        uploader = make_uploader(notion_stub, manifest, image_cache=cache, clock=clock)
+        md_file.write_text("# Report\n\n![Chart](chart.png)\n\nNewer text\n")
+        stats = uploader.update_markdown(md_file, page_id)
+        assert stats == {"updated": 1, "deleted": 0, "inserted": 0, "requests": 1, "unchanged": 2}
+        assert notion_stub.children[page_id][1] == image_id
+        assert file_uploads(notion_stub) == 1
+
+        # A different image replaces the block; only it is uploaded, and the new block is recorded
+        md_file.write_text("# Report\n\n![Chart](chart2.png)\n\nNewer text\n")
+        stats = uploader.update_markdown(md_file, page_id)
+        assert (stats["deleted"], stats["inserted"]) == (1, 1)
+        assert file_uploads(notion_stub) == 2
+        new_image_id = notion_stub.children[page_id][1]
+        assert manifest.image_uploads(md_file) == {
+            new_image_id: notion_stub.blocks[new_image_id]["image"]["file_upload"]["id"]
+        }
+        assert manifest.image_digests(md_file) == {new_image_id: file_digest(tmp_path / "chart2.png")}
+        assert manifest.image_ids(md_file) == list(manifest.image_uploads(md_file).values())
+
+        assert uploader.update_markdown(md_file, page_id)["requests"] == 0
+        assert file_uploads(notion_stub) == 2
+
+
+def test_random_edit_sequences_converge(notion_stub, tmp_path):
+    rng = random.Random(7)
+    pool = [
+        "Para {n}", "Para {n} with **bold**", "# Heading {n}", "## Sub {n}",
+        "- bullet {n}", "1. number {n}", "- [ ] todo {n}", "- [x] done {n}",
+        "> quote {n}", "> [!TIP]\n> tip {n}", "---", "```py\nprint({n})\n```",
+        "| a | b |\n|---|---|\n| {n} | x |", "![img](https://example.com/{n}.png)",
+    ]
+
+    def make_doc(sections):
+        return "\n\n".join(sections) + "\n"
+
+    sections = [rng.choice(pool).format(n=i) for i in range(20)]
+    md_file = tmp_path / "doc.md"
+    md_file.write_text(make_doc(sections))
+    uploader = make_uploader(notion_stub)
+    page_id = uploader.upload_markdown(md_file, "parent")["id"]
+
+    for step in range(25):
+        for _ in range(rng.randint(1, 4)):
+            op = rng.choice(["insert", "delete", "replace"])
+            position = rng.randrange(len(sections) + 1)
+            section = rng.choice(pool).format(n=100 * step + position)
+            if op == "insert" or not sections:
+                sections.insert(position, section)
+            elif op == "delete":
+                sections.pop(min(position, len(sections) - 1))
+            else:
+                sections[min(position, len(sections) - 1)] = section
+
+        md_file.write_text(make_doc(sections))
+        uploader.update_markdown(md_file, page_id)
+        expected = [block_signature(b) for b in convert(make_doc(sections))]
+        assert page_signatures(notion_stub, page_id) == expected, step
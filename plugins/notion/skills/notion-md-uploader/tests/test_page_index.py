@@ -0,0 +1,71 @@
+import pytest
+
+from notion_client import NotionClient, NotionConfig
+from page_index import PageIndex
+from upload_md import MarkdownToNotionUploader, resolve_parent_title
+
+
+def make_client(stub):
+    return NotionClient(NotionConfig(api_key="secret", base_url=stub.base_url, requests_per_second=0))
+
+
+def searches(stub):
+    return sum(1 for _, path, _ in stub.requests if path == "/v1/search")
+
+
+def test_index_builds_once_then_refreshes_incrementally(notion_stub, tmp_path):
+    client = make_client(notion_stub)
+    pages = [client.create_page("parent", f"Note {i}") for i in range(250)]
+    path = tmp_path / "index.sqlite3"
+
+    with PageIndex(path) as index:
+        assert index.refresh(client) == 250
+        assert searches(notion_stub) == 3
+
+    notion_stub.touch_page(pages[7]["id"], title="Renamed")
+    notion_stub.touch_page(pages[8]["id"], archived=True)
+
+    with PageIndex(path) as index:
+        assert len(index) == 250  # loaded from disk
+        before = searches(notion_stub)
+        index.refresh(client)
+        assert searches(notion_stub) == before + 1
+
+        assert index.find("note 7") == []
+        assert [p.page_id for p in index.find("  RENAMED ")] == [pages[7]["id"].replace("-", "")]
+        assert index.find("Note 8") == []
+        assert len(index) == 249
+
+
+def test_find_filters_by_parent(notion_stub, tmp_path):
+    client = make_client(notion_stub)
+    first = client.create_page("11111111111111111111111111111111", "Readme")
+    client.create_page("22222222-2222-2222-2222-222222222222", "Readme")
+
+    with PageIndex(tmp_path / "index.sqlite3") as index:
+        index.refresh(client)
+        assert len(index.find("Readme")) == 2
+        matches = index.find("Readme", "11111111-1111-1111-1111-111111111111")
+        assert [p.page_id for p in matches] == [first["id"].replace("-", "")]
+
+        with pytest.raises(LookupError, match="Several"):
+            resolve_parent_title(index, "Readme")
+        with pytest.raises(LookupError, match="No page"):
+            resolve_parent_title(index, "Missing")
+
+
+def test_batch_upload_skips_pages_already_in_index(notion_stub, tmp_path):
+    for name in ("alpha", "beta"):
+        (tmp_path / f"{name}.md").write_text(f"# {name.title()}\n\nBody\n")
+    md_files = sorted(tmp_path.glob("*.md"))
+    parent = "33333333-3333-3333-3333-333333333333"
+
+    with PageIndex(tmp_path / "index.sqlite3") as index:
+        uploader = MarkdownToNotionUploader(notion_client=make_client(notion_stub), page_index=index)
+        first = list(uploader.upload_many(md_files, parent, workers=1, skip_existing=True))
+        assert [r.existing for r in first] == [None, None]
+        assert index.find("Alpha", parent)[0].page_id == first[0].page["id"].replace("-", "")
+
+        second = list(uploader.upload_many(md_files, parent, workers=1, skip_existing=True))
+        assert [r.existing.title for r in second] == ["Alpha", "Beta"]
+        assert sum(1 for _, path, _ in notion_stub.requests if path == "/v1/pages") == 2
@@ -0,0 +1,116 @@
+from notion_client import NotionClient, NotionConfig
+from sync_manifest import SyncManifest
+from upload_md import DirectorySync, MarkdownToNotionUploader, SyncAction, collect_markdown_files
+
+
+def make_client(stub):
+    return NotionClient(NotionConfig(api_key="secret", base_url=stub.base_url, requests_per_second=0))
+
+
+def test_manifest_persists_entries_blocks_and_images(tmp_path):
+    path = tmp_path / "manifest.sqlite3"
+    md_file = tmp_path / "doc.md"
+    with SyncManifest(path, clock=lambda: 100.0) as manifest:
+        manifest.record(
+            md_file, "hash-1", "page-1", "parent", ["b1", "b2", "b3"], ["img-1"], {"b2": "img-1"}, {"b2": "digest-1"}
+        )
+        manifest.record(tmp_path / "copy.md", "hash-1", "page-2", "parent")
+
+    with SyncManifest(path, clock=lambda: 200.0) as manifest:
+        assert len(manifest) == 2
+        entry = manifest.get(md_file)
+        assert (entry.page_id, entry.parent_page_id, entry.synced_at) == ("page-1", "parent", 100.0)
+        assert manifest.is_unchanged(md_file, "hash-1")
+        assert not manifest.is_unchanged(md_file, "hash-2")
+        assert manifest.block_ids(md_file) == ["b1", "b2", "b3"]
+        assert manifest.image_ids(md_file) == ["img-1"]
+        assert manifest.image_uploads(md_file) == {"b2": "img-1"}
+        assert manifest.image_digests(md_file) == {"b2": "digest-1"}
+        assert {e.page_id for e in manifest.find_by_hash("hash-1")} == {"page-1", "page-2"}
+
+        # Re-recording replaces blocks and keeps the parent
+        manifest.record(md_file, "hash-2", "page-1", block_ids=["b4"])
+        assert manifest.get(md_file).parent_page_id == "parent"
+        assert manifest.block_ids(md_file) == ["b4"]
+        assert manifest.image_ids(md_file) == []
+        assert manifest.image_uploads(md_file) == {}
+        assert manifest.image_digests(md_file) == {}
+        assert [e.page_id for e in manifest.find_by_hash("hash-1")] == ["page-2"]
+
+        moved = manifest.move(md_file, tmp_path / "sub" / "doc.md")
+        assert moved.page_id == "page-1"
+        assert manifest.get(md_file) is None
+        assert manifest.block_ids(tmp_path / "sub" / "doc.md") == ["b4"]
+
+        manifest.remove(tmp_path / "copy.md")
+        assert manifest.find_by_hash("hash-1") == []
+
+    with SyncManifest(path) as manifest:
+        assert manifest.get(tmp_path / "sub" / "doc.md").content_hash == "hash-2"
+        assert len(manifest) == 1
+
+
+def test_sync_touches_only_changed_files(notion_stub, tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    for i in range(30):
+        (docs / f"note{i}.md").write_text(f"# Note {i}\n\nBody of note {i}.\n\n- item\n")
+    (docs / "sub" / "logo.png").write_bytes(b"\x89PNG fake")
+    (docs / "sub" / "with-image.md").write_text("# Logo\n\n![Logo](logo.png)\n")
+    md_files = collect_markdown_files(str(docs))
+    path = tmp_path / "manifest.sqlite3"
+
+    # First run: everything is new (converted in a batch, so via upload_converted)
+    with SyncManifest(path) as manifest:
+        uploader = MarkdownToNotionUploader(notion_client=make_client(notion_stub), manifest=manifest)
+        results = list(uploader.upload_many(md_files, "parent", workers=1))
+        assert all(r.error is None for r in results)
+        pages = {r.md_file: r.page["id"] for r in results}
+        image = manifest.get(docs / "sub" / "with-image.md")
+        stored = [notion_stub.blocks[block_id] for block_id in notion_stub.children[image.page_id]]
+        uploads = {b["id"]: b["image"]["file_upload"]["id"] for b in stored if b["type"] == "image"}
+        assert manifest.image_ids(image.path) == list(uploads.values())
+        assert manifest.image_uploads(image.path) == uploads
+        note = docs / "note0.md"
+        assert manifest.block_ids(note) == [b["id"] for b in notion_stub.page_blocks(pages[str(note)])]
+
+    # Second run, in a new session: one file edited, one moved, the rest untouched
+    (docs / "note3.md").write_text("# Note 3\n\nEdited body.\n\n- item\n")
+    (docs / "note4.md").rename(docs / "sub" / "note4.md")
+    sent_before = len(notion_stub.requests)
+    with SyncManifest(path) as manifest:
+        uploader = MarkdownToNotionUploader(notion_client=make_client(notion_stub), manifest=manifest)
+        results = list(DirectorySync(uploader, "parent").sync(collect_markdown_files(str(docs))))
+        sent = notion_stub.requests[sent_before:]
+
+        actions = {r.md_file.relative_to(docs).as_posix(): r for r in results}
+        assert actions["note3.md"].action is SyncAction.UPDATED
+        assert actions["note3.md"].page_id == pages[str(docs / "note3.md")]
+        assert actions["note3.md"].stats["updated"] == 1
+        assert actions["sub/note4.md"].action is SyncAction.MOVED
+        assert actions["sub/note4.md"].page_id == pages[str(docs / "note4.md")]
+        others = [r.action for name, r in actions.items() if name not in ("note3.md", "sub/note4.md")]
+        assert others == [SyncAction.UNCHANGED] * 29
+
+        # Only note 3's page and its blocks were read and written
+        page_3 = pages[str(docs / "note3.md")]
+        targets = {path.split("/")[3] for _, path, _ in sent}
+        assert sent and all(t == page_3 or notion_stub.blocks[t]["parent_id"] == page_3 for t in targets)
+        # The update reads the page once and records block IDs from its responses
+        assert [m for m, _, _ in sent].count("GET") == 1
+        assert manifest.block_ids(docs / "note3.md") == [b["id"] for b in notion_stub.page_blocks(page_3)]
+        assert manifest.get(docs / "note4.md") is None
+        assert manifest.get(docs / "sub" / "note4.md").page_id == pages[str(docs / "note4.md")]
+
+
+def test_upload_records_block_ids_from_responses(notion_stub, tmp_path):
+    md_file = tmp_path / "long.md"
+    md_file.write_text("# Long\n\n" + "\n\n".join(f"Paragraph {i}" for i in range(250)))
+
+    with SyncManifest(tmp_path / "manifest.sqlite3") as manifest:
+        uploader = MarkdownToNotionUploader(notion_client=make_client(notion_stub), manifest=manifest)
+        page = uploader.upload_markdown(md_file, "parent")
+
+        # Only the blocks sent with the page are listed; the appends return their IDs
+        assert [m for m, _, _ in notion_stub.requests] == ["POST", "GET", "PATCH", "PATCH"]
+        assert manifest.block_ids(md_file) == notion_stub.children[page["id"]]
@@ -0,0 +1,61 @@
+import io
+import json
+
+from notion_client import NotionClient, NotionConfig
+from telemetry import Telemetry
+from upload_md import MarkdownToNotionUploader
+
+
+class StepClock:
+    """Clock that advances by one second each time it is read."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+def events(sink, kind):
+    return [e for e in map(json.loads, sink.getvalue().splitlines()) if e["event"] == kind]
+
+
+def test_nested_spans_count_their_time_once():
+    sink = io.StringIO()
+    telemetry = Telemetry(sink, clock=StepClock())
+    with telemetry.span("upload"):
+        with telemetry.span("parse"):
+            pass
+        items = list(telemetry.timed("convert", ["a", "b"]))
+
+    assert items == ["a", "b"]
+    spans = {e["stage"]: e for e in events(sink, "span")}
+    assert spans["parse"]["seconds"] == 1.0
+    assert spans["convert"]["items"] == 2
+    upload = spans["upload"]
+    assert upload["self_seconds"] == upload["seconds"] - spans["parse"]["seconds"] - spans["convert"]["seconds"]
+    assert sum(seconds for seconds, _ in telemetry.stages.values()) == upload["seconds"]
+
+
+def test_upload_reports_stages_progress_and_requests(notion_stub, tmp_path):
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("# Doc\n\n" + "\n\n".join(f"Paragraph {i}" for i in range(250)))
+    client = NotionClient(NotionConfig(api_key="secret", base_url=notion_stub.base_url, requests_per_second=0))
+    sink = io.StringIO()
+    uploader = MarkdownToNotionUploader(notion_client=client, telemetry=Telemetry(sink))
+
+    uploader.upload_markdown(md_file, "parent")
+
+    stages = {e["stage"] for e in events(sink, "span")}
+    assert {"read", "parse", "upload_images", "convert", "create_page", "append", "upload"} <= stages
+    progress = events(sink, "progress")
+    assert [p["blocks_done"] for p in progress] == [100, 200, 251]
+    assert progress[-1]["blocks_total"] == 251 and progress[-1]["eta_seconds"] == 0
+    (counters,) = events(sink, "counters")
+    assert counters["requests"] == len(notion_stub.requests) == 3
+    assert counters["bytes_sent"] > 0
+
+    profile = uploader.telemetry.format_profile()
+    assert "append" in profile and "3 requests" in profile
+    assert "API-bound" in profile or "CPU-bound" in profile
@@ -0,0 +1,108 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from client_metrics import MetricsRecorder
+from daemon_client import DaemonError, send_request
+from image_cache import DEFAULT_TTL_SECONDS
+from notion_client import NotionClient, NotionConfig
+from sync_manifest import SyncManifest
+from upload_daemon import UploadDaemon
+from upload_journal import journal_path
+from upload_md import MarkdownToNotionUploader
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+PARENT = "0123456789abcdef0123456789abcdef"
+
+
+@pytest.fixture
+def daemon(notion_stub, tmp_path):
+    client = NotionClient(NotionConfig(api_key="secret", base_url=notion_stub.base_url, requests_per_second=0))
+    with SyncManifest(tmp_path / "manifest.sqlite3") as manifest:
+        uploader = MarkdownToNotionUploader(notion_client=client, manifest=manifest)
+        daemon = UploadDaemon(uploader, tmp_path / "daemon.sock", MetricsRecorder(client))
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        yield daemon
+        daemon.shutdown()
+        thread.join()
+
+
+def test_daemon_runs_jobs_through_one_uploader(daemon, notion_stub, tmp_path):
+    socket_path = daemon.socket_path
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("# Doc\n\nFirst version.\n")
+
+    page = send_request({"op": "upload", "md_file": str(md_file), "parent_page_id": PARENT}, socket_path)
+    assert page["page_id"] in notion_stub.pages
+    assert not journal_path(md_file).exists()
+
+    md_file.write_text("# Doc\n\nSecond version.\n")
+    stats = send_request({"op": "update", "md_file": str(md_file), "page_id": page["page_id"]}, socket_path)
+    assert stats["updated"] == 1
+
+    (tmp_path / "other.md").write_text("# Other\n")
+    result = send_request({"op": "sync", "source": str(tmp_path), "parent_page_id": PARENT}, socket_path)
+    assert result["counts"] == {"UNCHANGED": 1, "CREATED": 1}
+    assert send_request({"op": "ping"}, socket_path)["jobs"] == 3
+
+    metrics = send_request({"op": "metrics"}, socket_path)
+    assert {e["endpoint"] for e in metrics["endpoints"]} >= {"/pages", "/blocks/{id}/children"}
+    text = send_request({"op": "metrics", "format": "prometheus"}, socket_path)["text"]
+    assert 'notion_responses_total{method="POST",endpoint="/pages",status="200"} 2' in text
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_daemon_uploads_images_again_once_their_ids_expire(daemon, notion_stub, tmp_path):
+    clock = FakeClock()
+    daemon.uploader._clock = clock
+    (tmp_path / "chart.png").write_bytes(b"\x89PNG chart")
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.md").write_text(f"# {name}\n\n![Chart](chart.png)\n")
+
+    def upload(name):
+        request = {"op": "upload", "md_file": str(tmp_path / f"{name}.md"), "parent_page_id": PARENT}
+        send_request(request, daemon.socket_path)
+        return sum(1 for method, path, _ in notion_stub.requests if (method, path) == ("POST", "/v1/file_uploads"))
+
+    assert upload("a") == 1
+    clock.now += DEFAULT_TTL_SECONDS - 1
+    assert upload("b") == 1  # still valid, reused
+    clock.now += 1
+    assert upload("c") == 2  # Notion would reject the first ID by now
+
+
+def test_daemon_reports_failed_jobs_and_keeps_serving(daemon, tmp_path):
+    with pytest.raises(DaemonError, match="No such file"):
+        send_request({"op": "update", "md_file": str(tmp_path / "missing.md"), "page_id": "abc123"}, daemon.socket_path)
+    with pytest.raises(DaemonError, match="Unknown op"):
+        send_request({"op": "frobnicate"}, daemon.socket_path)
+    with pytest.raises(DaemonError, match="page ID or URL"):
+        send_request({"op": "upload", "md_file": "x.md", "parent_page_id": "Team Notes"}, daemon.socket_path)
+    assert send_request({"op": "ping"}, daemon.socket_path)["jobs"] == 1
+
+
+def test_second_daemon_refuses_a_live_socket(daemon):
+    with pytest.raises(OSError, match="already listening"):
+        UploadDaemon(daemon.uploader, daemon.socket_path)
+
+
+def test_client_without_daemon_fails_cleanly(tmp_path):
+    with pytest.raises(DaemonError, match="not running"):
+        send_request({"op": "ping"}, tmp_path / "none.sock")
+
+
+def test_thin_client_skips_heavy_imports():
+    code = "import sys, daemon_client; print(sorted({'requests', 'dotenv', 'upload_md'} & set(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=SCRIPTS, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,137 @@
+import json
+
+import pytest
+
+from notion_client import NotionAPIError, NotionClient, NotionConfig
+from upload_journal import JournalError, UploadJournal, journal_path
+from upload_md import MarkdownToNotionUploader
+
+
+class FlakyClient(NotionClient):
+    """Fails the append at index fail_at, optionally after it reached Notion."""
+
+    def __init__(self, config, fail_at, lose_response=False):
+        super().__init__(config)
+        self.fail_at = fail_at
+        self.lose_response = lose_response
+        self.appends = 0
+
+    def append_blocks(self, block_id, children, after=None, lean=False):
+        self.appends += 1
+        if self.appends == self.fail_at:
+            if self.lose_response:
+                super().append_blocks(block_id, children, after, lean)
+            raise NotionAPIError(503, "Service Unavailable")
+        return super().append_blocks(block_id, children, after, lean)
+
+
+def make_config(stub):
+    return NotionConfig(api_key="secret", base_url=stub.base_url, requests_per_second=0)
+
+
+def write_doc(tmp_path, paragraphs=350):
+    md_file = tmp_path / "long.md"
+    md_file.write_text("# Long\n\n" + "\n\n".join(f"Paragraph {i}" for i in range(paragraphs)))
+    return md_file
+
+
+def page_texts(stub, page_id):
+    return [
+        stub.blocks[i][stub.blocks[i]["type"]]["rich_text"][0]["text"]["content"]
+        for i in stub.children[page_id]
+    ]
+
+
+def pages_created(stub):
+    return sum(1 for method, path, _ in stub.requests if (method, path) == ("POST", "/v1/pages"))
+
+
+def test_journal_replays_progress(tmp_path):
+    md_file = write_doc(tmp_path, 3)
+    now = [1000.0]
+    journal = UploadJournal.create(md_file, "parent", "Title", clock=lambda: now[0])
+    journal.record_page("page-1")
+    journal.record_image("digest", "upload-1")
+    journal.record_request(0, 100)
+    journal.record_request(1, 40)
+    with journal.path.open("a") as f:
+        f.write('{"event": "requ')  # torn by a crash
+
+    state = UploadJournal.load(md_file, clock=lambda: now[0]).state
+    assert (state.parent_page_id, state.title, state.page_id) == ("parent", "Title", "page-1")
+    assert (state.requests_done, state.blocks_done) == (2, 140)
+    assert state.images == {"digest": "upload-1"}
+
+    now[0] += 2 * 60 * 60
+    assert UploadJournal.load(md_file, clock=lambda: now[0]).state.images == {}
+
+
+def test_journal_rejects_changed_source(tmp_path):
+    md_file = write_doc(tmp_path, 3)
+    UploadJournal.create(md_file, "parent")
+    md_file.write_text("# Edited\n")
+    with pytest.raises(JournalError, match="changed"):
+        UploadJournal.load(md_file)
+    assert UploadJournal.load(tmp_path / "other.md") is None
+
+
+def test_resume_continues_after_last_acknowledged_request(notion_stub, tmp_path):
+    md_file = write_doc(tmp_path)
+    journal = UploadJournal.create(md_file, "parent")
+    uploader = MarkdownToNotionUploader(notion_client=FlakyClient(make_config(notion_stub), fail_at=2))
+    with pytest.raises(NotionAPIError):
+        uploader.upload_markdown(md_file, "parent", journal=journal)
+
+    journal = UploadJournal.load(md_file)
+    assert journal.state.requests_done == 2
+    page_id = journal.state.page_id
+    sent_before = len(notion_stub.requests)
+
+    uploader = MarkdownToNotionUploader(notion_client=NotionClient(make_config(notion_stub)))
+    page = uploader.upload_markdown(md_file, "parent", journal=journal)
+
+    assert page["id"] == page_id
+    assert pages_created(notion_stub) == 1
+    assert page_texts(notion_stub, page_id) == ["Long"] + [f"Paragraph {i}" for i in range(350)]
+    # One listing to check for leftovers, then only the two missing appends
+    resumed = [r[:2] for r in notion_stub.requests[sent_before:]]
+    assert [m for m, _ in resumed].count("PATCH") == 2
+    assert not journal_path(md_file).exists()
+
+
+def test_resume_discards_blocks_from_unacknowledged_request(notion_stub, tmp_path):
+    md_file = write_doc(tmp_path)
+    journal = UploadJournal.create(md_file, "parent")
+    client = FlakyClient(make_config(notion_stub), fail_at=1, lose_response=True)
+    with pytest.raises(NotionAPIError):
+        MarkdownToNotionUploader(notion_client=client).upload_markdown(md_file, "parent", journal=journal)
+    page_id = UploadJournal.load(md_file).state.page_id
+    assert len(notion_stub.children[page_id]) == 200
+
+    uploader = MarkdownToNotionUploader(notion_client=NotionClient(make_config(notion_stub)))
+    uploader.upload_markdown(md_file, "parent", journal=UploadJournal.load(md_file))
+
+    assert page_texts(notion_stub, page_id) == ["Long"] + [f"Paragraph {i}" for i in range(350)]
+
+
+def test_queued_upload_drains_with_recorded_images(notion_stub, tmp_path):
+    (tmp_path / "chart.png").write_bytes(b"\x89PNG chart")
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("# Doc\n\n![Chart](chart.png)\n\n" + "\n\n".join(f"p{i}" for i in range(150)))
+
+    journal = UploadJournal.create(md_file, "parent")
+    assert UploadJournal.load(md_file).queued
+
+    client = FlakyClient(make_config(notion_stub), fail_at=1)
+    with pytest.raises(NotionAPIError):
+        MarkdownToNotionUploader(notion_client=client).upload_markdown(md_file, "parent", journal=journal)
+    records = [json.loads(line)["event"] for line in journal.path.read_text().splitlines()]
+    assert records == ["start", "image", "page", "request"]
+
+    uploads_before = sum(1 for _, path, _ in notion_stub.requests if path == "/v1/file_uploads")
+    uploader = MarkdownToNotionUploader(notion_client=NotionClient(make_config(notion_stub)))
+    page = uploader.upload_markdown(md_file, "parent", journal=UploadJournal.load(md_file))
+
+    uploads_after = sum(1 for _, path, _ in notion_stub.requests if path == "/v1/file_uploads")
+    assert uploads_after == uploads_before == 1
+    assert len(notion_stub.children[page["id"]]) == 152
@@ -0,0 +1,289 @@
+import threading
+import time
+from pathlib import Path
+
+from image_cache import DEFAULT_TTL_SECONDS, ImageUploadCache, file_digest
+from notion_client import NotionClient, NotionConfig, RequestMetrics
+from page_index import PageIndex
+from upload_md import (
+    DirectorySync,
+    MarkdownToNotionUploader,
+    SyncAction,
+    collect_markdown_files,
+    convert_document,
+    extract_title,
+)
+
+
+class RecordingClient:
+    """Stand-in for NotionClient that records page writes."""
+
+    def __init__(self):
+        self.calls = []
+        self.metrics = RequestMetrics()
+
+    def create_page(self, parent_page_id, title, children=None, lean=False):
+        self.calls.append(("create_page", title, len(children or [])))
+        return {"id": "page-1", "url": "https://notion.so/page-1"}
+
+    def append_blocks(self, block_id, children, lean=False):
+        self.calls.append(("append_blocks", block_id, len(children)))
+        return {"results": []}
+
+    def upload_file(self, file_path):
+        if "broken" in str(file_path):
+            raise OSError("disk error")
+        self.calls.append(("upload_file", Path(file_path).name))
+        return "upload-1"
+
+
+def test_upload_markdown_streams_in_chunks(tmp_path):
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("# Big Doc\n\n" + "".join(f"para {i}\n\n" for i in range(249)))
+
+    client = RecordingClient()
+    page = MarkdownToNotionUploader(notion_client=client).upload_markdown(md_file, "parent")
+
+    assert page["id"] == "page-1"
+    assert client.calls == [
+        ("create_page", "Big Doc", 100),
+        ("append_blocks", "page-1", 100),
+        ("append_blocks", "page-1", 50),
+    ]
+
+
+def test_upload_markdown_title_falls_back_to_filename(tmp_path):
+    md_file = tmp_path / "notes.md"
+    md_file.write_text("no heading here\n")
+
+    client = RecordingClient()
+    MarkdownToNotionUploader(notion_client=client).upload_markdown(md_file, "parent")
+
+    assert client.calls == [("create_page", "notes", 1)]
+
+
+def test_extract_title():
+    assert extract_title(["intro\n", "  # Title  \n", "# Other\n"]) == "Title"
+    assert extract_title(["## Sub\n"]) is None
+
+
+def test_convert_document_defers_local_images(tmp_path):
+    (tmp_path / "chart.png").write_bytes(b"png")
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("# Doc\n\n![Chart](chart.png)\n")
+
+    document = convert_document(md_file)
+
+    assert document.title == "Doc"
+    placeholder = document.blocks[1]["image"]["file_upload"]["id"]
+    assert document.pending_images == {placeholder: str(tmp_path / "chart.png")}
+
+
+def test_upload_many_resolves_images_and_reports_failures(tmp_path):
+    (tmp_path / "chart.png").write_bytes(b"png")
+    (tmp_path / "broken.png").write_bytes(b"other png")
+    (tmp_path / "a.md").write_text("# A\n\n![Chart](chart.png)\n\n![Chart again](chart.png)\n")
+    (tmp_path / "b.md").write_text("# B\n\n![Bad](broken.png)\n")
+    (tmp_path / "c.md").write_bytes(b"\xff\xfe not utf-8")
+
+    client = RecordingClient()
+    uploader = MarkdownToNotionUploader(notion_client=client)
+    results = {
+        Path(r.md_file).name: r
+        for r in uploader.upload_many(collect_markdown_files(str(tmp_path)), "parent", workers=2)
+    }
+
+    assert results["a.md"].page["id"] == "page-1"
+    a_blocks = results["a.md"].document.blocks
+    assert [b["image"]["file_upload"]["id"] for b in a_blocks[1:]] == ["upload-1", "upload-1"]
+    assert client.calls.count(("upload_file", "chart.png")) == 1
+
+    b_blocks = results["b.md"].document.blocks
+    assert "Image upload failed" in b_blocks[1]["paragraph"]["rich_text"][0]["text"]["content"]
+
+    assert isinstance(results["c.md"].error, UnicodeDecodeError)
+    assert results["c.md"].page is None
+
+
+def test_collect_markdown_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.md").write_text("a")
+    (tmp_path / "sub" / "b.md").write_text("b")
+    (tmp_path / "notes.txt").write_text("c")
+
+    assert collect_markdown_files(str(tmp_path)) == [tmp_path / "a.md", tmp_path / "sub" / "b.md"]
+    assert collect_markdown_files(str(tmp_path / "*.md")) == [tmp_path / "a.md"]
+    assert collect_markdown_files(str(tmp_path / "a.md")) == [tmp_path / "a.md"]
+    assert collect_markdown_files(str(tmp_path / "missing")) == []
+
+
+class SlowUploadClient(RecordingClient):
+    """RecordingClient whose uploads take a while and track concurrency."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def upload_file(self, file_path):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.1)
+        with self._lock:
+            self.in_flight -= 1
+        return f"upload-{Path(file_path).stem}"
+
+
+def test_upload_markdown_uploads_images_concurrently_before_converting(tmp_path):
+    for i in range(4):
+        (tmp_path / f"img{i}.png").write_bytes(f"png {i}".encode())
+    md_file = tmp_path / "doc.md"
+    md_file.write_text(
+        "# Doc\n\n"
+        + "".join(f"![Image {i}](img{i}.png)\n\n" for i in range(4))
+        + "![Again](img0.png)\n\n![Gone](missing.png)\n"
+    )
+
+    client = SlowUploadClient()
+    created = []
+    client.create_page = lambda parent_page_id, title, children=None, lean=False: created.append(children) or {"id": "page-1"}
+
+    start = time.perf_counter()
+    MarkdownToNotionUploader(notion_client=client, image_workers=4).upload_markdown(md_file, "parent")
+    elapsed = time.perf_counter() - start
+
+    assert client.max_in_flight == 4
+    assert elapsed < 0.35  # four 0.1s uploads side by side, not back to back
+    images = [b["image"]["file_upload"]["id"] for b in created[0] if b["type"] == "image"]
+    assert images == ["upload-img0", "upload-img1", "upload-img2", "upload-img3", "upload-img0"]
+    assert created[0][-1]["type"] == "paragraph"  # missing file stays a placeholder
+
+
+def test_upload_images_reports_failures_per_path(tmp_path):
+    ok, broken = tmp_path / "ok.png", tmp_path / "broken.png"
+    ok.write_bytes(b"ok")
+    broken.write_bytes(b"broken")
+    missing = str(tmp_path / "missing.png")
+    uploader = MarkdownToNotionUploader(notion_client=RecordingClient())
+
+    results = uploader.upload_images([str(ok), str(broken), str(ok), missing])
+
+    assert results[str(ok)] == "upload-1"
+    assert isinstance(results[str(broken)], OSError)
+    assert isinstance(results[missing], FileNotFoundError)
+    assert uploader.upload_images([str(ok)]) == {str(ok): "upload-1"}
+    assert uploader.client.calls == [("upload_file", "ok.png")]
+
+
+def test_identical_images_at_different_paths_upload_once(tmp_path):
+    (tmp_path / "a.png").write_bytes(b"same")
+    (tmp_path / "b.png").write_bytes(b"same")
+    uploader = MarkdownToNotionUploader(notion_client=RecordingClient())
+
+    results = uploader.upload_images([str(tmp_path / "a.png"), str(tmp_path / "b.png")])
+
+    assert set(results.values()) == {"upload-1"}
+    assert uploader.images_uploaded == 1
+
+
+def test_image_cache_skips_uploads_on_rerun(tmp_path):
+    (tmp_path / "chart.png").write_bytes(b"png")
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("# Doc\n\n![Chart](chart.png)\n")
+    cache_path = tmp_path / "cache.sqlite3"
+
+    for _ in range(2):
+        client = RecordingClient()
+        with ImageUploadCache(cache_path) as cache:
+            uploader = MarkdownToNotionUploader(notion_client=client, image_cache=cache)
+            uploader.upload_markdown(md_file, "parent")
+
+    assert ("upload_file", "chart.png") not in client.calls
+    assert (uploader.images_uploaded, uploader.images_reused) == (0, 1)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_reused_image_ids_expire_with_their_cache_entry(tmp_path):
+    image = tmp_path / "chart.png"
+    image.write_bytes(b"png")
+    clock = FakeClock()
+    client = RecordingClient()
+    with ImageUploadCache(tmp_path / "cache.sqlite3", clock=clock) as cache:
+        cache.put(file_digest(image), "upload-0")  # uploaded by an earlier run
+        clock.now += DEFAULT_TTL_SECONDS - 60
+        uploader = MarkdownToNotionUploader(notion_client=client, image_cache=cache, clock=clock)
+        assert uploader.upload_image(str(image)) == "upload-0"
+
+        clock.now += 60
+        assert uploader.upload_image(str(image)) == "upload-1"
+        assert uploader.upload_image(str(image)) == "upload-1"
+
+    assert client.calls == [("upload_file", "chart.png")]
+
+
+def test_directory_sync_touches_only_changed_files(notion_stub, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name in ("a", "b"):
+        (docs / f"{name}.md").write_text(f"# Doc {name}\n\nFirst version of {name}.\n")
+
+    client = NotionClient(NotionConfig(api_key="secret", base_url=notion_stub.base_url, requests_per_second=0))
+    with PageIndex(tmp_path / "index.sqlite3") as index:
+        uploader = MarkdownToNotionUploader(notion_client=client, page_index=index)
+        # Pages uploaded before watching started are found by title
+        page_a = uploader.upload_markdown(docs / "a.md", "parent")
+        sync = DirectorySync(uploader, "parent", collect_markdown_files(str(docs)))
+
+        (docs / "a.md").write_text("# Doc a\n\nSecond version of a.\n")
+        (docs / "b.md").write_text((docs / "b.md").read_text())  # saved, not changed
+        (docs / "c.md").write_text("# Doc c\n")
+        sent_before = len(notion_stub.requests)
+        results = {r.md_file.name: r for r in sync.sync(sorted(docs.glob("*.md")))}
+
+        assert results["a.md"].action is SyncAction.UPDATED
+        assert results["a.md"].page_id == page_a["id"]
+        assert results["a.md"].stats["updated"] == 1
+        assert results["b.md"].action is SyncAction.UNCHANGED
+        assert results["c.md"].action is SyncAction.CREATED
+        pages = [r for r in notion_stub.requests[sent_before:] if r[:2] == ("POST", "/v1/pages")]
+        assert len(pages) == 1
+
+        # The next edit goes to the page found last time, without another lookup
+        (docs / "c.md").write_text("# Doc c\n\nMore.\n")
+        (result,) = sync.sync([docs / "c.md"])
+        assert (result.action, result.page_id) == (SyncAction.UPDATED, results["c.md"].page_id)
+
+
+def test_directory_sync_uploads_images_again_after_their_window(notion_stub, tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "chart.png").write_bytes(b"\x89PNG chart")
+    (docs / "a.md").write_text("# Doc a\n\n![Chart](chart.png)\n")
+    (docs / "b.md").write_text("# Doc b\n")
+    clock = FakeClock()
+    client = NotionClient(NotionConfig(api_key="secret", base_url=notion_stub.base_url, requests_per_second=0))
+    uploader = MarkdownToNotionUploader(notion_client=client, clock=clock)
+    sync = DirectorySync(uploader, "parent")
+    list(sync.sync([docs / "a.md", docs / "b.md"]))
+
+    # Hours into watching, the same image is edited into another file
+    clock.now += DEFAULT_TTL_SECONDS
+    (docs / "b.md").write_text("# Doc b\n\n![Chart](chart.png)\n")
+    (result,) = sync.sync([docs / "b.md"])
+
+    assert result.action is SyncAction.UPDATED
+    uploads = [path for method, path, _ in notion_stub.requests if (method, path) == ("POST", "/v1/file_uploads")]
+    assert len(uploads) == 2
+    attached = [
+        block["image"]["file_upload"]["id"] for block in notion_stub.blocks.values() if block["type"] == "image"
+    ]
+    assert len(set(attached)) == 2  # b's image got the fresh upload, not a's expired one